@@ -1,43 +1,108 @@
-import { readdirSync } from "node:fs";
-import { join } from "node:path";
+import { createHash } from "node:crypto";
+import { readdirSync, readFileSync, unlinkSync, writeFileSync } from "node:fs";
+import { basename, dirname, join, relative } from "node:path";
+import { brotliCompressSync, constants, gzipSync } from "node:zlib";
 import * as esbuild from "esbuild";
 
 const STATIC = "src/librepos/app/static";
 const CSS_DIR = join(STATIC, "css");
 const JS_DIR = join(STATIC, "js");
+const MANIFEST = join(STATIC, "asset-manifest.json");
+
+// Served from a fixed URL (/sw.js), so never content-hashed.
+const UNHASHED = new Set(["sw.min.js"]);
 
 const args = process.argv.slice(2);
 const watch = args.includes("--watch");
 const filter = args.find((a) => a !== "--watch"); // "css", "js", or undefined
 
+// Logical name ("js/app.min.js") -> hashed name ("js/app.min.1a2b3c4d.js")
+const manifest = loadManifest();
+
+function loadManifest() {
+  try {
+    return JSON.parse(readFileSync(MANIFEST, "utf8"));
+  } catch {
+    return {};
+  }
+}
+
 function sourceFiles(dir, ext) {
   return readdirSync(dir)
-    .filter((f) => f.endsWith(ext) && !f.endsWith(`.min${ext}`))
+    .filter((f) => f.endsWith(ext) && !f.endsWith(`.min${ext}`) && !/\.min\.[0-9a-f]{8}\./.test(f))
     .map((f) => join(dir, f));
 }
 
+function compressedSiblings(file, contents) {
+  writeFileSync(`${file}.gz`, gzipSync(contents, { level: 9 }));
+  writeFileSync(
+    `${file}.br`,
+    brotliCompressSync(contents, { params: { [constants.BROTLI_PARAM_QUALITY]: 11 } }),
+  );
+}
+
+function removeStale(dir, stem, ext, keep) {
+  const escaped = stem.replaceAll(".", "\\.");
+  const pattern = new RegExp(`^${escaped}\\.[0-9a-f]{8}\\${ext}(\\.gz|\\.br)?$`);
+  for (const f of readdirSync(dir)) {
+    if (pattern.test(f) && !f.startsWith(keep)) {
+      unlinkSync(join(dir, f));
+    }
+  }
+}
+
+// Write "<name>.min.<hash>.<ext>" plus .gz/.br siblings and record it in the manifest.
+function fingerprint(out, ext) {
+  const name = basename(out);
+  if (UNHASHED.has(name)) {
+    return;
+  }
+  const contents = readFileSync(out);
+  const hash = createHash("sha256").update(contents).digest("hex").slice(0, 8);
+  const stem = name.slice(0, -ext.length);
+  const hashedName = `${stem}.${hash}${ext}`;
+  const hashed = join(dirname(out), hashedName);
+
+  removeStale(dirname(out), stem, ext, hashedName);
+  writeFileSync(hashed, contents);
+  compressedSiblings(hashed, contents);
+
+  manifest[relative(STATIC, out)] = relative(STATIC, hashed);
+  const sorted = Object.fromEntries(Object.entries(manifest).sort());
+  writeFileSync(MANIFEST, `${JSON.stringify(sorted, null, 2)}\n`);
+}
+
+function fingerprintPlugin(out, ext) {
+  return {
+    name: "fingerprint",
+    setup(build) {
+      build.onEnd((result) => {
+        if (result.errors.length === 0) {
+          fingerprint(out, ext);
+        }
+      });
+    },
+  };
+}
+
 async function minify(files, loader) {
   for (const file of files) {
     const ext = loader === "css" ? ".css" : ".js";
     const out = file.replace(ext, `.min${ext}`);
+    const options = {
+      entryPoints: [file],
+      outfile: out,
+      minify: true,
+      bundle: false,
+      logLevel: "info",
+      plugins: [fingerprintPlugin(out, ext)],
+    };
 
     if (watch) {
-      const ctx = await esbuild.context({
-        entryPoints: [file],
-        outfile: out,
-        minify: true,
-        bundle: false,
-        logLevel: "info",
-      });
+      const ctx = await esbuild.context(options);
       await ctx.watch();
     } else {
-      await esbuild.build({
-        entryPoints: [file],
-        outfile: out,
-        minify: true,
-        bundle: false,
-        logLevel: "info",
-      });
+      await esbuild.build(options);
     }
   }
 }
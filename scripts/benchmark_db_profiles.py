@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Concurrent order-write benchmark for the database engine profiles.
+
+Runs several writer threads that each insert small "order" transactions and
+reports throughput plus how many writes failed with lock errors. For SQLite
+the untuned defaults (rollback journal, synchronous=FULL, no busy wait) are
+compared with the profile from shared/db_profiles.py; any other URL is run
+with its profile only.
+
+Usage:
+    python scripts/benchmark_db_profiles.py
+    python scripts/benchmark_db_profiles.py --threads 8 --writes 500
+    python scripts/benchmark_db_profiles.py --url postgresql+psycopg://localhost/librepos_bench
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import click
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from librepos.app.config import BaseConfig  # noqa: E402
+from librepos.app.shared.db_profiles import (  # noqa: E402
+    apply_engine_profile,
+    backend_name,
+    engine_options,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bench_orders (
+    id INTEGER PRIMARY KEY,
+    worker INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL
+)
+"""
+
+
+def build_engine(url: str, *, tuned: bool):
+    config = BaseConfig(SQLALCHEMY_DATABASE_URI=url).model_dump()
+    if tuned:
+        engine = create_engine(url, **engine_options(config))
+        apply_engine_profile(engine, config)
+        return engine
+    # pysqlite defaults minus the lock wait, i.e. what a bare engine gets
+    return create_engine(url, connect_args={"timeout": 0})
+
+
+def run(engine, threads: int, writes: int) -> tuple[float, int, int]:
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+        conn.execute(text("DELETE FROM bench_orders"))
+
+    failures = [0] * threads
+
+    def writer(worker: int) -> None:
+        for i in range(writes):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("INSERT INTO bench_orders (worker, total_cents) VALUES (:w, :t)"),
+                        {"w": worker, "t": i * 100},
+                    )
+            except OperationalError:
+                failures[worker] += 1
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    with engine.connect() as conn:
+        written = conn.execute(text("SELECT COUNT(*) FROM bench_orders")).scalar_one()
+    engine.dispose()
+    return elapsed, written, sum(failures)
+
+
+@click.command()
+@click.option("--url", default=None, help="Database URL (default: a temporary SQLite file).")
+@click.option("--threads", default=4, show_default=True, help="Concurrent writer threads.")
+@click.option("--writes", default=250, show_default=True, help="Transactions per thread.")
+def main(url: str | None, threads: int, writes: int) -> None:
+    """Benchmark concurrent order writes under each engine profile."""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        profiles = ["tuned"]
+        if backend_name(url) == "sqlite":
+            profiles.insert(0, "untuned")
+
+        for profile in profiles:
+            engine = build_engine(url, tuned=profile == "tuned")
+            elapsed, written, failed = run(engine, threads, writes)
+            click.echo(
+                f"{profile:>8}: {written:>6} writes in {elapsed:6.2f}s "
+                f"({written / elapsed:8.0f}/s), {failed} failed"
+            )
+            if backend_name(url) == "sqlite":
+                # Start the next profile from a fresh file (WAL persists)
+                Path(url.removeprefix("sqlite:///")).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
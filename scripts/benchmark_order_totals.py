@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Order-totals benchmark for large tickets.
+
+Builds a ticket with hundreds of lines, then times quantity changes two ways:
+
+- incremental: OrderService.update_line (recompute the changed line, apply
+  the delta to the order row)
+- full: change the line, then reload every line through the relationship
+  and re-sum the ticket, as a naive implementation would
+
+Usage:
+    python scripts/benchmark_order_totals.py
+    python scripts/benchmark_order_totals.py --lines 500 --clicks 200
+    python scripts/benchmark_order_totals.py --url sqlite:///bench.db
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import click
+from sqlalchemy import event
+from sqlalchemy.orm import selectinload
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from librepos.app import create_app  # noqa: E402
+from librepos.app.blueprints.orders.models import Order, OrderLine  # noqa: E402
+from librepos.app.blueprints.orders.services import (  # noqa: E402
+    OrderService,
+    compute_line_total,
+    compute_order_totals,
+)
+from librepos.app.config import TestingConfig  # noqa: E402
+from librepos.app.extensions import db  # noqa: E402
+from librepos.app.shared.money import Money  # noqa: E402
+
+
+def full_recompute(order_id: int, line_id: int, quantity: int) -> None:
+    order = db.session.get(
+        Order, order_id, options=[selectinload(Order.lines)], populate_existing=True
+    )
+    subtotal = 0
+    for line in order.lines:
+        if line.id == line_id:
+            line.quantity = quantity
+        total = compute_line_total(
+            line.unit_price, line.quantity, line.modifiers_price, line.discount
+        )
+        line.line_total = Money(total)
+        subtotal += total
+    _, tax, grand_total = compute_order_totals(subtotal, order.discount.cents, order.tax_rate_bp)
+    order.subtotal, order.tax, order.total = Money(subtotal), Money(tax), Money(grand_total)
+    db.session.commit()
+
+
+def incremental(order_id: int, line_id: int, quantity: int) -> None:
+    order = OrderService.get_for_update(order_id)
+    line = OrderService.get_line(order, line_id)
+    OrderService.update_line(order, line, quantity=quantity)
+
+
+def measure(fn, order_id: int, line_ids: list[int], clicks: int, statements: list[int]):
+    rng = random.Random(42)
+    timings = []
+    before = statements[0]
+    for _ in range(clicks):
+        line_id = rng.choice(line_ids)
+        start = time.perf_counter()
+        fn(order_id, line_id, rng.randint(1, 5))
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.expire_all()
+    queries = (statements[0] - before) / clicks
+    return statistics.mean(timings), statistics.quantiles(timings, n=20)[-1], queries
+
+
+@click.command()
+@click.option("--url", default="sqlite:///:memory:", show_default=True, help="Database URL.")
+@click.option("--lines", default=300, show_default=True, help="Lines on the ticket.")
+@click.option("--clicks", default=100, show_default=True, help="Quantity changes timed.")
+def main(url: str, lines: int, clicks: int) -> None:
+    """Benchmark incremental vs. full order-totals recomputation."""
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI: str = url
+        METRICS_ENABLED: bool = False
+        N_PLUS_ONE_THRESHOLD: int | None = None
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        statements = [0]
+        event.listen(
+            db.engine,
+            "before_cursor_execute",
+            lambda *_: statements.__setitem__(0, statements[0] + 1),
+        )
+
+        order = OrderService.open_order(tax_rate_bp=825)
+        for i in range(lines):
+            OrderService.add_line(
+                order, name=f"Item {i}", unit_price=199 + i, quantity=1, commit=False
+            )
+        db.session.commit()
+        order_id = order.id
+        line_ids = db.session.scalars(db.select(OrderLine.id).filter_by(order_id=order_id)).all()
+
+        for name, fn in (("incremental", incremental), ("full", full_recompute)):
+            mean, p95, queries = measure(fn, order_id, line_ids, clicks, statements)
+            click.echo(
+                f"{name:>12}: mean {mean:7.2f} ms  p95 {p95:7.2f} ms  {queries:5.1f} queries/click"
+            )
+
+        expected = db.session.get(Order, order_id).total
+        OrderService.recalculate(db.session.get(Order, order_id))
+        assert db.session.get(Order, order_id).total == expected, "totals drifted"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,87 @@
 import os
-from importlib.metadata import version
 from pathlib import Path
 
-from flask import Flask, render_template, send_from_directory
-from jinja2 import DebugUndefined, FileSystemBytecodeCache, StrictUndefined
+from flask import Flask, render_template
+from jinja2 import DebugUndefined, StrictUndefined
 
 from librepos.app.blueprints import register_blueprints
 from librepos.app.cli import register_cli
 from librepos.app.extensions import init_extensions
+from librepos.app.shared.assets import asset_manifest, service_worker_prelude
+from librepos.app.shared.cache import response_cache
+from librepos.app.shared.compression import init_compression
+from librepos.app.shared.db_profiles import engine_options
+from librepos.app.shared.decorators import cached_response
+from librepos.app.shared.events import event_hub
+from librepos.app.shared.jinja import init_jinja_filters
+from librepos.app.shared.metrics import init_instrumentation
+from librepos.app.shared.startup import StartupProfile
+from librepos.app.shared.template_cache import init_template_cache, warm_templates
+from librepos.app.shared.template_globals import template_globals
 
 from .config import CONFIG_BY_NAME, BaseConfig, DevelopmentConfig
 
-# Navigation menu items injected into all templates via context processor.
+# Navigation menu items rendered by the template globals registry.
 # Each item: label, icon (Material Symbols name), endpoint (url_for target),
 # and optional "children" for submenus or "divider": True for separators.
 NAV_ITEMS: list[dict] = [
     {"label": "Dashboard", "icon": "dashboard", "endpoint": "admin_view"},
     {"divider": True},
     {"label": "Point of Sale", "icon": "point_of_sale", "endpoint": "#"},
-    {"label": "Orders", "icon": "receipt_long", "endpoint": "#"},
+    {"label": "Orders", "icon": "receipt_long", "endpoint": "orders.index"},
     {"label": "Tables", "icon": "table_restaurant", "endpoint": "#"},
     {"divider": True},
     {"subheader": "Management"},
-    {"label": "Menu & Products", "icon": "restaurant_menu", "endpoint": "#"},
+    {"label": "Menu & Products", "icon": "restaurant_menu", "endpoint": "menu.index"},
     {"label": "Inventory", "icon": "inventory_2", "endpoint": "#"},
     {"label": "Customers", "icon": "group", "endpoint": "#"},
     {"label": "Staff", "icon": "badge", "endpoint": "#"},
     {"divider": True},
     {"subheader": "Analytics"},
-    {"label": "Reports", "icon": "bar_chart", "endpoint": "#"},
+    {"label": "Reports", "icon": "bar_chart", "endpoint": "reports.index"},
     {"divider": True},
     {"label": "Settings", "icon": "settings", "endpoint": "#"},
 ]
 
 
 def create_app(app_config: str | type | None = None):
+    profile = StartupProfile()
     app = Flask(__name__)
+    app.extensions["startup_profile"] = profile
 
+    _load_settings(app, app_config)
+    profile.mark("settings")
+
+    _init_templates(app)
+    profile.mark("templates")
+
+    # load extensions
+    init_extensions(app)
+    init_jinja_filters(app)
+    profile.mark("extensions")
+
+    _init_request_hooks(app)
+    profile.mark("instrumentation")
+
+    _register_core_routes(app)
+
+    # Register blueprints
+    register_blueprints(app)
+    profile.mark("routes")
+
+    # Register CLI commands
+    register_cli(app)
+    profile.mark("cli")
+
+    # Load every template before serving the first request
+    if app.config["TEMPLATE_WARMUP"]:
+        warm_templates(app)
+        profile.mark("template warmup")
+
+    return app
+
+
+def _load_settings(app: Flask, app_config: str | type | None) -> None:
     cfg = app_config
     if cfg is None:
         cfg = os.getenv("FLASK_ENV", "development").lower()
@@ -48,10 +93,14 @@ def create_app(app_config: str | type | None = None):
     else:
         config_cls = DevelopmentConfig
 
+    # Settings are read from the environment once and validated in place
     settings = config_cls()
     app.config.from_mapping(settings.model_dump())
-    config_cls.init_app()
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+    config_cls.init_app(settings)
+
 
+def _init_templates(app: Flask) -> None:
     # Catch missing variables early in development.
     app.jinja_env.undefined = StrictUndefined if app.config["DEBUG"] else DebugUndefined
 
@@ -59,44 +108,54 @@ def create_app(app_config: str | type | None = None):
     app.jinja_env.lstrip_blocks = True
     app.jinja_env.trim_blocks = True
 
-    # Bytecode cache (big templates render faster after the first hit)
-    cache_dir = Path(app.instance_path) / "jinja_cache"
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
-        directory=str(cache_dir), pattern="%s.cache"
-    )
-
-    @app.context_processor
-    def inject_global_variables():
-        librepos_version = version("librepos")
-        business_name = app.config.get("BUSINESS_NAME") or "LibrePOS"
-        return {
-            "app_version": librepos_version,
-            "business_name": business_name,
-            "nav_items": NAV_ITEMS,
-        }
+    # Bytecode cache: in memory, then files precompiled by `flask templates compile`
+    init_template_cache(app)
 
-    # load extensions
-    init_extensions(app)
+    # Version, business name and navigation resolved once, not per render
+    template_globals.init_app(app, NAV_ITEMS)
+    response_cache.configure(maxsize=app.config["RESPONSE_CACHE_MAXSIZE"])
+
+    # Content-hashed, precompressed static assets (see build.mjs)
+    asset_manifest.init_app(app)
+
+
+def _init_request_hooks(app: Flask) -> None:
+    # Server-Timing header and /metrics endpoint
+    init_instrumentation(app)
 
+    # gzip/brotli for pages, fragments, JSON and streams; registered after
+    # instrumentation so its after_request runs first and /metrics sees wire sizes
+    init_compression(app)
+
+    # Server-Sent Events push channel (/events)
+    event_hub.init_app(app)
+
+
+def _register_core_routes(app: Flask) -> None:
     @app.get("/")
+    @cached_response(tags=("pages",))
     def welcome_view():
         return render_template("welcome.html", title="Welcome")
 
     @app.get("/admin")
+    @cached_response(tags=("pages",))
     def admin_view():
         return render_template("layouts/admin.html", title="Admin")
 
     # PWA Routes - serve at root scope for full service worker control
     @app.get("/sw.js")
     def service_worker():
-        """Serve service worker from root scope for full PWA control."""
+        """Serve service worker from root scope for full PWA control.
+
+        The hashed asset list from the build manifest is prepended, so the
+        worker's bytes (and therefore its cache) change with every build.
+        """
         static_folder = app.static_folder
         if static_folder is None:
             return "Static folder not configured", 500
-        response = send_from_directory(
-            static_folder,
-            "js/sw.js",
+        source = (Path(static_folder) / "js" / "sw.js").read_text()
+        response = app.response_class(
+            service_worker_prelude() + source,
             mimetype="application/javascript",
         )
         response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
@@ -104,14 +163,7 @@ def create_app(app_config: str | type | None = None):
         return response
 
     @app.get("/offline.html")
+    @cached_response(tags=("pages",))
     def offline_page():
         """Serve offline page for service worker fallback."""
         return render_template("offline.html")
-
-    # Register blueprints
-    register_blueprints(app)
-
-    # Register CLI commands
-    register_cli(app)
-
-    return app
@@ -1,6 +1,9 @@
 """Blueprint registration for LibrePOS."""
 
 from .auth import bp as auth_bp
+from .menu import bp as menu_bp
+from .orders import bp as orders_bp
+from .reports import bp as reports_bp
 
 
 def register_blueprints(app):
@@ -10,3 +13,6 @@ def register_blueprints(app):
     will automatically add new blueprints to this function.
     """
     app.register_blueprint(auth_bp)
+    app.register_blueprint(menu_bp)
+    app.register_blueprint(orders_bp)
+    app.register_blueprint(reports_bp)
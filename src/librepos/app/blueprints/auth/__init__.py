@@ -1,6 +1,7 @@
 """
 Auth management
 """
+
 from flask import Blueprint
 
 bp = Blueprint(
@@ -11,4 +12,5 @@ bp = Blueprint(
     url_prefix="/auth",
 )
 
-from . import routes  # noqa: E402, F401
+# services registers the Flask-Login user loader and the compiled role permissions
+from . import routes, services  # noqa: E402, F401
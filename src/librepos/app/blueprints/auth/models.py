@@ -1,18 +1,116 @@
-"""SQLAlchemy models for auth blueprint."""
-from sqlalchemy import String
-from sqlalchemy.orm import Mapped, mapped_column
-
-from librepos.app.extensions import db
-
-
-# Example model - customize as needed
-# class Auth(db.Model):
-#     """Model for auth."""
-#
-#     __tablename__ = "auth"
-#
-#     id: Mapped[int] = mapped_column(primary_key=True)
-#     name: Mapped[str] = mapped_column(String(100), nullable=False)
-#
-#     def __repr__(self) -> str:
-#         return f"<Auth {self.id}: {self.name}>"
+"""SQLAlchemy models for auth blueprint.
+
+Access is granted through policies: a permission (e.g. ``view:orders``)
+belongs to policies, policies are attached to roles, and each user has one
+role. The effective permissions of a role are compiled into a cached set by
+``services.RolePermissions``, so requests never walk these joins.
+"""
+
+from flask_login import UserMixin
+from sqlalchemy import Boolean, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from librepos.app.extensions import AssociationModel, db
+from librepos.app.shared.cache import CacheOptions
+from librepos.app.shared.mixins import CRUDMixin
+
+
+class PolicyPermission(AssociationModel):
+    """A permission granted by a policy."""
+
+    __tablename__ = "policy_permissions"
+
+    policy_id: Mapped[int] = mapped_column(
+        ForeignKey("policies.id", ondelete="CASCADE"), primary_key=True
+    )
+    permission_id: Mapped[int] = mapped_column(
+        ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+
+class RolePolicy(AssociationModel):
+    """A policy attached to a role."""
+
+    __tablename__ = "role_policies"
+
+    role_id: Mapped[int] = mapped_column(
+        ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True
+    )
+    policy_id: Mapped[int] = mapped_column(
+        ForeignKey("policies.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+
+class Permission(db.Model, CRUDMixin):
+    """A single action, named ``<action>:<blueprint>`` (see each permissions.py)."""
+
+    __tablename__ = "permissions"
+
+    name: Mapped[str] = mapped_column(String(100), unique=True)
+    description: Mapped[str] = mapped_column(String(255), default="")
+
+    def __repr__(self) -> str:
+        return f"<Permission {self.id}: {self.name}>"
+
+
+class Policy(db.Model, CRUDMixin):
+    """A named group of permissions, e.g. "Orders Full Access"."""
+
+    __tablename__ = "policies"
+
+    name: Mapped[str] = mapped_column(String(100), unique=True)
+    description: Mapped[str] = mapped_column(String(255), default="")
+    is_system: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    permissions: Mapped[list[Permission]] = relationship(
+        secondary="policy_permissions", lazy="raise_on_sql", order_by=Permission.name
+    )
+
+    def __repr__(self) -> str:
+        return f"<Policy {self.id}: {self.name}>"
+
+
+class Role(db.Model, CRUDMixin):
+    """A job function (owner, manager, cashier) and the policies it holds."""
+
+    __tablename__ = "roles"
+
+    name: Mapped[str] = mapped_column(String(50), unique=True)
+    description: Mapped[str] = mapped_column(String(255), default="")
+
+    policies: Mapped[list[Policy]] = relationship(
+        secondary="role_policies", lazy="raise_on_sql", order_by=Policy.name
+    )
+
+    def __repr__(self) -> str:
+        return f"<Role {self.id}: {self.name}>"
+
+
+class User(db.Model, CRUDMixin, UserMixin):
+    """A staff member who signs in to the POS."""
+
+    __tablename__ = "users"
+
+    # Loaded by Flask-Login on every request; served from the model cache.
+    # Commits in this process clear it, but a user deactivated or moved to
+    # another role by a different worker process is only seen once the entry
+    # expires, so the TTL is PERMISSIONS_CHECK_INTERVAL to keep the two as
+    # fresh as each other.
+    CACHE_OPTIONS = CacheOptions(
+        maxsize=256, lookups=("username",), ttl_config="PERMISSIONS_CHECK_INTERVAL"
+    )
+
+    username: Mapped[str] = mapped_column(String(50), unique=True)
+    # Werkzeug scrypt hash (see shared/passwords.py); None until a password is set
+    password_hash: Mapped[str | None] = mapped_column(String(255))
+    role_id: Mapped[int | None] = mapped_column(ForeignKey("roles.id"), index=True)
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    role: Mapped[Role | None] = relationship(lazy="raise_on_sql")
+
+    @property
+    def is_active(self) -> bool:  # type: ignore[override]
+        return self.active
+
+    def __repr__(self) -> str:
+        return f"<User {self.id}: {self.username}>"
@@ -1,16 +1,19 @@
 """Route handlers for auth blueprint."""
+
 from flask import render_template
 
+from librepos.app.shared.decorators import require_permission
+from librepos.app.shared.exceptions import HashingBusyError
+
 from . import bp
+from .permissions import AuthPermissions
 
 
 @bp.route("/")
+@require_permission(AuthPermissions.VIEW)
 def index():
     """List view for auth."""
-    context = {
-        "head_title": "Auth | LibrePOS",
-        "appbar_title": "Auth"
-    }
+    context = {"head_title": "Auth | LibrePOS", "appbar_title": "Auth"}
     return render_template("auth/index.html", **context)
 
 
@@ -18,3 +21,9 @@ def index():
 def detail(id: int):
     """Detail view for a single auth item."""
     return render_template("auth/detail.html", id=id)
+
+
+@bp.app_errorhandler(HashingBusyError)
+def hashing_busy(_error: HashingBusyError):
+    """Sign-ins beyond the hashing queue are asked to retry shortly."""
+    return "Sign-in is busy, please try again in a moment.", 503, {"Retry-After": "1"}
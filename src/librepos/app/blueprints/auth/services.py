@@ -1,31 +1,216 @@
-"""Business logic for auth blueprint."""
-from librepos.app.extensions import db
+"""Business logic for auth blueprint.
+
+Permission checks run on most requests, so they never touch the database:
+the permissions of every role are compiled into one immutable set per role
+with a single query, and ``require_permission`` only tests membership.
+
+The compiled sets are rebuilt lazily on the first check after roles,
+policies or permissions are committed. Commits in this process mark them
+stale directly; changes made by other worker processes are picked up by a
+cheap row-count/last-update check at most every
+``PERMISSIONS_CHECK_INTERVAL`` seconds.
+"""
+
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from librepos.app.extensions import db, login_manager
+from librepos.app.shared.passwords import password_hasher
+
+from . import bp
+from .models import Permission, Policy, PolicyPermission, Role, RolePolicy, User
+
+PERMISSION_MODELS = (Permission, Policy, Role, PolicyPermission, RolePolicy)
+
+NO_PERMISSIONS: frozenset[str] = frozenset()
+
+_PERMISSIONS_CHANGED = "_role_permissions_changed"
+
+
+class RolePermissions:
+    """Holds one app's compiled permission set for every role."""
+
+    def __init__(self) -> None:
+        self._sets: Mapping[int, frozenset[str]] | None = None
+        self._fingerprint: tuple = ()
+        self._stale = True
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Recompile on the next check."""
+        self._stale = True
+
+    def get(self, role_id: int | None) -> frozenset[str]:
+        """Return the permissions granted to ``role_id`` (empty if none)."""
+        if role_id is None:
+            return NO_PERMISSIONS
+        return self.compiled().get(role_id, NO_PERMISSIONS)
+
+    def compiled(self) -> Mapping[int, frozenset[str]]:
+        """Return the permission sets by role id, recompiling if they changed."""
+        sets = self._sets
+        if sets is not None and not self._stale and not self._check_due():
+            return sets
+
+        with self._lock:
+            sets = self._sets
+            if sets is not None and not self._stale:
+                if not self._check_due():
+                    return sets
+                self._checked_at = time.monotonic()
+                if _fingerprint() == self._fingerprint:
+                    return sets
+
+            self._stale = False
+            self._fingerprint = _fingerprint()
+            self._sets = sets = compile_role_permissions()
+            self._checked_at = time.monotonic()
+            return sets
+
+    def _check_due(self) -> bool:
+        interval = current_app.config["PERMISSIONS_CHECK_INTERVAL"]
+        return time.monotonic() - self._checked_at >= interval
+
+
+def get_role_permissions(role_id: int | None) -> frozenset[str]:
+    """Return the current app's compiled permissions for ``role_id``."""
+    return current_app.extensions["role_permissions"].get(role_id)
+
+
+def compile_role_permissions() -> Mapping[int, frozenset[str]]:
+    """Resolve role -> policy -> permission for every role in one query."""
+    stmt = (
+        select(RolePolicy.role_id, Permission.name)
+        .join(PolicyPermission, PolicyPermission.policy_id == RolePolicy.policy_id)
+        .join(Permission, Permission.id == PolicyPermission.permission_id)
+        .distinct()
+    )
+    names_by_role: dict[int, set[str]] = {}
+    for role_id, name in db.session.execute(stmt):
+        names_by_role.setdefault(role_id, set()).add(name)
+    return MappingProxyType({role_id: frozenset(names) for role_id, names in names_by_role.items()})
+
+
+def _fingerprint() -> tuple:
+    """Row count and latest update of each permission table, in one statement."""
+    columns = []
+    for model in PERMISSION_MODELS:
+        table = model.__table__
+        columns.append(db.select(func.count()).select_from(table).scalar_subquery())
+        columns.append(db.select(func.max(table.c.updated_at)).scalar_subquery())
+    return tuple(db.session.execute(db.select(*columns)).one())
+
+
+_dummy_hashes: dict[str, str] = {}
+
+
+def _dummy_hash() -> str:
+    """A hash at the current cost, for failed lookups (made once per cost)."""
+    method = password_hasher.method
+    if method not in _dummy_hashes:
+        _dummy_hashes[method] = password_hasher.hash("not-a-password")
+    return _dummy_hashes[method]
+
+
+@bp.record_once
+def _init_role_permissions(state) -> None:
+    state.app.extensions["role_permissions"] = RolePermissions()
+
+
+@login_manager.user_loader
+def _load_user(user_id: str) -> User | None:
+    # Served from User's model cache, so loading the user costs no query either
+    return User.get_by_id(int(user_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _note_permission_flush(session: Session, _flush_context) -> None:
+    if any(
+        isinstance(instance, PERMISSION_MODELS)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_PERMISSIONS_CHANGED] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_permission_bulk_write(state: ORMExecuteState) -> None:
+    # bulk_create/bulk_update/bulk_upsert bypass the flush
+    if state.is_insert or state.is_update or state.is_delete:
+        mapper = state.bind_mapper
+        if mapper is not None and mapper.class_ in PERMISSION_MODELS:
+            state.session.info[_PERMISSIONS_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_role_permissions(session: Session) -> None:
+    if session.info.pop(_PERMISSIONS_CHANGED, False) and has_app_context():
+        role_permissions = current_app.extensions.get("role_permissions")
+        if role_permissions is not None:
+            role_permissions.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_permission_changes(session: Session) -> None:
+    session.info.pop(_PERMISSIONS_CHANGED, None)
 
 
 class AuthService:
-    """Service class for auth operations."""
+    """Service class for auth operations.
 
-    @staticmethod
-    def get_all():
-        """Retrieve all records."""
-        pass
+    Password hashing runs on the bounded pool in shared/passwords.py, so
+    ``authenticate`` and ``set_password`` may raise ``HashingBusyError``.
+    """
 
     @staticmethod
-    def get_by_id(id: int):
-        """Retrieve a record by ID."""
-        pass
+    def authenticate(username: str, password: str) -> User | None:
+        """Return the active user with these credentials, or None.
+
+        A hash made with older cost parameters is replaced by one made with
+        the current ones once the password is known to be right.
+        """
+        user = User.get_first_by(username=username)
+        if user is None or user.password_hash is None:
+            # Spend the same time as a real check so usernames can't be probed
+            password_hasher.verify(_dummy_hash(), password)
+            return None
+        if not password_hasher.verify(user.password_hash, password) or not user.is_active:
+            return None
+        if password_hasher.needs_rehash(user.password_hash):
+            user.update(password_hash=password_hasher.hash(password))
+        return user
 
     @staticmethod
-    def create(data: dict):
-        """Create a new record."""
-        pass
+    def set_password(user: User, password: str, commit: bool = True) -> User:
+        """Store a new hash of ``password`` for ``user``."""
+        return user.update(commit=commit, password_hash=password_hasher.hash(password))
 
     @staticmethod
-    def update(id: int, data: dict):
-        """Update an existing record."""
-        pass
+    def has_permission(user: User, permission: str) -> bool:
+        """True if ``user`` is active and their role grants ``permission``."""
+        return user.is_active and permission in get_role_permissions(user.role_id)
 
     @staticmethod
-    def delete(id: int):
-        """Delete a record."""
-        pass
+    def seed_permissions(names: Iterable[str]) -> tuple[int, int]:
+        """Insert the permissions that do not exist yet.
+
+        One SELECT for the existing names and one bulk insert for the rest.
+
+        Returns:
+            tuple[int, int]: ``(created, skipped)``
+        """
+        names = list(dict.fromkeys(str(name) for name in names))
+        existing = set(
+            db.session.execute(
+                db.select(Permission.name).where(Permission.name.in_(names))
+            ).scalars()
+        )
+        missing = [{"name": name} for name in names if name not in existing]
+        Permission.bulk_create(missing)
+        return len(missing), len(names) - len(missing)
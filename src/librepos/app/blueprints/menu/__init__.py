@@ -0,0 +1,15 @@
+"""
+Menu catalog
+"""
+
+from flask import Blueprint
+
+bp = Blueprint(
+    "menu",
+    __name__,
+    template_folder="templates",
+    static_folder="static",
+    url_prefix="/menu",
+)
+
+from . import routes  # noqa: E402, F401
@@ -0,0 +1,67 @@
+"""SQLAlchemy models for menu blueprint."""
+
+from sqlalchemy import Boolean, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from librepos.app.extensions import db
+from librepos.app.shared.mixins import CRUDMixin
+from librepos.app.shared.money import Money, MoneyType
+
+
+class MenuCategory(db.Model, CRUDMixin):
+    """A section of the menu, shown on the POS in ``display_order``."""
+
+    __tablename__ = "menu_categories"
+
+    name: Mapped[str] = mapped_column(String(100), unique=True)
+    description: Mapped[str] = mapped_column(String(255), default="")
+    display_order: Mapped[int] = mapped_column(Integer, default=0)
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    items: Mapped[list["MenuItem"]] = relationship(
+        back_populates="category", lazy="raise_on_sql", order_by="MenuItem.display_order"
+    )
+
+    def __repr__(self) -> str:
+        return f"<MenuCategory {self.id}: {self.name}>"
+
+
+class MenuItem(db.Model, CRUDMixin):
+    """Something that can be rung up, at a base price."""
+
+    __tablename__ = "menu_items"
+
+    category_id: Mapped[int] = mapped_column(ForeignKey("menu_categories.id"), index=True)
+    name: Mapped[str] = mapped_column(String(100))
+    description: Mapped[str] = mapped_column(String(255), default="")
+    price: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    display_order: Mapped[int] = mapped_column(Integer, default=0)
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    category: Mapped[MenuCategory] = relationship(back_populates="items", lazy="raise_on_sql")
+    modifiers: Mapped[list["Modifier"]] = relationship(
+        back_populates="item",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        order_by="Modifier.display_order",
+    )
+
+    def __repr__(self) -> str:
+        return f"<MenuItem {self.id}: {self.name} ({self.price})>"
+
+
+class Modifier(db.Model, CRUDMixin):
+    """An option for an item (e.g. "Extra cheese"), adding ``price`` to the line."""
+
+    __tablename__ = "menu_modifiers"
+
+    item_id: Mapped[int] = mapped_column(ForeignKey("menu_items.id"), index=True)
+    name: Mapped[str] = mapped_column(String(100))
+    price: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    display_order: Mapped[int] = mapped_column(Integer, default=0)
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    item: Mapped[MenuItem] = relationship(back_populates="modifiers", lazy="raise_on_sql")
+
+    def __repr__(self) -> str:
+        return f"<Modifier {self.id}: {self.name} (+{self.price})>"
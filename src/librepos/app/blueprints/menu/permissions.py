@@ -0,0 +1,23 @@
+"""Permission definitions for menu blueprint."""
+
+from enum import StrEnum
+
+
+class MenuPermissions(StrEnum):
+    """Permissions for menu functionality."""
+
+    VIEW = "view:menu"
+    CREATE = "create:menu"
+    EDIT = "edit:menu"
+    DELETE = "delete:menu"
+
+
+# Policy definitions can be added here when the permissions system is set up
+# MENU_FULL_ACCESS = PolicyDefinition(
+#     name="Menu Full Access",
+#     description="Complete access to menu functionality",
+#     permissions=list(MenuPermissions),
+#     is_system=True,
+# )
+#
+# DEFAULT_POLICIES = [MENU_FULL_ACCESS]
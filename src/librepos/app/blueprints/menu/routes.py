@@ -0,0 +1,38 @@
+"""Route handlers for menu blueprint."""
+
+from flask import Response, request
+
+from librepos.app.shared.decorators import require_permission
+from librepos.app.shared.htmx import render_htmx
+
+from . import bp
+from .permissions import MenuPermissions
+from .services import MenuService, get_catalog
+
+
+@bp.route("/")
+@require_permission(MenuPermissions.VIEW)
+def index():
+    """Read-only view of the menu in display order."""
+    context = {
+        "head_title": "Menu | LibrePOS",
+        "appbar_title": "Menu & Products",
+        "categories": MenuService.get_categories(),
+    }
+    return render_htmx("menu/index.html", **context)
+
+
+@bp.get("/catalog.json")
+@require_permission(MenuPermissions.VIEW)
+def catalog():
+    """Compact menu catalog for POS terminals.
+
+    Clients must revalidate on every use (``no-cache``); a matching
+    ``If-None-Match`` gets a 304 without a body.
+    """
+    snapshot = get_catalog()
+    response = Response(snapshot.body, mimetype="application/json")
+    response.set_etag(snapshot.version)
+    response.cache_control.no_cache = True
+    response.cache_control.private = True
+    return response.make_conditional(request)
@@ -0,0 +1,211 @@
+"""Business logic for menu blueprint.
+
+POS terminals load the whole menu on every screen, so it is served from a
+precomputed catalog snapshot instead of the ORM: one compact JSON document
+(rows as arrays, with the field names listed once) whose SHA-256 content
+hash is both its ``version`` and its ETag. Terminals revalidate with
+``If-None-Match`` and get a bodyless 304 until the menu changes.
+
+The snapshot is rebuilt lazily on the first request after menu data is
+committed. Commits in this process mark it stale directly; changes made by
+other worker processes are picked up by a cheap row-count/last-update check
+at most every ``MENU_CATALOG_CHECK_INTERVAL`` seconds.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import ORMExecuteState, Session, selectinload
+
+from librepos.app.extensions import db
+
+from . import bp
+from .models import MenuCategory, MenuItem, Modifier
+
+MENU_MODELS = (MenuCategory, MenuItem, Modifier)
+
+# Column order of the rows in each catalog section
+CATALOG_FIELDS = {
+    "categories": ["id", "name", "display_order"],
+    "items": ["id", "category_id", "name", "price", "modifiers"],
+    "modifiers": ["id", "name", "price"],
+}
+
+_MENU_CHANGED = "_menu_catalog_changed"
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """A serialized catalog and the data it was built from."""
+
+    body: bytes
+    version: str
+    fingerprint: tuple
+
+
+class MenuCatalog:
+    """Holds one app's current catalog snapshot."""
+
+    def __init__(self) -> None:
+        self._snapshot: CatalogSnapshot | None = None
+        self._stale = True
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Rebuild the snapshot on its next use."""
+        self._stale = True
+
+    def get(self) -> CatalogSnapshot:
+        """Return the current snapshot, rebuilding it if the menu changed."""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._stale and not self._check_due():
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and not self._stale:
+                if not self._check_due():
+                    return snapshot
+                self._checked_at = time.monotonic()
+                if _fingerprint() == snapshot.fingerprint:
+                    return snapshot
+
+            self._stale = False
+            self._snapshot = snapshot = build_catalog()
+            self._checked_at = time.monotonic()
+            return snapshot
+
+    def _check_due(self) -> bool:
+        interval = current_app.config["MENU_CATALOG_CHECK_INTERVAL"]
+        return time.monotonic() - self._checked_at >= interval
+
+
+def get_catalog() -> CatalogSnapshot:
+    """Return the current app's catalog snapshot."""
+    return current_app.extensions["menu_catalog"].get()
+
+
+def build_catalog() -> CatalogSnapshot:
+    """Serialize every active category, item and modifier in display order."""
+    fingerprint = _fingerprint()
+
+    categories = db.session.execute(
+        db.select(MenuCategory.id, MenuCategory.name, MenuCategory.display_order)
+        .where(MenuCategory.active.is_(True))
+        .order_by(MenuCategory.display_order, MenuCategory.id)
+    ).all()
+
+    modifiers_by_item: dict[int, list[list[Any]]] = {}
+    for item_id, modifier_id, name, price in db.session.execute(
+        select(Modifier.item_id, Modifier.id, Modifier.name, Modifier.price)
+        .where(Modifier.active.is_(True))
+        .order_by(Modifier.item_id, Modifier.display_order, Modifier.id)
+    ):
+        modifiers_by_item.setdefault(item_id, []).append([modifier_id, name, price.cents])
+
+    items = db.session.execute(
+        select(MenuItem.id, MenuItem.category_id, MenuItem.name, MenuItem.price)
+        .join(MenuCategory)
+        .where(MenuItem.active.is_(True), MenuCategory.active.is_(True))
+        .order_by(MenuCategory.display_order, MenuItem.display_order, MenuItem.id)
+    ).all()
+
+    content = {
+        "currency": current_app.config["BUSINESS_CURRENCY"],
+        "fields": CATALOG_FIELDS,
+        "categories": [list(row) for row in categories],
+        "items": [
+            [item_id, category_id, name, price.cents, modifiers_by_item.get(item_id, [])]
+            for item_id, category_id, name, price in items
+        ],
+    }
+    encoded = json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+    version = hashlib.sha256(encoded).hexdigest()[:32]
+    # Splice the version in front without serializing twice
+    body = b'{"version":"' + version.encode() + b'",' + encoded[1:]
+    return CatalogSnapshot(body=body, version=version, fingerprint=fingerprint)
+
+
+def _fingerprint() -> tuple:
+    """Row count and latest update of each menu table, in one statement."""
+    columns = []
+    for model in MENU_MODELS:
+        columns.append(db.select(func.count(model.id)).scalar_subquery())
+        columns.append(db.select(func.max(model.updated_at)).scalar_subquery())
+    return tuple(db.session.execute(db.select(*columns)).one())
+
+
+@bp.record_once
+def _init_catalog(state) -> None:
+    state.app.extensions["menu_catalog"] = MenuCatalog()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_menu_flush(session: Session, _flush_context) -> None:
+    if any(
+        isinstance(instance, MENU_MODELS)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_MENU_CHANGED] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_menu_bulk_write(state: ORMExecuteState) -> None:
+    # bulk_create/bulk_update/bulk_upsert bypass the flush
+    if state.is_insert or state.is_update or state.is_delete:
+        mapper = state.bind_mapper
+        if mapper is not None and mapper.class_ in MENU_MODELS:
+            state.session.info[_MENU_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalog(session: Session) -> None:
+    if session.info.pop(_MENU_CHANGED, False) and has_app_context():
+        catalog = current_app.extensions.get("menu_catalog")
+        if catalog is not None:
+            catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_menu_changes(session: Session) -> None:
+    session.info.pop(_MENU_CHANGED, None)
+
+
+class MenuService:
+    """Service class for menu operations."""
+
+    @staticmethod
+    def get_categories() -> list[MenuCategory]:
+        """All categories in display order, with their items loaded."""
+        stmt = (
+            db.select(MenuCategory)
+            .options(selectinload(MenuCategory.items))
+            .order_by(MenuCategory.display_order, MenuCategory.id)
+        )
+        return list(db.session.execute(stmt).scalars())
+
+    @staticmethod
+    def seed_categories(rows: list[dict]) -> tuple[int, int]:
+        """Insert the categories whose names do not exist yet.
+
+        One SELECT for the existing names and one bulk insert for the rest.
+
+        Returns:
+            tuple[int, int]: ``(created, skipped)``
+        """
+        names = [row["name"] for row in rows]
+        existing = set(
+            db.session.execute(
+                db.select(MenuCategory.name).where(MenuCategory.name.in_(names))
+            ).scalars()
+        )
+        missing = [row for row in rows if row["name"] not in existing]
+        MenuCategory.bulk_create(missing)
+        return len(missing), len(rows) - len(missing)
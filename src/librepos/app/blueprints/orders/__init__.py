@@ -0,0 +1,15 @@
+"""
+Order management
+"""
+
+from flask import Blueprint
+
+bp = Blueprint(
+    "orders",
+    __name__,
+    template_folder="templates",
+    static_folder="static",
+    url_prefix="/orders",
+)
+
+from . import routes  # noqa: E402, F401
@@ -0,0 +1,20 @@
+"""WTForms for orders blueprint."""
+
+from flask_wtf import FlaskForm
+from wtforms import DecimalField, IntegerField, StringField, SubmitField
+from wtforms.validators import DataRequired, Length, NumberRange
+
+
+class OrderLineForm(FlaskForm):
+    """Form for ringing up a line on a ticket."""
+
+    name = StringField("Item", validators=[DataRequired(), Length(max=100)])
+    unit_price = DecimalField("Price", places=2, validators=[DataRequired(), NumberRange(min=0)])
+    quantity = IntegerField("Qty", default=1, validators=[NumberRange(min=1)])
+    submit = SubmitField("Add")
+
+
+class LineQuantityForm(FlaskForm):
+    """Form for changing a line's quantity (zero removes the line)."""
+
+    quantity = IntegerField("Qty", validators=[NumberRange(min=0)])
@@ -0,0 +1,80 @@
+"""SQLAlchemy models for orders blueprint."""
+
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from librepos.app.extensions import db
+from librepos.app.shared.mixins import CRUDMixin
+from librepos.app.shared.money import Money, MoneyType
+
+
+class OrderStatus(StrEnum):
+    """Lifecycle of a ticket."""
+
+    OPEN = "open"
+    PAID = "paid"
+    VOID = "void"
+
+
+class Order(db.Model, CRUDMixin):
+    """A ticket with its running totals denormalized on the row.
+
+    ``subtotal`` is the sum of every line's ``line_total``; ``discount`` is
+    an order-level discount taken before tax. The totals service keeps
+    these columns in step with each line change, so reading a ticket never
+    walks its lines.
+    """
+
+    __tablename__ = "orders"
+
+    status: Mapped[str] = mapped_column(String(10), default=OrderStatus.OPEN, index=True)
+    tax_rate_bp: Mapped[int] = mapped_column(Integer, default=0)
+    line_count: Mapped[int] = mapped_column(Integer, default=0)
+    subtotal: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    discount: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    tax: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    total: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Idempotency key generated by the terminal for orders taken offline
+    client_key: Mapped[str | None] = mapped_column(String(64), unique=True)
+    # Set once the order is counted in the sales rollups (see reports blueprint)
+    rolled_up_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), index=True)
+
+    lines: Mapped[list["OrderLine"]] = relationship(
+        back_populates="order",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        order_by="OrderLine.id",
+    )
+
+    def __repr__(self) -> str:
+        return f"<Order {self.id}: {self.total} ({self.status})>"
+
+
+class OrderLine(db.Model, CRUDMixin):
+    """One line of a ticket.
+
+    Name and prices are snapshots taken when the line is rung up, so later
+    menu edits never change a past ticket. ``menu_item_id`` and
+    ``category_id`` are kept as plain ids for reporting.
+    """
+
+    __tablename__ = "order_lines"
+
+    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), index=True)
+    menu_item_id: Mapped[int | None] = mapped_column(Integer, index=True)
+    category_id: Mapped[int | None] = mapped_column(Integer)
+    name: Mapped[str] = mapped_column(String(100))
+    unit_price: Mapped[Money] = mapped_column(MoneyType())
+    modifiers_price: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    quantity: Mapped[int] = mapped_column(Integer, default=1)
+    discount: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    line_total: Mapped[Money] = mapped_column(MoneyType(), default=0)
+
+    order: Mapped[Order] = relationship(back_populates="lines")
+
+    def __repr__(self) -> str:
+        return f"<OrderLine {self.id}: {self.quantity} x {self.name}>"
@@ -0,0 +1,23 @@
+"""Permission definitions for orders blueprint."""
+
+from enum import StrEnum
+
+
+class OrdersPermissions(StrEnum):
+    """Permissions for orders functionality."""
+
+    VIEW = "view:orders"
+    CREATE = "create:orders"
+    EDIT = "edit:orders"
+    DELETE = "delete:orders"
+
+
+# Policy definitions can be added here when the permissions system is set up
+# ORDERS_FULL_ACCESS = PolicyDefinition(
+#     name="Orders Full Access",
+#     description="Complete access to orders functionality",
+#     permissions=list(OrdersPermissions),
+#     is_system=True,
+# )
+#
+# DEFAULT_POLICIES = [ORDERS_FULL_ACCESS]
@@ -0,0 +1,190 @@
+"""Route handlers for orders blueprint."""
+
+from urllib.parse import urlsplit
+
+from flask import (
+    abort,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
+from sqlalchemy.orm import selectinload
+
+from librepos.app.extensions import csrf, db
+from librepos.app.shared.decorators import require_permission
+from librepos.app.shared.exceptions import OrderNotOpenError
+from librepos.app.shared.htmx import is_htmx_request, render_htmx
+from librepos.app.shared.money import Money
+from librepos.app.shared.pagination import paginate_keyset
+
+from . import bp
+from .forms import LineQuantityForm, OrderLineForm
+from .models import Order, OrderStatus
+from .permissions import OrdersPermissions
+from .services import OrderService, OrderSyncService
+
+
+@bp.route("/")
+@require_permission(OrdersPermissions.VIEW)
+def index():
+    """List view for open orders."""
+    stmt = db.select(Order).filter_by(status=OrderStatus.OPEN)
+    page = paginate_keyset(stmt, Order.id)
+    # Infinite scroll asks for the next rows; live refreshes swap the table
+    next_rows = bool(request.args.get("cursor"))
+    context = {
+        "head_title": "Orders | LibrePOS",
+        "appbar_title": "Orders",
+        "page": page,
+        "first_page": not next_rows,
+    }
+    block = "order_rows" if next_rows else "open_orders"
+    return render_htmx("orders/index.html", block, **context)
+
+
+@bp.post("/")
+@require_permission(OrdersPermissions.CREATE)
+def create():
+    """Open a new ticket."""
+    order = OrderService.open_order()
+    return redirect(url_for("orders.detail", id=order.id))
+
+
+@bp.route("/<int:id>")
+@require_permission(OrdersPermissions.VIEW)
+def detail(id: int):
+    """Ticket view for a single order."""
+    order = _get_order_or_404(id, with_lines=True)
+    context = {
+        "head_title": f"Order #{order.id} | LibrePOS",
+        "appbar_title": f"Order #{order.id}",
+        "order": order,
+        "form": OrderLineForm(),
+    }
+    return render_htmx("orders/detail.html", partial="orders/_ticket.html", **context)
+
+
+@bp.post("/<int:id>/lines")
+@require_permission(OrdersPermissions.EDIT)
+def add_line(id: int):
+    """Ring up a line; HTMX requests get the refreshed ticket back."""
+    order = _get_order_or_404(id, for_update=True)
+    form = OrderLineForm()
+    name, price, quantity = form.name.data, form.unit_price.data, form.quantity.data
+    # The validators guarantee the values; the checks narrow their types
+    if form.validate_on_submit() and name and price is not None and quantity is not None:
+        OrderService.add_line(
+            order, name=name, unit_price=Money.from_decimal(price), quantity=quantity
+        )
+    return _ticket_response(order.id)
+
+
+@bp.post("/<int:id>/lines/<int:line_id>")
+@require_permission(OrdersPermissions.EDIT)
+def update_line(id: int, line_id: int):
+    """Change a line's quantity (zero removes it)."""
+    order = _get_order_or_404(id, for_update=True)
+    line = OrderService.get_line(order, line_id) or abort(404)
+    form = LineQuantityForm()
+    if form.validate_on_submit():
+        OrderService.update_line(order, line, quantity=form.quantity.data)
+    return _ticket_response(order.id)
+
+
+@bp.post("/<int:id>/lines/<int:line_id>/delete")
+@require_permission(OrdersPermissions.EDIT)
+def remove_line(id: int, line_id: int):
+    """Remove a line from the ticket."""
+    order = _get_order_or_404(id, for_update=True)
+    line = OrderService.get_line(order, line_id) or abort(404)
+    OrderService.remove_line(order, line)
+    return _ticket_response(order.id)
+
+
+@bp.post("/<int:id>/close")
+@require_permission(OrdersPermissions.EDIT)
+def close(id: int):
+    """Take payment and close the ticket."""
+    order = _get_order_or_404(id, for_update=True)
+    OrderService.close_order(order)
+    return _ticket_response(order.id)
+
+
+@bp.post("/sync")
+@csrf.exempt
+@require_permission(OrdersPermissions.CREATE, OrdersPermissions.EDIT)
+def sync():
+    """Ingest a batch of orders queued offline by a terminal's service worker.
+
+    Body: ``{"orders": [{"key": ..., "status": "open" | "paid", "lines": [...]}]}``
+    with money in integer cents. Returns one result per order. Paid orders
+    close tickets, so the terminal's user needs both create and edit rights.
+    The service worker has no CSRF token, so instead the request must be
+    JSON (which a cross-site form cannot send) from this origin.
+    """
+    _require_same_origin_json()
+    data = request.get_json(silent=True)
+    orders = data.get("orders") if isinstance(data, dict) else None
+    if not isinstance(orders, list):
+        return jsonify(error="expected an object with an 'orders' list"), 400
+    max_batch = current_app.config["ORDERS_SYNC_MAX_BATCH"]
+    if len(orders) > max_batch:
+        return jsonify(error=f"at most {max_batch} orders per request"), 413
+    return jsonify(results=OrderSyncService.ingest(orders))
+
+
+@bp.errorhandler(OrderNotOpenError)
+def order_not_open(error: OrderNotOpenError):
+    """A ticket was paid or voided (e.g. on another terminal) before this change.
+
+    HTMX swaps only 2xx responses, so they get the current ticket back with
+    the reason flashed inside it; anything else gets a plain 409.
+    """
+    db.session.rollback()
+    if is_htmx_request():
+        flash(f"Order #{error.order_id} is already {error.status}.", "warning")
+        return _ticket_response(error.order_id)
+    return str(error), 409
+
+
+def _require_same_origin_json() -> None:
+    if not request.is_json:
+        abort(415)
+    origin = request.headers.get("Origin")
+    if origin is not None and not _is_trusted_origin(origin):
+        abort(403)
+    if request.headers.get("Sec-Fetch-Site", "same-origin") not in ("same-origin", "none"):
+        abort(403)
+
+
+def _is_trusted_origin(origin: str) -> bool:
+    # Behind a TLS-terminating proxy the app sees http:// while the browser
+    # sends https://, so only the host is compared with this request's
+    if urlsplit(origin).netloc == request.host:
+        return True
+    return origin in current_app.config["ORDERS_SYNC_TRUSTED_ORIGINS"]
+
+
+def _get_order_or_404(order_id: int, *, with_lines: bool = False, for_update: bool = False):
+    if for_update:
+        order = OrderService.get_for_update(order_id)
+    elif with_lines:
+        order = db.session.get(
+            Order, order_id, options=[selectinload(Order.lines)], populate_existing=True
+        )
+    else:
+        order = db.session.get(Order, order_id)
+    if order is None:
+        abort(404)
+    return order
+
+
+def _ticket_response(order_id: int):
+    if is_htmx_request():
+        order = _get_order_or_404(order_id, with_lines=True)
+        return render_template("orders/_ticket.html", order=order, form=OrderLineForm())
+    return redirect(url_for("orders.detail", id=order_id))
@@ -0,0 +1,477 @@
+"""Business logic for orders blueprint.
+
+The order-totals engine keeps ``Order.subtotal/discount/tax/total`` up to
+date incrementally: a line change computes that one line's new total and
+applies the difference to the order row, so the cost of a click does not
+grow with the size of the ticket. All arithmetic is in integer cents:
+
+- line_total = max((unit_price + modifiers_price) * quantity - line discount, 0)
+- subtotal   = sum of line_total
+- discount   = order-level discount, capped at the subtotal
+- tax        = (subtotal - discount) * tax_rate_bp / 10000, rounded half up,
+               computed once per order (never per line)
+- total      = subtotal - discount + tax
+
+Each committed change is pushed to terminals as an ``order-updated`` event
+on the "orders" SSE channel (see shared/events.py).
+
+``OrderSyncService`` ingests orders that terminals queued while offline:
+a whole batch is deduplicated by client idempotency key with one lookup and
+inserted in one transaction, so replaying a queue after a Wi-Fi drop costs
+one request rather than one per order.
+"""
+
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from librepos.app.extensions import db
+from librepos.app.shared.events import event_hub
+from librepos.app.shared.exceptions import OrderNotOpenError
+from librepos.app.shared.money import Money
+
+from .models import Order, OrderLine, OrderStatus
+from .signals import order_closed
+
+
+def _money(cents: int) -> Money:
+    return Money(cents, current_app.config["BUSINESS_CURRENCY"])
+
+
+def _cents(value: Money | int | None) -> int:
+    if isinstance(value, Money):
+        return value.cents
+    return int(value or 0)
+
+
+def compute_line_total(
+    unit_price: Money | int,
+    quantity: int,
+    modifiers_price: Money | int = 0,
+    discount: Money | int = 0,
+) -> int:
+    """Return a line's total in cents; a discount never takes it below zero."""
+    gross = (_cents(unit_price) + _cents(modifiers_price)) * quantity
+    return max(gross - _cents(discount), 0)
+
+
+def compute_order_totals(subtotal: int, discount: int, tax_rate_bp: int) -> tuple[int, int, int]:
+    """Return ``(applied_discount, tax, total)`` in cents for an order subtotal."""
+    applied = min(max(discount, 0), subtotal)
+    taxable = subtotal - applied
+    tax = Money(taxable).apply_rate(tax_rate_bp).cents
+    return applied, tax, taxable + tax
+
+
+class OrderService:
+    """Service class for orders operations."""
+
+    @staticmethod
+    def open_order(tax_rate_bp: int | None = None) -> Order:
+        """Open an empty ticket at the configured sales tax rate."""
+        if tax_rate_bp is None:
+            tax_rate_bp = current_app.config["SALES_TAX_RATE_BP"]
+        order = Order(
+            status=OrderStatus.OPEN,
+            tax_rate_bp=tax_rate_bp,
+            line_count=0,
+            subtotal=Money.zero(),
+            discount=Money.zero(),
+            tax=Money.zero(),
+            total=Money.zero(),
+        )
+        db.session.add(order)
+        _commit(order)
+        return order
+
+    @staticmethod
+    def get_for_update(order_id: int) -> Order | None:
+        """Load an order row, locking it where the backend supports it.
+
+        Two terminals ringing up the same ticket then apply their deltas one
+        after the other instead of overwriting each other's totals.
+        """
+        stmt = db.select(Order).where(Order.id == order_id).with_for_update()
+        return db.session.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def get_line(order: Order, line_id: int) -> OrderLine | None:
+        """Get one line of an order."""
+        line = db.session.get(OrderLine, line_id)
+        if line is None or line.order_id != order.id:
+            return None
+        return line
+
+    @staticmethod
+    def add_line(
+        order: Order,
+        *,
+        name: str,
+        unit_price: Money | int,
+        quantity: int = 1,
+        modifiers_price: Money | int = 0,
+        discount: Money | int = 0,
+        menu_item_id: int | None = None,
+        category_id: int | None = None,
+        commit: bool = True,
+    ) -> OrderLine:
+        """Ring up a line and add its total to the order."""
+        _ensure_open(order)
+        line_total = compute_line_total(unit_price, quantity, modifiers_price, discount)
+        line = OrderLine(
+            order_id=order.id,
+            menu_item_id=menu_item_id,
+            category_id=category_id,
+            name=name,
+            unit_price=_money(_cents(unit_price)),
+            modifiers_price=_money(_cents(modifiers_price)),
+            quantity=quantity,
+            discount=_money(_cents(discount)),
+            line_total=_money(line_total),
+        )
+        db.session.add(line)
+        _apply_delta(order, line_total, line_delta=1)
+        if commit:
+            _commit(order)
+        return line
+
+    @staticmethod
+    def update_line(
+        order: Order,
+        line: OrderLine,
+        *,
+        quantity: int | None = None,
+        modifiers_price: Money | int | None = None,
+        discount: Money | int | None = None,
+        commit: bool = True,
+    ) -> OrderLine:
+        """Change a line and apply only the difference to the order.
+
+        A quantity of zero or less removes the line.
+        """
+        _ensure_open(order)
+        if quantity is not None and quantity <= 0:
+            OrderService.remove_line(order, line, commit=commit)
+            return line
+
+        if quantity is not None:
+            line.quantity = quantity
+        if modifiers_price is not None:
+            line.modifiers_price = _money(_cents(modifiers_price))
+        if discount is not None:
+            line.discount = _money(_cents(discount))
+
+        old_total = _cents(line.line_total)
+        new_total = compute_line_total(
+            line.unit_price, line.quantity, line.modifiers_price, line.discount
+        )
+        line.line_total = _money(new_total)
+        _apply_delta(order, new_total - old_total)
+        if commit:
+            _commit(order)
+        return line
+
+    @staticmethod
+    def remove_line(order: Order, line: OrderLine, *, commit: bool = True) -> None:
+        """Remove a line and subtract its total from the order."""
+        _ensure_open(order)
+        _apply_delta(order, -_cents(line.line_total), line_delta=-1)
+        db.session.delete(line)
+        if commit:
+            _commit(order)
+
+    @staticmethod
+    def set_discount(order: Order, amount: Money | int, *, commit: bool = True) -> Order:
+        """Set the order-level discount (taken before tax)."""
+        _ensure_open(order)
+        order.discount = _money(_cents(amount))
+        _apply_delta(order, 0)
+        if commit:
+            _commit(order)
+        return order
+
+    @staticmethod
+    def close_order(order: Order) -> Order:
+        """Mark an open order as paid and announce it on ``order_closed``."""
+        _ensure_open(order)
+        order.status = OrderStatus.PAID
+        order.closed_at = datetime.now(UTC)
+        _commit(order)
+        order_closed.send(current_app._get_current_object(), order_ids=[order.id])  # type: ignore[attr-defined]
+        return order
+
+    @staticmethod
+    def recalculate(order: Order, *, commit: bool = True) -> Order:
+        """Rebuild the denormalized totals from the lines in one aggregate query.
+
+        The incremental path never needs this; it is for repairs and checks.
+        """
+        stmt = select(
+            db.func.coalesce(db.func.sum(OrderLine.line_total), 0),
+            db.func.count(OrderLine.id),
+        ).where(OrderLine.order_id == order.id)
+        subtotal, line_count = db.session.execute(stmt).one()
+        order.line_count = line_count
+        _set_totals(order, _cents(subtotal))
+        if commit:
+            _commit(order)
+        return order
+
+
+SYNC_CREATED = "created"
+SYNC_DUPLICATE = "duplicate"
+SYNC_INVALID = "invalid"
+
+CLIENT_KEY_MAX_LENGTH = 64
+# Largest value of an INTEGER column on every supported database
+SYNC_INT_MAX = 2**31 - 1
+
+
+class SyncOrder(NamedTuple):
+    """A validated queued order: its key, order row and line rows."""
+
+    key: str
+    row: dict[str, Any]
+    lines: list[dict[str, Any]]
+
+
+class OrderSyncService:
+    """Ingests batches of orders queued by terminals while offline."""
+
+    @staticmethod
+    def ingest(payloads: list[Any]) -> list[dict[str, Any]]:
+        """Insert every new order of a batch in one transaction.
+
+        Each payload carries a client-generated ``key``; orders whose key is
+        already stored (or repeated earlier in the batch) are reported as
+        duplicates with the id of the stored order, so a terminal can safely
+        resend a batch whose response it never received. Payloads that fail
+        validation are reported as invalid and do not affect the others.
+
+        Only the lines are taken from the terminal: tax uses this server's
+        SALES_TAX_RATE_BP, and ``opened_at``/``closed_at`` must fall within
+        ``ORDERS_SYNC_MAX_AGE`` seconds (future times count as now), so a
+        queued order cannot land in an already reported business day.
+
+        Returns:
+            list[dict]: One result per payload, in order, with ``key``,
+            ``status`` (created, duplicate or invalid) and ``order_id`` or
+            ``error``.
+        """
+        results: list[dict[str, Any]] = []
+        parsed: list[tuple[int, SyncOrder]] = []
+        for index, payload in enumerate(payloads):
+            try:
+                parsed.append((index, _sync_order_from_payload(payload)))
+                results.append({})
+            except ValueError as e:
+                key = payload.get("key") if isinstance(payload, dict) else None
+                results.append({"key": key, "status": SYNC_INVALID, "error": str(e)})
+
+        try:
+            created = _insert_new_orders(parsed, results)
+        except IntegrityError:
+            # A concurrent request stored one of the keys first; the retry
+            # sees it as a duplicate
+            db.session.rollback()
+            created = _insert_new_orders(parsed, results)
+
+        for payload in created:
+            event_hub.publish("orders", "order-updated", payload, key=f"order:{payload['id']}")
+        paid_ids = [payload["id"] for payload in created if payload["status"] == OrderStatus.PAID]
+        if paid_ids:
+            order_closed.send(current_app._get_current_object(), order_ids=paid_ids)  # type: ignore[attr-defined]
+        return results
+
+
+def _insert_new_orders(parsed: list[tuple[int, SyncOrder]], results: list[dict]) -> list[dict]:
+    """Insert the orders whose keys are new, commit once and fill in ``results``.
+
+    Orders and lines go in with one executemany each, and the new ids are
+    read back by key, so the statement count does not grow with the batch.
+    Returns the event payloads of the created orders.
+    """
+    stored = _order_ids_by_key([order.key for _, order in parsed])
+
+    new: dict[str, SyncOrder] = {}
+    for _, order in parsed:
+        if order.key not in stored:
+            new.setdefault(order.key, order)
+
+    created_ids = {}
+    if new:
+        Order.bulk_create([order.row for order in new.values()], commit=False)
+        created_ids = _order_ids_by_key(list(new))
+        OrderLine.bulk_create(
+            [
+                {**line, "order_id": created_ids[key]}
+                for key, order in new.items()
+                for line in order.lines
+            ],
+            commit=False,
+        )
+    db.session.commit()
+
+    claimed = set()
+    for index, order in parsed:
+        if order.key in created_ids and order.key not in claimed:
+            claimed.add(order.key)
+            status = SYNC_CREATED
+        else:
+            status = SYNC_DUPLICATE
+        order_id = created_ids.get(order.key) or stored[order.key]
+        results[index] = {"key": order.key, "status": status, "order_id": order_id}
+
+    return [
+        {
+            "id": created_ids[key],
+            "status": order.row["status"],
+            "line_count": order.row["line_count"],
+            "total": _cents(order.row["total"]),
+        }
+        for key, order in new.items()
+    ]
+
+
+def _order_ids_by_key(keys: list[str]) -> dict[str, int]:
+    stmt = select(Order.client_key, Order.id).where(Order.client_key.in_(keys))
+    return {key: order_id for key, order_id in db.session.execute(stmt) if key is not None}
+
+
+def _sync_order_from_payload(payload: Any) -> SyncOrder:
+    """Validate one queued order and compute its totals; raises ValueError."""
+    if not isinstance(payload, dict):
+        raise ValueError("order must be an object")
+    key = payload.get("key")
+    if not isinstance(key, str) or not 0 < len(key) <= CLIENT_KEY_MAX_LENGTH:
+        raise ValueError(f"key must be a string of 1-{CLIENT_KEY_MAX_LENGTH} characters")
+    status = payload.get("status", OrderStatus.OPEN)
+    if status not in (OrderStatus.OPEN, OrderStatus.PAID):
+        raise ValueError("status must be 'open' or 'paid'")
+    line_payloads = payload.get("lines")
+    if not isinstance(line_payloads, list) or not line_payloads:
+        raise ValueError("lines must be a non-empty list")
+
+    lines = []
+    for line in line_payloads:
+        if not isinstance(line, dict):
+            raise ValueError("each line must be an object")
+        name = line.get("name")
+        if not isinstance(name, str) or not 0 < len(name) <= 100:
+            raise ValueError("line name must be a string of 1-100 characters")
+        unit_price = _int_field(line, "unit_price")
+        modifiers_price = _int_field(line, "modifiers_price", 0)
+        discount = _int_field(line, "discount", 0)
+        quantity = _int_field(line, "quantity", 1, minimum=1)
+        line_total = compute_line_total(unit_price, quantity, modifiers_price, discount)
+        if line_total > SYNC_INT_MAX:
+            raise ValueError(f"line total must be at most {SYNC_INT_MAX}")
+        lines.append(
+            {
+                "menu_item_id": _int_field(line, "menu_item_id", None),
+                "category_id": _int_field(line, "category_id", None),
+                "name": name,
+                "unit_price": _money(unit_price),
+                "modifiers_price": _money(modifiers_price),
+                "quantity": quantity,
+                "discount": _money(discount),
+                "line_total": _money(line_total),
+            }
+        )
+
+    tax_rate_bp = current_app.config["SALES_TAX_RATE_BP"]
+    discount = _int_field(payload, "discount", 0)
+    subtotal = sum(line["line_total"].cents for line in lines)
+    _, tax, total = compute_order_totals(subtotal, discount, tax_rate_bp)
+    if total > SYNC_INT_MAX:
+        raise ValueError(f"order total must be at most {SYNC_INT_MAX}")
+
+    now = datetime.now(UTC)
+    oldest = now - timedelta(seconds=current_app.config["ORDERS_SYNC_MAX_AGE"])
+    opened_at = _timestamp_field(payload, "opened_at", oldest, now) or now
+    closed_at = None
+    if status == OrderStatus.PAID:
+        closed_at = max(_timestamp_field(payload, "closed_at", oldest, now) or now, opened_at)
+    row = {
+        "client_key": key,
+        "status": status,
+        "tax_rate_bp": tax_rate_bp,
+        "line_count": len(lines),
+        "subtotal": _money(subtotal),
+        "discount": _money(discount),
+        "tax": _money(tax),
+        "total": _money(total),
+        "closed_at": closed_at,
+        # Taken offline: keep the time the ticket was opened at the till
+        "created_at": opened_at,
+    }
+    return SyncOrder(key, row, lines)
+
+
+def _int_field(data: dict, name: str, default: Any = ..., *, minimum: int = 0) -> Any:
+    value = data.get(name, default)
+    if value is ...:
+        raise ValueError(f"{name} is required")
+    if value is None and default is None:
+        return None
+    if (
+        not isinstance(value, int)
+        or isinstance(value, bool)
+        or not minimum <= value <= SYNC_INT_MAX
+    ):
+        raise ValueError(f"{name} must be an integer from {minimum} to {SYNC_INT_MAX}")
+    return value
+
+
+def _timestamp_field(data: dict, name: str, oldest: datetime, newest: datetime) -> datetime | None:
+    value = data.get(name)
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{name} must be an ISO 8601 timestamp") from e
+    # Terminals send UTC (Date.toISOString()); naive values are taken as UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    if parsed < oldest:
+        raise ValueError(f"{name} is older than the offline sync window")
+    # A terminal clock running ahead is not an error
+    return min(parsed, newest)
+
+
+def _payload(order: Order) -> dict[str, Any]:
+    return {
+        "id": order.id,
+        "status": order.status,
+        "line_count": order.line_count,
+        "total": _cents(order.total),
+    }
+
+
+def _commit(order: Order) -> None:
+    """Commit, then push the ticket's new totals to subscribed terminals."""
+    db.session.flush()
+    payload = _payload(order)
+    db.session.commit()
+    event_hub.publish("orders", "order-updated", payload, key=f"order:{order.id}")
+
+
+def _ensure_open(order: Order) -> None:
+    if order.status != OrderStatus.OPEN:
+        raise OrderNotOpenError(order.id, order.status)
+
+
+def _apply_delta(order: Order, subtotal_delta: int, *, line_delta: int = 0) -> None:
+    order.line_count = (order.line_count or 0) + line_delta
+    _set_totals(order, _cents(order.subtotal) + subtotal_delta)
+
+
+def _set_totals(order: Order, subtotal: int) -> None:
+    _, tax, total = compute_order_totals(subtotal, _cents(order.discount), order.tax_rate_bp)
+    order.subtotal = _money(subtotal)
+    order.tax = _money(tax)
+    order.total = _money(total)
@@ -0,0 +1,8 @@
+"""Signals sent by the orders blueprint."""
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+#: Sent after orders are paid and committed, with their ``order_ids``.
+order_closed = _signals.signal("order-closed")
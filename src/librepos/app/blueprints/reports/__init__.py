@@ -0,0 +1,15 @@
+"""
+Sales reports
+"""
+
+from flask import Blueprint
+
+bp = Blueprint(
+    "reports",
+    __name__,
+    template_folder="templates",
+    static_folder="static",
+    url_prefix="/reports",
+)
+
+from . import routes  # noqa: E402, F401
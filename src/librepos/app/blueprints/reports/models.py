@@ -0,0 +1,53 @@
+"""SQLAlchemy models for reports blueprint.
+
+Rollup tables are maintained incrementally as orders close (see
+services.RollupService), so reports never aggregate raw order lines.
+"""
+
+from datetime import date
+
+from sqlalchemy import Date, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from librepos.app.extensions import db
+from librepos.app.shared.mixins import CRUDMixin
+from librepos.app.shared.money import Money, MoneyType
+
+# Stands in for "no menu item / no category" (open-priced lines), since NULLs
+# never conflict in a unique index
+UNASSIGNED = 0
+
+
+class SalesRollup(db.Model, CRUDMixin):
+    """Item sales per business day, hour and category."""
+
+    __tablename__ = "sales_rollups"
+    __table_args__ = (UniqueConstraint("business_date", "hour", "category_id", "menu_item_id"),)
+
+    business_date: Mapped[date] = mapped_column(Date, index=True)
+    hour: Mapped[int] = mapped_column(Integer)
+    category_id: Mapped[int] = mapped_column(Integer, default=UNASSIGNED)
+    menu_item_id: Mapped[int] = mapped_column(Integer, default=UNASSIGNED)
+    item_name: Mapped[str] = mapped_column(String(100))
+    quantity: Mapped[int] = mapped_column(Integer, default=0)
+    line_count: Mapped[int] = mapped_column(Integer, default=0)
+    sales: Mapped[Money] = mapped_column(MoneyType(), default=0)
+
+    def __repr__(self) -> str:
+        return f"<SalesRollup {self.business_date} {self.hour:02d}h {self.item_name}>"
+
+
+class DailySalesSummary(db.Model, CRUDMixin):
+    """Order-level totals per business day (discounts and tax live here)."""
+
+    __tablename__ = "daily_sales_summaries"
+
+    business_date: Mapped[date] = mapped_column(Date, unique=True)
+    order_count: Mapped[int] = mapped_column(Integer, default=0)
+    subtotal: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    discount: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    tax: Mapped[Money] = mapped_column(MoneyType(), default=0)
+    total: Mapped[Money] = mapped_column(MoneyType(), default=0)
+
+    def __repr__(self) -> str:
+        return f"<DailySalesSummary {self.business_date}: {self.total}>"
@@ -0,0 +1,23 @@
+"""Permission definitions for reports blueprint."""
+
+from enum import StrEnum
+
+
+class ReportsPermissions(StrEnum):
+    """Permissions for reports functionality."""
+
+    VIEW = "view:reports"
+    CREATE = "create:reports"
+    EDIT = "edit:reports"
+    DELETE = "delete:reports"
+
+
+# Policy definitions can be added here when the permissions system is set up
+# REPORTS_FULL_ACCESS = PolicyDefinition(
+#     name="Reports Full Access",
+#     description="Complete access to reports functionality",
+#     permissions=list(ReportsPermissions),
+#     is_system=True,
+# )
+#
+# DEFAULT_POLICIES = [REPORTS_FULL_ACCESS]
@@ -0,0 +1,51 @@
+"""Route handlers for reports blueprint."""
+
+from datetime import date, timedelta
+
+from flask import request
+
+from librepos.app.shared.decorators import require_permission
+from librepos.app.shared.helpers import fetch_time_by_timezone
+from librepos.app.shared.htmx import render_htmx
+
+from . import bp
+from .permissions import ReportsPermissions
+from .services import ReportService
+
+DEFAULT_RANGE_DAYS = 7
+
+
+@bp.route("/")
+@require_permission(ReportsPermissions.VIEW)
+def index():
+    """Sales overview for a range of business days (default: the last week)."""
+    end = _date_arg("end") or fetch_time_by_timezone().date()
+    start = _date_arg("start") or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        start, end = end, start
+
+    summaries = ReportService.daily_summaries(start, end)
+    context = {
+        "head_title": "Reports | LibrePOS",
+        "appbar_title": "Reports",
+        "start": start,
+        "end": end,
+        "summaries": summaries,
+        "totals": {
+            field: sum(getattr(s, field) for s in summaries)
+            for field in ("order_count", "subtotal", "discount", "tax", "total")
+        },
+        "top_items": ReportService.top_items(start, end),
+        "hourly_sales": ReportService.sales_by_hour(start, end),
+    }
+    return render_htmx("reports/index.html", "report", **context)
+
+
+def _date_arg(name: str) -> date | None:
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
@@ -0,0 +1,231 @@
+"""Business logic for reports blueprint.
+
+``RollupService.roll_up`` folds closed orders into the rollup tables in
+batches: it claims orders that are paid but not yet rolled up by stamping
+``Order.rolled_up_at`` with ``UPDATE ... RETURNING`` (so concurrent callers
+never claim the same order), aggregates the claimed orders' lines in Python
+and adds the sums to the rollup rows with ``bulk_upsert(increment_columns=...)``,
+all in one transaction. The ``rolled_up_at`` marker is the watermark: each
+order is counted exactly once, whether it was rolled up on close or by
+``flask reports catch-up``.
+"""
+
+from collections import defaultdict
+from datetime import UTC, date, datetime
+
+from flask import current_app
+from sqlalchemy import select
+
+from librepos.app.blueprints.orders.models import Order, OrderLine, OrderStatus
+from librepos.app.blueprints.orders.signals import order_closed
+from librepos.app.extensions import db
+from librepos.app.shared.helpers import business_day_bounds, to_business_time
+from librepos.app.shared.money import Money
+
+from .models import UNASSIGNED, DailySalesSummary, SalesRollup
+
+ROLLUP_BATCH_SIZE = 500
+
+_ROLLUP_KEY = ["business_date", "hour", "category_id", "menu_item_id"]
+_ROLLUP_SUMS = ["quantity", "line_count", "sales"]
+_SUMMARY_SUMS = ["order_count", "subtotal", "discount", "tax", "total"]
+
+
+def _cents(value: Money | int | None) -> int:
+    return value.cents if isinstance(value, Money) else int(value or 0)
+
+
+class RollupService:
+    """Maintains the sales rollup tables."""
+
+    @staticmethod
+    def roll_up(order_ids: list[int] | None = None, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """Add one batch of closed, not yet rolled-up orders to the rollups.
+
+        Args:
+            order_ids: Only consider these orders (e.g. the one just closed)
+            batch_size: Maximum orders processed in this call
+
+        Returns:
+            int: Number of orders rolled up (0 when caught up)
+        """
+        now = datetime.now(UTC)
+        pending = (
+            db.select(Order.id)
+            .where(Order.status == OrderStatus.PAID, Order.rolled_up_at.is_(None))
+            .order_by(Order.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        if order_ids is not None:
+            pending = pending.where(Order.id.in_(order_ids))
+        # Claim and stamp in one statement: a concurrent roll_up (another
+        # worker, catch-up, a close) skips orders already claimed here
+        claimed = (
+            db.session.execute(
+                db.update(Order)
+                .where(Order.id.in_(pending.scalar_subquery()), Order.rolled_up_at.is_(None))
+                .values(rolled_up_at=now)
+                .returning(Order.id)
+                .execution_options(synchronize_session=False)
+            )
+            .scalars()
+            .all()
+        )
+        if not claimed:
+            db.session.commit()  # ends the claim's write transaction
+            return 0
+        orders = db.session.execute(db.select(Order).where(Order.id.in_(claimed))).scalars().all()
+
+        rollups: dict[tuple, dict] = {}
+        summaries: dict[date, dict] = defaultdict(lambda: dict.fromkeys(_SUMMARY_SUMS, 0))
+        bucket_by_order = {}
+        for order in orders:
+            # Paid orders always carry closed_at; very old rows fall back to creation
+            local = to_business_time(order.closed_at or order.created_at)
+            bucket_by_order[order.id] = (local.date(), local.hour)
+            summary = summaries[local.date()]
+            summary["order_count"] += 1
+            summary["subtotal"] += _cents(order.subtotal)
+            summary["discount"] += min(_cents(order.discount), _cents(order.subtotal))
+            summary["tax"] += _cents(order.tax)
+            summary["total"] += _cents(order.total)
+
+        lines = db.session.execute(
+            select(
+                OrderLine.order_id,
+                OrderLine.menu_item_id,
+                OrderLine.category_id,
+                OrderLine.name,
+                OrderLine.quantity,
+                OrderLine.line_total,
+            ).where(OrderLine.order_id.in_(claimed))
+        )
+        for order_id, item_id, category_id, name, quantity, line_total in lines:
+            business_date, hour = bucket_by_order[order_id]
+            key = (business_date, hour, category_id or UNASSIGNED, item_id or UNASSIGNED)
+            row = rollups.get(key)
+            if row is None:
+                row = rollups[key] = {
+                    **dict(zip(_ROLLUP_KEY, key, strict=True)),
+                    "item_name": name if item_id else "Open items",
+                    **dict.fromkeys(_ROLLUP_SUMS, 0),
+                }
+            row["quantity"] += quantity
+            row["line_count"] += 1
+            row["sales"] += _cents(line_total)
+
+        SalesRollup.bulk_upsert(
+            list(rollups.values()),
+            index_elements=_ROLLUP_KEY,
+            update_columns=["item_name"],
+            increment_columns=_ROLLUP_SUMS,
+            commit=False,
+        )
+        DailySalesSummary.bulk_upsert(
+            [{"business_date": day, **sums} for day, sums in summaries.items()],
+            index_elements=["business_date"],
+            update_columns=[],
+            increment_columns=_SUMMARY_SUMS,
+            commit=False,
+        )
+        db.session.commit()
+        return len(claimed)
+
+    @staticmethod
+    def catch_up(batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """Roll up every pending closed order, batch by batch."""
+        total = 0
+        while processed := RollupService.roll_up(batch_size=batch_size):
+            total += processed
+        return total
+
+    @staticmethod
+    def rebuild(start: date, end: date, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """Recompute the rollups of business days ``start`` through ``end``.
+
+        Clears the range, marks its orders as pending again and rolls them
+        up from scratch.
+
+        Returns:
+            int: Number of orders rolled up
+        """
+        range_start, _ = business_day_bounds(start)
+        _, range_end = business_day_bounds(end)
+
+        db.session.execute(
+            db.delete(SalesRollup).where(SalesRollup.business_date.between(start, end))
+        )
+        db.session.execute(
+            db.delete(DailySalesSummary).where(DailySalesSummary.business_date.between(start, end))
+        )
+        db.session.execute(
+            db.update(Order)
+            .where(Order.closed_at >= range_start, Order.closed_at < range_end)
+            .values(rolled_up_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return RollupService.catch_up(batch_size)
+
+
+@order_closed.connect
+def _roll_up_closed_order(_sender, order_ids: list[int], **_extra) -> None:
+    """Count just-paid orders right away; catch-up picks up anything missed."""
+    if current_app.config["REPORTS_ROLLUP_ON_CLOSE"]:
+        RollupService.roll_up(order_ids=order_ids)
+
+
+class ReportService:
+    """Read-side queries; everything here reads the rollups only."""
+
+    @staticmethod
+    def daily_summaries(start: date, end: date):
+        """Daily order totals for a range, oldest first."""
+        stmt = (
+            db.select(DailySalesSummary)
+            .where(DailySalesSummary.business_date.between(start, end))
+            .order_by(DailySalesSummary.business_date)
+        )
+        return db.session.execute(stmt).scalars().all()
+
+    @staticmethod
+    def top_items(start: date, end: date, limit: int = 10):
+        """Best-selling items by sales for a range."""
+        sales = db.func.sum(SalesRollup.sales).label("sales")
+        stmt = (
+            db.select(
+                SalesRollup.menu_item_id,
+                db.func.max(SalesRollup.item_name).label("item_name"),
+                db.func.sum(SalesRollup.quantity).label("quantity"),
+                sales,
+            )
+            .where(SalesRollup.business_date.between(start, end))
+            .group_by(SalesRollup.menu_item_id)
+            .order_by(sales.desc())
+            .limit(limit)
+        )
+        return db.session.execute(stmt).all()
+
+    @staticmethod
+    def sales_by_category(start: date, end: date):
+        """Sales per category id for a range."""
+        stmt = (
+            db.select(SalesRollup.category_id, db.func.sum(SalesRollup.sales).label("sales"))
+            .where(SalesRollup.business_date.between(start, end))
+            .group_by(SalesRollup.category_id)
+        )
+        return db.session.execute(stmt).all()
+
+    @staticmethod
+    def sales_by_hour(start: date, end: date) -> list[int]:
+        """Sales in cents for each hour of the day (0-23) over a range."""
+        stmt = (
+            select(SalesRollup.hour, db.func.sum(SalesRollup.sales))
+            .where(SalesRollup.business_date.between(start, end))
+            .group_by(SalesRollup.hour)
+        )
+        hours = [0] * 24
+        for hour, sales in db.session.execute(stmt):
+            hours[hour] = _cents(sales)
+        return hours
@@ -0,0 +1,27 @@
+/**
+ * Sales-by-hour chart for the reports page.
+ * Reads hourly sales (integer cents) from the canvas data-cents attribute,
+ * and redraws when HTMX swaps in the report for a new date range.
+ */
+const drawHourlySalesChart = () => {
+    const canvas = document.getElementById("hourly-sales-chart");
+    if (!canvas || typeof Chart === "undefined" || Chart.getChart(canvas)) {
+        return;
+    }
+
+    const cents = JSON.parse(canvas.dataset.cents || "[]");
+    new Chart(canvas, {
+        type: "bar",
+        data: {
+            labels: cents.map((_, hour) => `${String(hour).padStart(2, "0")}:00`),
+            datasets: [{label: "Sales", data: cents.map((value) => value / 100)}],
+        },
+        options: {
+            plugins: {legend: {display: false}},
+            scales: {y: {beginAtZero: true}},
+        },
+    });
+};
+
+document.addEventListener("DOMContentLoaded", drawHourlySalesChart);
+document.body.addEventListener("htmx:afterSettle", drawHourlySalesChart);
@@ -1,7 +1,22 @@
 """Flask CLI commands for LibrePOS."""
 
+from datetime import date
+
 import click
-from flask import Flask
+from flask import Flask, current_app
+
+from librepos.app.blueprints.auth.permissions import AuthPermissions
+from librepos.app.blueprints.auth.services import AuthService
+from librepos.app.blueprints.menu.permissions import MenuPermissions
+from librepos.app.blueprints.menu.services import MenuService
+from librepos.app.blueprints.orders.permissions import OrdersPermissions
+from librepos.app.blueprints.reports.permissions import ReportsPermissions
+from librepos.app.blueprints.reports.services import ROLLUP_BATCH_SIZE, RollupService
+from librepos.app.shared.email import flush_outbox
+from librepos.app.shared.images import image_pipeline
+from librepos.app.shared.passwords import calibrate
+from librepos.app.shared.startup import profile_imports
+from librepos.app.shared.template_cache import compile_templates
 
 
 CATEGORY_SEED_DATA = [
@@ -25,6 +40,9 @@ CATEGORY_SEED_DATA = [
     {"name": "Specials", "description": "Chef's daily specials", "display_order": 10},
 ]
 
+# Every permission declared by a blueprint's permissions.py
+PERMISSION_SEED_DATA = [*AuthPermissions, *MenuPermissions, *OrdersPermissions, *ReportsPermissions]
+
 
 def register_cli(app: Flask) -> None:
     """Register CLI commands with the Flask app."""
@@ -36,25 +54,172 @@ def register_cli(app: Flask) -> None:
     @seed.command("categories")
     def seed_categories():
         """Seed menu categories."""
-        created = 0
-        skipped = 0
-
-        # for data in CATEGORY_SEED_DATA:
-        #     existing = Category.get_first_by(name=data["name"])
-        #     if existing:
-        #         click.echo(f"  Skipped: {data['name']} (already exists)")
-        #         skipped += 1
-        #     else:
-        #         Category.create(**data)
-        #         click.echo(f"  Created: {data['name']}")
-        #         created += 1
+        created, skipped = MenuService.seed_categories(CATEGORY_SEED_DATA)
+
+        click.echo(f"\nDone! Created: {created}, Skipped: {skipped}")
+
+    @seed.command("permissions")
+    def seed_permissions():
+        """Seed the permissions declared by each blueprint."""
+        created, skipped = AuthService.seed_permissions(PERMISSION_SEED_DATA)
 
         click.echo(f"\nDone! Created: {created}, Skipped: {skipped}")
 
     @seed.command("all")
     def seed_all():
         """Seed all sample data."""
-        click.echo("Seeding categories...")
         ctx = click.get_current_context()
+        click.echo("Seeding permissions...")
+        ctx.invoke(seed_permissions)
+        click.echo("Seeding categories...")
         ctx.invoke(seed_categories)
         # Add more seed commands here as needed
+
+    @app.cli.group()
+    def images():
+        """Manage uploaded image renditions."""
+
+    @images.command("rebuild")
+    @click.option("--workers", type=int, default=None, help="Worker processes to use.")
+    def images_rebuild(workers):
+        """Build renditions for uploads still waiting in the staging folder."""
+        if workers:
+            image_pipeline.max_workers = workers
+        static_folder = current_app.static_folder
+        if static_folder is None:
+            raise click.ClickException("Static folder not configured")
+
+        click.echo(f"Rebuilding renditions with {image_pipeline.max_workers} workers...")
+        count = image_pipeline.rebuild(static_folder)
+        image_pipeline.shutdown()
+        click.echo(f"\nDone! Processed: {count}")
+
+    @app.cli.group("mail")
+    def mail_group():
+        """Manage the email outbox."""
+
+    @mail_group.command("flush")
+    @click.option("--batch-size", type=int, default=None, help="Emails sent per connection.")
+    def mail_flush(batch_size):
+        """Deliver all due emails in the outbox."""
+        sent, failed = flush_outbox(batch_size)
+        click.echo(f"\nDone! Sent: {sent}, Failed: {failed}")
+
+    _register_auth_cli(app)
+    _register_reports_cli(app)
+    _register_startup_profile_cli(app)
+    _register_templates_cli(app)
+
+
+def _register_auth_cli(app: Flask) -> None:
+    """Register the password hashing commands."""
+
+    @app.cli.group()
+    def auth():
+        """Authentication maintenance."""
+
+    @auth.command("calibrate")
+    @click.option("--target-ms", type=float, default=250.0, show_default=True)
+    def auth_calibrate(target_ms):
+        """Pick the scrypt cost for a target hash time on this host.
+
+        Existing hashes are upgraded to the new cost as users sign in.
+        """
+        config = current_app.config
+        r, p = config["PASSWORD_SCRYPT_R"], config["PASSWORD_SCRYPT_P"]
+        click.echo(f"Timing scrypt (r={r}, p={p}) against a {target_ms:.0f} ms target...")
+        n, elapsed = calibrate(target_ms, r=r, p=p)
+
+        click.echo(f"\nDone! N={n} takes {elapsed:.0f} ms per hash. Set in the environment:")
+        click.echo(f"PASSWORD_SCRYPT_N={n}")
+
+
+def _register_reports_cli(app: Flask) -> None:
+    """Register the sales rollup maintenance commands."""
+
+    @app.cli.group()
+    def reports():
+        """Maintain the sales rollup tables."""
+
+    @reports.command("catch-up")
+    @click.option("--batch-size", type=int, default=ROLLUP_BATCH_SIZE, show_default=True)
+    def reports_catch_up(batch_size):
+        """Roll up every paid order not yet counted in the reports."""
+        count = RollupService.catch_up(batch_size)
+        click.echo(f"\nDone! Orders rolled up: {count}")
+
+    @reports.command("rebuild")
+    @click.option("--start", "start", required=True, help="First business day (YYYY-MM-DD).")
+    @click.option("--end", "end", default=None, help="Last business day (default: --start).")
+    @click.option("--batch-size", type=int, default=ROLLUP_BATCH_SIZE, show_default=True)
+    def reports_rebuild(start, end, batch_size):
+        """Recompute the rollups for a range of business days."""
+        try:
+            first = date.fromisoformat(start)
+            last = date.fromisoformat(end) if end else first
+        except ValueError as e:
+            raise click.BadParameter(str(e)) from e
+        if first > last:
+            raise click.BadParameter("--start must not be after --end")
+
+        click.echo(f"Rebuilding rollups for {first} .. {last}...")
+        count = RollupService.rebuild(first, last, batch_size)
+        click.echo(f"\nDone! Orders rolled up: {count}")
+
+
+def _register_templates_cli(app: Flask) -> None:
+    """Register the template precompilation command."""
+
+    @app.cli.group()
+    def templates():
+        """Precompile Jinja templates."""
+
+    @templates.command("compile")
+    @click.option("--clear", is_flag=True, help="Delete existing cache files first.")
+    def templates_compile(clear):
+        """Compile every app and blueprint template into the bytecode cache.
+
+        Run at build time and ship TEMPLATE_CACHE_DIR with the app.
+        """
+        cache = current_app.extensions["template_cache"]
+        if clear:
+            cache.clear()
+        # Templates already loaded (e.g. by TEMPLATE_WARMUP) would be skipped
+        if current_app.jinja_env.cache is not None:
+            current_app.jinja_env.cache.clear()
+
+        click.echo(f"Compiling templates into {cache.directory}...")
+        compiled, errors = compile_templates(current_app)
+        for name, error in errors.items():
+            click.echo(f"  Failed: {name}: {error}", err=True)
+        click.echo(f"\nDone! Compiled: {compiled}, Failed: {len(errors)}")
+        if errors:
+            raise click.exceptions.Exit(1)
+
+
+def _register_startup_profile_cli(app: Flask) -> None:
+    """Register the startup profiling command."""
+
+    @app.cli.command("startup-profile")
+    @click.option("--top", type=int, default=15, show_default=True, help="Slowest imports shown.")
+    @click.option("--imports/--no-imports", default=True, help="Profile module imports too.")
+    def startup_profile(top, imports):
+        """Report app import and initialization time by phase."""
+        profile = current_app.extensions["startup_profile"]
+        click.echo("Initialization phases:")
+        for phase, seconds in profile.phases:
+            click.echo(f"  {phase:<16} {seconds * 1000:8.1f} ms")
+        click.echo(f"  {'total':<16} {profile.total * 1000:8.1f} ms")
+
+        if not imports:
+            return
+        timings = profile_imports()
+        # Top-level line is the app package itself, covering every import below it
+        total = max(t.cumulative for t in timings) if timings else 0.0
+        click.echo(f"\nImports (fresh interpreter): {total * 1000:.1f} ms total")
+        slowest = sorted(timings, key=lambda t: t.self_time, reverse=True)[:top]
+        for timing in slowest:
+            click.echo(
+                f"  {timing.module:<48} self {timing.self_time * 1000:7.1f} ms"
+                f"  cumulative {timing.cumulative * 1000:7.1f} ms"
+            )
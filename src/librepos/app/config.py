@@ -1,5 +1,8 @@
 """Application configuration using pydantic-settings."""
 
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from babel import Locale, UnknownLocaleError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -21,6 +24,31 @@ class BaseConfig(BaseSettings):
     SQLALCHEMY_DATABASE_URI: str | None = None
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
 
+    # Business locale; timestamps are stored in UTC and shown in this zone
+    BUSINESS_TIMEZONE: str = "America/New_York"
+    BUSINESS_LOCALE: str = "en_US"
+    BUSINESS_CURRENCY: str = "USD"
+    SALES_TAX_RATE_BP: int = 0  # basis points, 825 == 8.25 %
+
+    # Engine profiles, selected from the URI (see shared/db_profiles.py)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -64_000  # negative = KiB, i.e. 64 MB
+    SQLITE_MMAP_SIZE: int = 268_435_456  # 256 MB
+    SQLITE_BUSY_TIMEOUT: int = 5_000  # ms to wait for a write lock
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1_800  # seconds
+    DB_POOL_TIMEOUT: int = 30  # seconds
+    DB_STATEMENT_TIMEOUT_MS: int | None = 30_000
+
+    # Query analysis (see shared/query_analysis.py); None disables a check
+    SLOW_QUERY_THRESHOLD_MS: float | None = 250.0
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_LOG_PARAMS: bool = False  # parameters may hold personal data
+    N_PLUS_ONE_THRESHOLD: int | None = 5
+
     # Session security
     SESSION_COOKIE_SECURE: bool = False
 
@@ -39,18 +67,117 @@ class BaseConfig(BaseSettings):
     MAIL_DEFAULT_SENDER: str | None = None
     MAIL_SUPPRESS_SEND: bool = False
 
+    # Email outbox (background delivery)
+    MAIL_OUTBOX_WORKER: bool = False
+    MAIL_OUTBOX_INTERVAL: float = 10.0
+    MAIL_OUTBOX_BATCH_SIZE: int = 50
+    MAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    MAIL_OUTBOX_BACKOFF: int = 60
+
+    # Templates: bytecode cache directory (default: instance/jinja_cache, see
+    # shared/template_cache.py), change checks and load-at-startup warmup
+    TEMPLATE_CACHE_DIR: str | None = None
+    TEMPLATES_AUTO_RELOAD: bool | None = None  # None: follow DEBUG
+    TEMPLATE_WARMUP: bool = False
+
+    # Rendered response cache (see shared/decorators.cached_response)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TIMEOUT: int = 300
+    RESPONSE_CACHE_MAXSIZE: int = 512
+
+    # Instrumentation (Server-Timing header and Prometheus /metrics). With
+    # METRICS_TOKEN set, scrapes must send "Authorization: Bearer <token>";
+    # production requires one whenever metrics are enabled.
+    METRICS_ENABLED: bool = True
+    METRICS_ENDPOINT: str = "/metrics"
+    METRICS_TOKEN: str | None = None
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Response compression (see shared/compression.py): gzip level (1-9),
+    # brotli quality (0-11, used when the brotli package is installed) and the
+    # smallest buffered body worth compressing, in bytes
+    COMPRESS_ENABLED: bool = True
+    COMPRESS_LEVEL: int = 6
+    COMPRESS_BR_LEVEL: int = 4
+    COMPRESS_MIN_SIZE: int = 500
+
+    # Offline order sync (POST /orders/sync): orders accepted per request,
+    # how old (seconds) a queued order's timestamps may be, and origins
+    # allowed besides this host (any scheme, so TLS ending at a proxy still
+    # matches). Add the public origin if the proxy rewrites Host.
+    ORDERS_SYNC_MAX_BATCH: int = 200
+    ORDERS_SYNC_MAX_AGE: float = 86_400.0
+    ORDERS_SYNC_TRUSTED_ORIGINS: list[str] = []
+
+    # Sales rollups: fold each order in as it is paid (else: flask reports catch-up)
+    REPORTS_ROLLUP_ON_CLOSE: bool = True
+
+    # Request threads per worker process. Pass the same value to the server
+    # (waitress --threads, gunicorn --threads); the limits below are checked
+    # against it so long-lived requests cannot take every thread. Size it as
+    # SSE_MAX_STREAMS (one per terminal showing live screens)
+    # + PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE + threads for other pages.
+    SERVER_THREADS: int = 16
+
+    # Server-Sent Events (see shared/events.py). Each open stream holds a
+    # server thread until SSE_STREAM_TIMEOUT, then reconnects, so at most
+    # SSE_MAX_STREAMS (< SERVER_THREADS) are open per process; the rest get
+    # 503 and retry after SSE_BUSY_RETRY seconds.
+    SSE_BACKEND: str = "local"  # or "package.module:BackendClass"
+    SSE_ENDPOINT: str = "/events"
+    SSE_HEARTBEAT: float = 15.0
+    SSE_STREAM_TIMEOUT: float = 120.0
+    SSE_COALESCE_MS: int = 50
+    SSE_REPLAY_SIZE: int = 256
+    SSE_MAX_PENDING: int = 256
+    SSE_MAX_STREAMS: int = 8  # terminals with live updates per process
+    SSE_BUSY_RETRY: float = 30.0
+
+    # Menu catalog snapshot: seconds between checks for menu changes made by
+    # other worker processes (commits in this process rebuild it directly)
+    MENU_CATALOG_CHECK_INTERVAL: float = 5.0
+
+    # Compiled role permissions: seconds between checks for role/policy
+    # changes made by other worker processes (local commits recompile directly)
+    PERMISSIONS_CHECK_INTERVAL: float = 5.0
+
+    # Password hashing (see shared/passwords.py): scrypt cost, chosen for the
+    # host with `flask auth calibrate`, and the bounded hashing pool size.
+    # Every running or queued hash holds a request thread while it waits, so
+    # PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE must stay below
+    # SERVER_THREADS (checked at startup) to leave threads for other pages.
+    PASSWORD_SCRYPT_N: int = 2**15
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE: int = 1
+
+    # Image processing (background rendition pool)
+    IMAGE_WORKERS: int = 2
+    IMAGE_QUALITY: int = 85
+
     @classmethod
-    def init_app(cls) -> None:
+    def init_app(cls, settings: "BaseConfig | None" = None) -> None:
         """Validate configuration at app startup.
 
-        Creates an instance to trigger pydantic validation.
+        Pass the settings instance the app was configured from to avoid
+        reading the environment a second time; otherwise one is created to
+        trigger pydantic validation.
         Override in subclasses for environment-specific checks.
         """
-        instance = cls()
+        instance = settings if settings is not None else cls()
         if not instance.SECRET_KEY:
             raise ValueError("SECRET_KEY is required")
         if not instance.TESTING and not instance.SQLALCHEMY_DATABASE_URI:
             raise ValueError("SQLALCHEMY_DATABASE_URI is required")
+        try:
+            ZoneInfo(instance.BUSINESS_TIMEZONE)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"Unknown BUSINESS_TIMEZONE: {instance.BUSINESS_TIMEZONE}") from e
+        try:
+            Locale.parse(instance.BUSINESS_LOCALE)
+        except (UnknownLocaleError, ValueError) as e:
+            raise ValueError(f"Unknown BUSINESS_LOCALE: {instance.BUSINESS_LOCALE}") from e
 
 
 class DevelopmentConfig(BaseConfig):
@@ -58,6 +185,7 @@ class DevelopmentConfig(BaseConfig):
 
     DEBUG: bool = True
     SECRET_KEY: str = "development-secret-key"
+    RESPONSE_CACHE_ENABLED: bool = False
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./dev.db"
 
 
@@ -68,9 +196,12 @@ class TestingConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///:memory:"
     SECRET_KEY: str = "test-secret-key-not-for-production"
     INITIAL_SETUP_COMPLETED: bool = True
+    PASSWORD_SCRYPT_N: int = 2**10  # fast hashes; cost is not under test
+    # Views are tested signed out; permission tests turn sign-in back on
+    LOGIN_DISABLED: bool = True
 
     @classmethod
-    def init_app(cls) -> None:
+    def init_app(cls, settings: BaseConfig | None = None) -> None:
         """Skip database URI validation for testing."""
 
 
@@ -80,6 +211,19 @@ class ProductionConfig(BaseConfig):
     SESSION_COOKIE_SECURE: bool = True
     SESSION_COOKIE_HTTPONLY: bool = True
     SESSION_COOKIE_SAMESITE: str = "Lax"
+    N_PLUS_ONE_THRESHOLD: int | None = None
+    TEMPLATES_AUTO_RELOAD: bool | None = False
+    TEMPLATE_WARMUP: bool = True
+    METRICS_ENABLED: bool = False
+    SLOW_QUERY_EXPLAIN: bool = False
+
+    @classmethod
+    def init_app(cls, settings: BaseConfig | None = None) -> None:
+        """Also refuse to expose /metrics without a scrape token."""
+        instance = settings if settings is not None else cls()
+        super().init_app(instance)
+        if instance.METRICS_ENABLED and not instance.METRICS_TOKEN:
+            raise ValueError("METRICS_TOKEN is required when METRICS_ENABLED in production")
 
 
 CONFIG_BY_NAME: dict[str, type[BaseConfig]] = {
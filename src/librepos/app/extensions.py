@@ -1,14 +1,18 @@
 from datetime import datetime
 from pathlib import Path
 
-from flask_mailman import Mail
+from flask import current_app
+from flask_login import LoginManager
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import CSRFProtect
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
-from librepos.app.shared.helpers import fetch_time_by_timezone
+from librepos.app.shared.db_profiles import apply_engine_profile
+from librepos.app.shared.images import image_pipeline
+from librepos.app.shared.passwords import password_hasher
+from librepos.app.shared.query_analysis import init_query_analysis
 
 _MIGRATIONS_DIR = str(Path(__file__).resolve().parent.parent / "migrations")
 
@@ -18,15 +22,19 @@ class Base(DeclarativeBase):
 
 
 class TimestampMixin:
-    """Mixin to add created_at and updated_at columns."""
+    """Mixin to add created_at and updated_at columns.
+
+    Both are filled in by the database in UTC, so Core and bulk inserts get
+    them for free; eager_defaults loads the values back after each flush.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}  # noqa: RUF012
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: fetch_time_by_timezone(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True),
-        default=lambda: fetch_time_by_timezone(),
-        onupdate=lambda: fetch_time_by_timezone(),
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
 
@@ -44,18 +52,84 @@ class AssociationModel(Base, TimestampMixin):
     __abstract__ = True
 
 
+class LazyMail:
+    """Flask-Mailman, imported and bound to the app on first use.
+
+    Sending mail is rare next to serving requests, so the mail stack is kept
+    off the startup path. Attribute access (``mail.get_connection()``,
+    ``mail.send_mail(...)``) initialises it for the current app.
+    """
+
+    def __init__(self) -> None:
+        self._mail = None
+
+    def init_app(self, app) -> None:
+        """Nothing to do up front; see :meth:`_bind`."""
+
+    def _bind(self):
+        if self._mail is None:
+            from flask_mailman import Mail  # noqa: PLC0415
+
+            self._mail = Mail()
+        if "mailman" not in current_app.extensions:
+            self._mail.init_app(current_app)
+        return self._mail
+
+    def __getattr__(self, name):
+        return getattr(self._bind(), name)
+
+
 db = SQLAlchemy(model_class=BaseModel)
 migrate = Migrate()
-mail = Mail()
+mail = LazyMail()
 csrf = CSRFProtect()
+login_manager = LoginManager()
 
 
 def init_extensions(app):
     """Initialize Flask extensions."""
+    # Imported here: the outbox model depends on db defined above
+    from librepos.app.shared.email import outbox_sender  # noqa: PLC0415
+
     db.init_app(app)
     migrate.init_app(app, db, directory=_MIGRATIONS_DIR)
     mail.init_app(app)
     csrf.init_app(app)
+    login_manager.init_app(app)
+    image_pipeline.init_app(app)
+    password_hasher.init_app(app)
+    outbox_sender.init_app(app)
 
     with app.app_context():
-        db.create_all()
+        # SQLite pragmas / PostgreSQL session settings on each new connection
+        for engine in db.engines.values():
+            apply_engine_profile(engine, app.config)
+
+        # Slow-query log, N+1 detector and query budgets
+        init_query_analysis(app, db.engines.values())
+
+        # Migrated databases already have every table; skip the inspection
+        if not _migrations_at_head():
+            db.create_all()
+
+
+def _migrations_at_head() -> bool:
+    """Return True when the database is stamped with the latest migration.
+
+    Falls back to False (run ``create_all``) when there are no migration
+    scripts yet or the database has never been stamped.
+    """
+    from alembic.runtime.migration import MigrationContext  # noqa: PLC0415
+    from alembic.script import ScriptDirectory  # noqa: PLC0415
+    from alembic.util import CommandError  # noqa: PLC0415
+
+    try:
+        heads = set(ScriptDirectory(_MIGRATIONS_DIR).get_heads())
+    except CommandError:
+        return False
+    if not heads:
+        return False
+
+    with db.engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    return current == heads
@@ -1,17 +1,32 @@
 """Shared utilities for LibrePOS."""
 
+from librepos.app.shared.cache import CacheOptions
 from librepos.app.shared.helpers import (
+    business_date,
+    business_day_bounds,
+    business_timezone,
     cents_to_dollars,
     dollars_to_cents,
     fetch_time_by_timezone,
     timedelta_months,
+    to_business_time,
 )
 from librepos.app.shared.mixins import CRUDMixin
+from librepos.app.shared.money import Money, MoneyType, format_money, sum_lines
 
 __all__ = [
     "CRUDMixin",
+    "CacheOptions",
+    "Money",
+    "MoneyType",
+    "business_date",
+    "business_day_bounds",
+    "business_timezone",
     "cents_to_dollars",
     "dollars_to_cents",
     "fetch_time_by_timezone",
+    "format_money",
+    "sum_lines",
     "timedelta_months",
+    "to_business_time",
 ]
@@ -0,0 +1,146 @@
+"""Content-hashed static asset helpers for LibrePOS.
+
+``npm run minify`` (build.mjs) writes ``<name>.min.<hash>.<ext>`` files with
+``.gz``/``.br`` siblings and records them in ``static/asset-manifest.json``.
+This module resolves logical names through that manifest and serves the
+hashed files with far-future immutable caching.
+"""
+
+import hashlib
+import json
+import mimetypes
+import threading
+from pathlib import Path
+
+from flask import Flask, Response, current_app, request, send_from_directory, url_for
+
+MANIFEST_FILENAME = "asset-manifest.json"
+
+# Hashed files never change, so clients may cache them for a year
+IMMUTABLE_MAX_AGE = 31_536_000
+
+# Preferred encoding first
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class AssetManifest:
+    """Maps logical static filenames to their content-hashed build outputs.
+
+    The manifest is read once; in debug mode it is re-read whenever the file
+    changes so ``npm run watch`` picks up new hashes without a restart.
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        self.path: Path | None = None
+        self.reload = False
+        self._assets: dict[str, str] = {}
+        self._hashed: frozenset[str] = frozenset()
+        self._mtime: float | None = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Load the manifest, register asset_url() and the static view."""
+        if app.static_folder is None:
+            return
+        self.path = Path(app.static_folder) / MANIFEST_FILENAME
+        self.reload = app.debug
+        self._load()
+        app.jinja_env.globals["asset_url"] = asset_url
+        app.view_functions["static"] = send_static_asset
+        app.extensions["asset_manifest"] = self
+
+    @property
+    def assets(self) -> dict[str, str]:
+        """Logical name -> hashed name."""
+        if self.reload:
+            self._load()
+        return self._assets
+
+    @property
+    def version(self) -> str:
+        """Short digest of the manifest, changing whenever any asset changes."""
+        payload = json.dumps(self.assets, sort_keys=True).encode()
+        return hashlib.sha256(payload).hexdigest()[:8]
+
+    def resolve(self, filename: str) -> str:
+        """Return the hashed name for ``filename``, or ``filename`` if unknown."""
+        return self.assets.get(filename, filename)
+
+    def is_hashed(self, filename: str) -> bool:
+        if self.reload:
+            self._load()
+        return filename in self._hashed
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            assets = json.loads(self.path.read_text()) if mtime is not None else {}
+            self._assets = assets
+            self._hashed = frozenset(assets.values())
+            self._mtime = mtime
+
+
+asset_manifest = AssetManifest()
+
+
+def asset_url(filename: str, **values) -> str:
+    """``url_for('static', ...)`` that resolves content-hashed filenames.
+
+    Falls back to the plain filename when the asset is not in the manifest
+    (e.g. before the first ``npm run minify``).
+
+    Usage in templates:
+        <script src="{{ asset_url('js/app.min.js') }}"></script>
+    """
+    return url_for("static", filename=asset_manifest.resolve(filename), **values)
+
+
+def send_static_asset(filename: str) -> Response:
+    """Static view serving hashed assets precompressed and immutable.
+
+    Other static files are served exactly like Flask's default static view.
+    """
+    if not asset_manifest.is_hashed(filename):
+        return current_app.send_static_file(filename)
+
+    static_folder = current_app.static_folder
+    if static_folder is None:
+        return Response("Static folder not configured", status=500)
+    mimetype = mimetypes.guess_type(filename)[0]
+    response = None
+    for encoding, suffix in PRECOMPRESSED:
+        if (
+            encoding in request.accept_encodings
+            and (Path(static_folder) / (filename + suffix)).is_file()
+        ):
+            response = send_from_directory(static_folder, filename + suffix, mimetype=mimetype)
+            response.headers["Content-Encoding"] = encoding
+            break
+    if response is None:
+        response = send_from_directory(static_folder, filename)
+
+    response.vary.add("Accept-Encoding")
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+def service_worker_prelude() -> str:
+    """JavaScript prepended to sw.js with the hashed asset list and version."""
+    static_url = current_app.static_url_path or "/static"
+    urls = [f"{static_url}/{name}" for name in sorted(asset_manifest.assets.values())]
+    return (
+        f"self.ASSET_VERSION = {json.dumps(asset_manifest.version)};\n"
+        f"self.HASHED_ASSETS = {json.dumps(urls)};\n"
+    )
@@ -0,0 +1,276 @@
+"""In-process caches for LibrePOS."""
+
+import copy
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from flask import current_app, has_app_context
+from sqlalchemy import Engine, event, inspect
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Attributes:
+        maxsize: Maximum number of entries; the least recently used is evicted
+        ttl: Seconds an entry stays valid (None for no expiry)
+        hits: Number of successful lookups
+        misses: Number of lookups that found nothing (or an expired entry)
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = 300) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (self.ttl is not None and entry[0] < time.monotonic()):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove ``key`` if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate) -> None:
+        """Remove every entry whose ``predicate(key, value)`` is true."""
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+# --- Model cache (used by CRUDMixin) ---
+
+
+@dataclass(frozen=True)
+class CacheOptions:
+    """Opt-in cache settings for a CRUDMixin model.
+
+    ``ttl_config`` names a config key to take the TTL from instead, read when
+    an app's cache is created.
+
+    Example:
+        class Category(db.Model, CRUDMixin):
+            CACHE_OPTIONS = CacheOptions(maxsize=128, ttl=600, lookups=("name",))
+    """
+
+    maxsize: int = 256
+    ttl: float | None = 300
+    lookups: tuple[str, ...] = ()
+    ttl_config: str | None = None
+
+
+class ModelCache:
+    """Row snapshots by primary key plus unique-column -> primary key indexes.
+
+    Snapshots of column values are cached instead of ORM instances, so cached
+    rows can be attached to any session without emitting SQL.
+
+    ``generation`` changes on every invalidation. Readers note it before
+    querying and pass it to ``put``, so a row read before a concurrent
+    commit is not cached after that commit invalidated it.
+    """
+
+    def __init__(self, options: CacheOptions, ttl: float | None) -> None:
+        self.options = options
+        self.rows = TTLCache(options.maxsize, ttl)
+        self.lookups = TTLCache(options.maxsize * max(len(options.lookups), 1), ttl)
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, record_id: Hashable) -> dict[str, Any] | None:
+        return self.rows.get(record_id)
+
+    def get_id(self, column: str, value: Hashable) -> Any:
+        return self.lookups.get((column, value))
+
+    def put(self, instance: Any, generation: int) -> None:
+        """Cache ``instance`` unless it holds uncommitted changes or is outdated."""
+        state = inspect(instance)
+        model = type(instance)
+        record_id = state.mapper.primary_key_from_instance(instance)[0]
+        session = state.session
+        if state.modified or (
+            session is not None and (model, record_id) in session.info.get(_PENDING_IDS, ())
+        ):
+            return
+        snapshot = {
+            attr.key: copy.copy(getattr(instance, attr.key)) for attr in state.mapper.column_attrs
+        }
+        with self._lock:
+            if generation != self.generation:
+                return
+            self.rows.set(record_id, snapshot)
+            for column in self.options.lookups:
+                self.lookups.set((column, snapshot[column]), record_id)
+
+    def invalidate(self, record_id: Hashable) -> None:
+        with self._lock:
+            self.generation += 1
+            self.rows.delete(record_id)
+            self.lookups.delete_where(lambda _key, value: value == record_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.rows.clear()
+            self.lookups.clear()
+
+    def stats(self) -> dict[str, int]:
+        rows = self.rows.stats()
+        lookups = self.lookups.stats()
+        return {
+            "hits": rows["hits"] + lookups["hits"],
+            "misses": rows["misses"] + lookups["misses"],
+            "size": rows["size"],
+        }
+
+
+# One set of caches per database engine, so apps (and test databases) never
+# see each other's rows; they go away with the engine
+_model_caches: weakref.WeakKeyDictionary[Engine, dict[type, ModelCache]] = (
+    weakref.WeakKeyDictionary()
+)
+_model_caches_lock = threading.Lock()
+
+_PENDING_IDS = "_model_cache_pending_ids"
+_PENDING_CLEARS = "_model_cache_pending_clears"
+
+
+def get_model_cache(model: type, session: Session) -> ModelCache | None:
+    """Return ``model``'s cache for the database ``session`` uses, or None if it did not opt in."""
+    options = getattr(model, "CACHE_OPTIONS", None)
+    if options is None:
+        return None
+    engine = session.get_bind(mapper=inspect(model)).engine
+    with _model_caches_lock:
+        caches = _model_caches.setdefault(engine, {})
+        cache = caches.get(model)
+        if cache is None:
+            ttl = options.ttl
+            if options.ttl_config is not None and has_app_context():
+                ttl = current_app.config[options.ttl_config]
+            cache = caches[model] = ModelCache(options, ttl)
+    return cache
+
+
+def mark_model_changed(session: Session, model: type) -> None:
+    """Clear ``model``'s whole cache when ``session`` commits (bulk writes)."""
+    if getattr(model, "CACHE_OPTIONS", None) is not None:
+        session.info.setdefault(_PENDING_CLEARS, set()).add(model)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_rows(session: Session, _flush_context) -> None:
+    # New rows too: they must not be cached before their insert is committed
+    pending = session.info.setdefault(_PENDING_IDS, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        model = type(instance)
+        if getattr(model, "CACHE_OPTIONS", None) is not None:
+            record_id = inspect(instance).mapper.primary_key_from_instance(instance)[0]
+            if record_id is not None:
+                pending.add((model, record_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_rows(session: Session) -> None:
+    for model, record_id in session.info.pop(_PENDING_IDS, ()):
+        cache = get_model_cache(model, session)
+        if cache is not None:
+            cache.invalidate(record_id)
+    for model in session.info.pop(_PENDING_CLEARS, ()):
+        cache = get_model_cache(model, session)
+        if cache is not None:
+            cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_rows(session: Session) -> None:
+    session.info.pop(_PENDING_IDS, None)
+    session.info.pop(_PENDING_CLEARS, None)
+
+
+# --- Response cache (used by the cached_response decorator) ---
+
+
+@dataclass
+class CachedResponse:
+    """A rendered response body stored by the response cache."""
+
+    body: bytes
+    etag: str
+    mimetype: str | None
+    expires: float
+    tags: frozenset[str]
+
+
+class ResponseCache:
+    """Rendered responses keyed by request, with tag-based invalidation."""
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self._entries = TTLCache(maxsize=maxsize, ttl=None)
+
+    def configure(self, maxsize: int) -> None:
+        self._entries.maxsize = maxsize
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires < time.monotonic():
+            self._entries.delete(key)
+            return None
+        return entry
+
+    def set(self, key: Hashable, entry: CachedResponse) -> None:
+        self._entries.set(key, entry)
+
+    def invalidate_tag(self, tag: str) -> None:
+        """Drop every cached response carrying ``tag``."""
+        self._entries.delete_where(lambda _key, entry: tag in entry.tags)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._entries.stats()
+
+
+response_cache = ResponseCache()
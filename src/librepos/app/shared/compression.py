@@ -0,0 +1,149 @@
+"""Response compression for LibrePOS.
+
+Waitress sends bodies as the app returns them, so HTML pages, HTMX
+fragments and JSON are compressed here, in an ``after_request`` hook,
+with gzip or (when the ``brotli`` package is installed) brotli, whichever
+the client's ``Accept-Encoding`` prefers.
+
+Buffered bodies smaller than ``COMPRESS_MIN_SIZE`` are sent as-is. Streamed
+responses (CSV exports, the SSE stream) are compressed chunk by chunk, with
+a flush after each chunk so a client sees every event as soon as it is
+sent. Responses that already have a ``Content-Encoding`` (precompressed
+static assets, gzipped exports) and file responses are left alone.
+"""
+
+import importlib
+import zlib
+from collections.abc import Iterable, Iterator
+from types import ModuleType
+from typing import Protocol
+
+from flask import Flask, Response, current_app, request
+
+brotli: ModuleType | None
+try:
+    brotli = importlib.import_module("brotli")
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Text formats worth compressing; images, fonts and archives already are
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "text/html",
+        "text/plain",
+        "text/css",
+        "text/csv",
+        "text/xml",
+        "text/event-stream",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "application/manifest+json",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+    def finish(self) -> bytes: ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._brotli = brotli.Compressor(quality=quality)  # type: ignore[union-attr]
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.flush()
+
+    def finish(self) -> bytes:
+        return self._brotli.finish()
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings the server can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def init_compression(app: Flask) -> None:
+    """Compress eligible responses when COMPRESS_ENABLED is set."""
+    if app.config["COMPRESS_ENABLED"]:
+        app.after_request(compress_response)
+
+
+def compress_response(response: Response) -> Response:
+    """Compress a response body for clients that accept it."""
+    if not _is_compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        source = response.response
+        response.response = _compress_chunks(response.iter_encoded(), _compressor(encoding))
+        # The original iterable (e.g. an SSE subscription) still needs closing
+        close = getattr(source, "close", None)
+        if close is not None:
+            response.call_on_close(close)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+            return response
+        compressor = _compressor(encoding)
+        response.set_data(compressor.compress(data) + compressor.finish())
+
+    response.headers["Content-Encoding"] = encoding
+    # The compressed bytes differ from the identity body a strong ETag names
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _is_compressible(response: Response) -> bool:
+    return (
+        response.mimetype in COMPRESSIBLE_MIMETYPES
+        and 200 <= response.status_code < 300
+        and response.status_code not in (204, 206)
+        and not response.direct_passthrough
+        and "Content-Encoding" not in response.headers
+        and not response.cache_control.no_transform
+    )
+
+
+def _compressor(encoding: str) -> _Compressor:
+    config = current_app.config
+    if encoding == "br":
+        return _BrotliCompressor(config["COMPRESS_BR_LEVEL"])
+    return _GzipCompressor(config["COMPRESS_LEVEL"])
+
+
+def _compress_chunks(chunks: Iterable[bytes], compressor: _Compressor) -> Iterator[bytes]:
+    """Compress a stream incrementally, flushing after every chunk."""
+    for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
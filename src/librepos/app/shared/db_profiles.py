@@ -0,0 +1,82 @@
+"""Backend-aware database engine profiles for LibrePOS.
+
+The profile is picked from the SQLAlchemy URI:
+
+- SQLite: WAL journaling plus tuned ``synchronous``, ``cache_size``,
+  ``mmap_size`` and ``busy_timeout`` pragmas applied on every new connection,
+  so concurrent POS writes wait briefly instead of failing with
+  "database is locked".
+- PostgreSQL: connection pool sizing, pre-ping, recycling and a
+  server-side statement timeout.
+
+All values come from the ``SQLITE_*`` / ``DB_*`` settings in config.py.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+
+def backend_name(uri: str | None) -> str | None:
+    """Return the backend ("sqlite", "postgresql", ...) of a database URI."""
+    if not uri:
+        return None
+    return make_url(uri).get_backend_name()
+
+
+def engine_options(config: Mapping[str, Any]) -> dict[str, Any]:
+    """Build SQLALCHEMY_ENGINE_OPTIONS for the configured backend."""
+    backend = backend_name(config.get("SQLALCHEMY_DATABASE_URI"))
+
+    if backend == "sqlite":
+        # pysqlite's own lock wait, in seconds; the pragma below covers raw SQL too
+        return {"connect_args": {"timeout": config["SQLITE_BUSY_TIMEOUT"] / 1000}}
+
+    if backend == "postgresql":
+        options: dict[str, Any] = {
+            "pool_size": config["DB_POOL_SIZE"],
+            "max_overflow": config["DB_MAX_OVERFLOW"],
+            "pool_pre_ping": config["DB_POOL_PRE_PING"],
+            "pool_recycle": config["DB_POOL_RECYCLE"],
+            "pool_timeout": config["DB_POOL_TIMEOUT"],
+        }
+        timeout = config.get("DB_STATEMENT_TIMEOUT_MS")
+        if timeout:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+        return options
+
+    return {}
+
+
+def sqlite_pragmas(config: Mapping[str, Any]) -> dict[str, Any]:
+    """Pragmas applied to every new SQLite connection."""
+    return {
+        "journal_mode": config["SQLITE_JOURNAL_MODE"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "cache_size": config["SQLITE_CACHE_SIZE"],
+        "mmap_size": config["SQLITE_MMAP_SIZE"],
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT"],
+    }
+
+
+def apply_engine_profile(engine: Engine, config: Mapping[str, Any]) -> None:
+    """Register per-connection setup for the engine's backend."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = sqlite_pragmas(config)
+    # WAL is meaningless (and rejected) for in-memory databases
+    if engine.url.database in (None, "", ":memory:"):
+        pragmas.pop("journal_mode")
+        pragmas.pop("mmap_size")
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
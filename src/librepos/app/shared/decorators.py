@@ -0,0 +1,127 @@
+"""View decorators for LibrePOS."""
+
+import hashlib
+import time
+from collections.abc import Callable, Iterable
+from functools import wraps
+
+from flask import Response, abort, current_app, make_response, request, session
+from flask_login import current_user
+
+from librepos import __version__
+from librepos.app.shared.cache import CachedResponse, response_cache
+from librepos.app.shared.htmx import is_htmx_request
+from librepos.app.shared.template_globals import template_globals
+
+
+def cached_response(timeout: int | None = None, tags: Iterable[str] = ()) -> Callable:
+    """Cache a view's rendered response and answer revalidations with 304.
+
+    The cache key covers the app version and template globals generation,
+    endpoint, full URL (including query args), the logged-in user, the session's CSRF token (pages embed
+    it) and whether the request wants an HTMX fragment (``is_htmx_request``:
+    boosted links and history restores get the full page). Responses carry a strong ETag, so a
+    matching ``If-None-Match`` gets a 304 without rendering the template.
+    Requests with pending flash messages are never served from the cache.
+
+    Args:
+        timeout: Seconds to keep the response (defaults to RESPONSE_CACHE_TIMEOUT)
+        tags: Tags for invalidation via ``response_cache.invalidate_tag()``
+
+    Example:
+        @bp.get("/menu")
+        @cached_response(tags=("menu",))
+        def menu_view():
+            return render_template("menu/index.html")
+    """
+    tag_set = frozenset(tags)
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            config = current_app.config
+            if (
+                not config["RESPONSE_CACHE_ENABLED"]
+                or request.method not in ("GET", "HEAD")
+                or "_flashes" in session
+            ):
+                return view(*args, **kwargs)
+
+            entry = response_cache.get(_cache_key())
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                entry = CachedResponse(
+                    body=body,
+                    etag=hashlib.sha256(body).hexdigest()[:32],
+                    mimetype=response.mimetype,
+                    expires=time.monotonic() + (timeout or config["RESPONSE_CACHE_TIMEOUT"]),
+                    tags=tag_set,
+                )
+                # Keyed after rendering: the render may have created the CSRF token
+                response_cache.set(_cache_key(), entry)
+            else:
+                response = Response(entry.body, mimetype=entry.mimetype)
+
+            response.set_etag(entry.etag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.vary.update(("Cookie", "HX-Request"))
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
+
+
+def _cache_key() -> tuple:
+    csrf_field = current_app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token")
+    return (
+        __version__,
+        template_globals.generation,
+        request.endpoint,
+        request.host,
+        request.full_path,
+        session.get("_user_id"),
+        session.get(csrf_field),
+        is_htmx_request(),
+    )
+
+
+def require_permission(*permissions: str) -> Callable:
+    """Allow a view only to users whose role grants every given permission.
+
+    The check is a subset test against the role's compiled permission set
+    (see ``auth.services.RolePermissions``) and the user comes from the model
+    cache, so it costs no database access. Anonymous and deactivated users get
+    Flask-Login's unauthorized response; signed-in users without the permissions get 403.
+    ``LOGIN_DISABLED`` skips the check, as it does for ``login_required``.
+
+    Args:
+        permissions: Permission names, e.g. ``OrdersPermissions.VIEW``
+
+    Example:
+        @bp.get("/")
+        @require_permission(OrdersPermissions.VIEW)
+        def index():
+            ...
+    """
+    required = frozenset(str(permission) for permission in permissions)
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if current_app.config.get("LOGIN_DISABLED"):
+                return view(*args, **kwargs)
+            if not current_user.is_authenticated or not current_user.is_active:
+                return current_app.login_manager.unauthorized()  # type: ignore[attr-defined]
+            granted = current_app.extensions["role_permissions"].get(current_user.role_id)
+            if not required <= granted:
+                abort(403)
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,7 +1,19 @@
 """Email utilities for LibrePOS."""
 
-from flask import current_app
-from flask_mailman import EmailMultiAlternatives
+import threading
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from flask import Flask, current_app
+from sqlalchemy import JSON, DateTime, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from librepos.app.extensions import db, mail
+from librepos.app.shared.mixins import CRUDMixin
+
+if TYPE_CHECKING:
+    from flask_mailman import EmailMultiAlternatives
 
 
 def send_email(
@@ -12,6 +24,9 @@ def send_email(
 ) -> bool:
     """Send an email using Flask-Mailman.
 
+    This sends synchronously inside the caller's thread. Prefer
+    :func:`queue_email` from request handlers.
+
     Args:
         to: List of recipient email addresses.
         subject: Email subject line.
@@ -21,8 +36,12 @@ def send_email(
     Returns:
         bool: True if sent successfully, False otherwise.
     """
+    from flask_mailman import EmailMultiAlternatives  # noqa: PLC0415
+
     try:
-        msg = EmailMultiAlternatives(subject=subject, body=text_body, to=to)
+        msg = EmailMultiAlternatives(
+            subject=subject, body=text_body, to=to, connection=mail.get_connection()
+        )
         if html_body:
             msg.attach_alternative(html_body, "text/html")
         msg.send()
@@ -30,3 +49,242 @@ def send_email(
     except Exception as e:
         current_app.logger.error(f"Email send failed: {e}")
         return False
+
+
+# --- Outbox ---
+
+
+class OutboxStatus(StrEnum):
+    """Delivery state of an outbox email."""
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboxEmail(db.Model, CRUDMixin):
+    """An email waiting to be (or already) delivered by the outbox sender."""
+
+    __tablename__ = "email_outbox"
+
+    recipients: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    text_body: Mapped[str] = mapped_column(Text, nullable=False)
+    html_body: Mapped[str | None] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(
+        String(20), default=OutboxStatus.PENDING, nullable=False, index=True
+    )
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False, index=True
+    )
+    last_error: Mapped[str | None] = mapped_column(Text)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    def to_message(self, connection) -> "EmailMultiAlternatives":
+        """Build the Flask-Mailman message bound to an open connection."""
+        from flask_mailman import EmailMultiAlternatives  # noqa: PLC0415
+
+        msg = EmailMultiAlternatives(
+            subject=self.subject, body=self.text_body, to=self.recipients, connection=connection
+        )
+        if self.html_body:
+            msg.attach_alternative(self.html_body, "text/html")
+        return msg
+
+    def __repr__(self) -> str:
+        return f"<OutboxEmail {self.id}: {self.subject} ({self.status})>"
+
+
+def queue_email(
+    to: list[str],
+    subject: str,
+    text_body: str,
+    html_body: str | None = None,
+) -> OutboxEmail:
+    """Store an email in the outbox for background delivery.
+
+    Returns immediately; the outbox sender delivers it on its next batch.
+
+    Args:
+        to: List of recipient email addresses.
+        subject: Email subject line.
+        text_body: Plain text email body.
+        html_body: Optional HTML email body.
+
+    Returns:
+        OutboxEmail: The queued outbox entry.
+    """
+    entry = OutboxEmail.create(
+        recipients=to, subject=subject, text_body=text_body, html_body=html_body
+    )
+    outbox_sender.notify()
+    return entry
+
+
+def queue_mass_email(
+    recipients: list[str],
+    subject: str,
+    text_body: str,
+    html_body: str | None = None,
+) -> list[OutboxEmail]:
+    """Queue one email per recipient in a single transaction.
+
+    Useful for reports sent to many managers: each recipient gets their own
+    message, and the sender delivers the whole batch over one connection.
+    """
+    entries = [
+        OutboxEmail(recipients=[to], subject=subject, text_body=text_body, html_body=html_body)
+        for to in recipients
+    ]
+    db.session.add_all(entries)
+    db.session.commit()
+    outbox_sender.notify()
+    return entries
+
+
+def deliver_outbox(batch_size: int | None = None) -> tuple[int, int]:
+    """Deliver due outbox emails over a single mail connection.
+
+    Failed messages are retried with exponential backoff until
+    ``MAIL_OUTBOX_MAX_ATTEMPTS`` is reached, then marked as failed.
+
+    Args:
+        batch_size: Maximum number of emails to send (defaults to config).
+
+    Returns:
+        tuple[int, int]: Number of emails sent and number that failed.
+    """
+    sent, failed, _connected = _deliver_batch(batch_size)
+    return sent, failed
+
+
+def flush_outbox(batch_size: int | None = None) -> tuple[int, int]:
+    """Deliver batches until nothing is due or the mail server can't be reached.
+
+    Failed messages are rescheduled, so every batch holds new entries and a
+    batch in which only some (or all) recipients failed does not stop it.
+
+    Returns:
+        tuple[int, int]: Number of emails sent and number that failed.
+    """
+    total_sent = total_failed = 0
+    while True:
+        sent, failed, connected = _deliver_batch(batch_size)
+        total_sent += sent
+        total_failed += failed
+        if not (sent or failed) or not connected:
+            return total_sent, total_failed
+
+
+def _deliver_batch(batch_size: int | None) -> tuple[int, int, bool]:
+    """One batch: ``(sent, failed, whether the mail connection opened)``."""
+    config = current_app.config
+    batch_size = batch_size or config["MAIL_OUTBOX_BATCH_SIZE"]
+    now = datetime.now(UTC)
+
+    stmt = (
+        db.select(OutboxEmail)
+        .filter(
+            OutboxEmail.status == OutboxStatus.PENDING,
+            OutboxEmail.next_attempt_at <= now,
+        )
+        .order_by(OutboxEmail.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    batch = db.session.execute(stmt).scalars().all()
+    if not batch:
+        return 0, 0, True
+
+    sent = failed = 0
+    connected = False
+    try:
+        with mail.get_connection() as connection:
+            connected = True
+            for entry in batch:
+                try:
+                    connection.send_messages([entry.to_message(connection)])
+                except Exception as e:
+                    _record_failure(entry, e, now)
+                    failed += 1
+                else:
+                    entry.status = OutboxStatus.SENT
+                    entry.sent_at = now
+                    entry.attempts += 1
+                    sent += 1
+    except Exception as e:
+        # Could not open the connection: the whole batch is retried later
+        current_app.logger.error(f"Outbox connection failed: {e}")
+        for entry in batch:
+            if entry.status == OutboxStatus.PENDING:
+                _record_failure(entry, e, now)
+                failed += 1
+
+    db.session.commit()
+    return sent, failed, connected
+
+
+def _record_failure(entry: OutboxEmail, error: Exception, now: datetime) -> None:
+    """Schedule a retry with exponential backoff, or give up."""
+    config = current_app.config
+    entry.attempts += 1
+    entry.last_error = str(error)
+    if entry.attempts >= config["MAIL_OUTBOX_MAX_ATTEMPTS"]:
+        entry.status = OutboxStatus.FAILED
+        current_app.logger.error(f"Outbox email {entry.id} failed permanently: {error}")
+        return
+    delay = config["MAIL_OUTBOX_BACKOFF"] * 2 ** (entry.attempts - 1)
+    entry.next_attempt_at = now + timedelta(seconds=delay)
+
+
+class OutboxSender:
+    """Background thread that drains the outbox in batches.
+
+    Disabled unless ``MAIL_OUTBOX_WORKER`` is set; deployments without a
+    long-running process can run ``flask mail flush`` from cron instead.
+    The thread starts lazily on the first queued email.
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        self.app: Flask | None = None
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Bind the sender to an app."""
+        self.app = app
+        app.extensions["outbox_sender"] = self
+
+    def notify(self) -> None:
+        """Wake the sender, starting it if enabled and not yet running."""
+        if self.app is None or not self.app.config["MAIL_OUTBOX_WORKER"]:
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="librepos-outbox", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        app = self.app
+        if app is None:
+            return
+        interval = app.config["MAIL_OUTBOX_INTERVAL"]
+        while True:
+            self._wakeup.wait(timeout=interval)
+            self._wakeup.clear()
+            with app.app_context():
+                try:
+                    flush_outbox()
+                except Exception as e:
+                    app.logger.error(f"Outbox delivery failed: {e}")
+                    db.session.rollback()
+
+
+outbox_sender = OutboxSender()
@@ -0,0 +1,352 @@
+"""Server-Sent Events push channel for LibrePOS.
+
+One :class:`EventHub` per worker process fans published events out to every
+subscribed terminal over ``GET /events?channels=orders,tables``. Screens
+react to events instead of polling with HTMX.
+
+- Bursts are coalesced: events published with the same ``key`` (e.g.
+  ``"order:42"``) replace each other while waiting to be sent, so ten quick
+  line-item clicks reach a terminal as one update.
+- Idle connections get a comment heartbeat every ``SSE_HEARTBEAT`` seconds,
+  so proxies keep them open and dead clients are noticed.
+- Each stream is time-boxed to ``SSE_STREAM_TIMEOUT`` seconds. EventSource
+  reconnects on its own and sends ``Last-Event-ID``; anything missed in
+  between is replayed from a small ring buffer. An id the buffer cannot
+  account for (too old, or from before a restart) gets a ``resync`` event.
+- Under a threaded WSGI server (waitress) every open stream holds a request
+  thread, and WSGI offers no way to hand the socket to a shared writer. So
+  at most ``SSE_MAX_STREAMS`` streams are open per process, well below
+  ``SERVER_THREADS``; further requests get 503 with ``Retry-After`` and
+  events.js tries again later. Run under a gevent/eventlet worker to hold
+  connections as greenlets instead (and raise the cap).
+- Delivery between worker processes goes through a pluggable
+  :class:`EventBackend` chosen by ``SSE_BACKEND``. :class:`LocalBackend`
+  covers single-process deployments and tests.
+
+Example:
+    from librepos.app.shared.events import event_hub
+
+    event_hub.publish("orders", "order-updated", {"id": order.id}, key=f"order:{order.id}")
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from flask import Flask, Response, abort, current_app, request
+from werkzeug.utils import import_string
+
+_CHANNEL_NAME = re.compile(r"^[a-z0-9_:-]{1,64}$")
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """One published event."""
+
+    id: int
+    channel: str
+    type: str
+    data: dict[str, Any]
+    key: str | None = None
+
+    def encode(self) -> str:
+        """Format as an SSE message (``id``/``event``/``data`` fields)."""
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class EventBackend(ABC):
+    """Carries events between the hubs of all worker processes.
+
+    ``publish`` sends an event to every worker (including this one);
+    ``start`` registers the callback that hands received events to the
+    local hub. A cross-process backend (Redis pub/sub, PostgreSQL
+    LISTEN/NOTIFY, ...) implements both and is selected with
+    ``SSE_BACKEND = "package.module:ClassName"``.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+
+    @abstractmethod
+    def start(self, deliver: Callable[[str, str, dict, str | None], None]) -> None:
+        """Begin delivering events to ``deliver(channel, type, data, key)``."""
+
+    @abstractmethod
+    def publish(self, channel: str, event_type: str, data: dict, key: str | None) -> None:
+        """Send an event to every worker."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release connections/threads (optional)."""
+
+
+class LocalBackend(EventBackend):
+    """In-process backend: events only reach this worker's subscribers."""
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        self._deliver: Callable[[str, str, dict, str | None], None] | None = None
+
+    def start(self, deliver: Callable[[str, str, dict, str | None], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, channel: str, event_type: str, data: dict, key: str | None) -> None:
+        if self._deliver is not None:
+            self._deliver(channel, event_type, data, key)
+
+
+BACKENDS: dict[str, type[EventBackend]] = {"local": LocalBackend}
+
+
+@dataclass(eq=False)
+class Subscription:
+    """A terminal's queue of events waiting to be streamed.
+
+    Pending events are keyed by coalescing key, so a newer event with the
+    same key replaces the queued one (and moves to the back).
+    """
+
+    channels: frozenset[str]
+    max_pending: int
+    overflowed: bool = False
+    _pending: OrderedDict = field(default_factory=OrderedDict)
+    _ready: threading.Condition = field(default_factory=threading.Condition)
+
+    def put(self, event: Event) -> None:
+        with self._ready:
+            slot = event.key or f"#{event.id}"
+            self._pending.pop(slot, None)
+            self._pending[slot] = event
+            if len(self._pending) > self.max_pending:
+                self.overflowed = True
+            self._ready.notify()
+
+    def get(self, timeout: float, linger: float = 0.0) -> list[Event]:
+        """Wait up to ``timeout`` for events, then drain the queue.
+
+        ``linger`` waits a little longer after the first event so a burst
+        arriving together is coalesced and sent as one write.
+        """
+        with self._ready:
+            if not self._pending and not self._ready.wait_for(lambda: self._pending, timeout):
+                return []
+            until = time.monotonic() + linger
+            while (left := until - time.monotonic()) > 0:
+                self._ready.wait(left)
+            events = list(self._pending.values())
+            self._pending.clear()
+        return events
+
+
+class EventHub:
+    """Process-wide publish/subscribe hub behind the SSE endpoint."""
+
+    def __init__(self, app: Flask | None = None) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._subscribers: set[Subscription] = set()
+        self._history: deque[Event] = deque(maxlen=256)
+        self._streams = 0
+        self.backend: EventBackend | None = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Select the backend and register the SSE endpoint."""
+        if app.config["SSE_MAX_STREAMS"] >= app.config["SERVER_THREADS"]:
+            raise ValueError(
+                "SSE_MAX_STREAMS must be below SERVER_THREADS, "
+                "or open event streams can take every request thread"
+            )
+        backend_name = app.config["SSE_BACKEND"]
+        backend_cls: type[EventBackend] = BACKENDS.get(backend_name) or import_string(backend_name)
+        if self.backend is not None:
+            self.backend.close()
+        self.backend = backend_cls(app)
+        self.backend.start(self._deliver)
+        with self._lock:
+            self._history = deque(self._history, maxlen=app.config["SSE_REPLAY_SIZE"])
+        app.extensions["event_hub"] = self
+
+        @app.get(app.config["SSE_ENDPOINT"], endpoint="events")
+        def events():
+            """Stream events for the requested channels."""
+            channels = [c for c in request.args.get("channels", "").split(",") if c]
+            if not channels or not all(_CHANNEL_NAME.match(c) for c in channels):
+                abort(400)
+            last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+            return self.response(channels, int(last_id) if last_id and last_id.isdigit() else 0)
+
+    # --- Publishing ---
+
+    def publish(
+        self, channel: str, event_type: str, data: dict | None = None, key: str | None = None
+    ) -> None:
+        """Publish an event to every subscriber of ``channel`` on all workers.
+
+        Args:
+            channel: Channel name, e.g. "orders", "tables", "kitchen"
+            event_type: SSE event name the browser listens for
+            data: JSON-serializable payload
+            key: Coalescing key; queued events with the same key are replaced
+        """
+        if self.backend is None:
+            return
+        self.backend.publish(channel, event_type, data or {}, key)
+
+    def _deliver(self, channel: str, event_type: str, data: dict, key: str | None) -> None:
+        with self._lock:
+            event = Event(next(self._ids), channel, event_type, data, key)
+            self._last_id = event.id
+            self._history.append(event)
+            subscribers = [s for s in self._subscribers if channel in s.channels]
+        for subscription in subscribers:
+            subscription.put(event)
+
+    # --- Subscribing ---
+
+    def subscribe(self, channels: Iterable[str], max_pending: int = 256) -> Subscription:
+        subscription = Subscription(frozenset(channels), max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def replay(self, channels: Iterable[str], after_id: int) -> list[Event] | None:
+        """Events newer than ``after_id``.
+
+        None if the buffer no longer reaches back that far, or if ``after_id``
+        was never issued by this process (it restarted, or the client was
+        connected to another worker).
+        """
+        wanted = set(channels)
+        with self._lock:
+            history = list(self._history)
+            last_id = self._last_id
+        if after_id > last_id or (history and after_id < history[0].id - 1):
+            return None
+        return [e for e in history if e.id > after_id and e.channel in wanted]
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def stream_count(self) -> int:
+        return self._streams
+
+    @property
+    def last_event_id(self) -> int:
+        return self._last_id
+
+    # --- Streaming ---
+
+    def stream(
+        self,
+        channels: list[str],
+        last_event_id: int = 0,
+        *,
+        timeout: float,
+        heartbeat: float,
+        linger: float,
+        max_pending: int = 256,
+    ) -> Iterator[str]:
+        """Yield SSE text for a subscription until ``timeout`` elapses."""
+        subscription = self.subscribe(channels, max_pending)
+        try:
+            yield f"retry: {int(heartbeat * 1000)}\n\n"
+            sent = last_event_id
+            if last_event_id:
+                missed = self.replay(channels, last_event_id)
+                if missed is None:
+                    # Cannot replay: tell the page to reload its state, and
+                    # move the client's Last-Event-ID to the current head
+                    yield f"id: {self.last_event_id}\nevent: resync\ndata: {{}}\n\n"
+                    return
+                for event in missed:
+                    sent = event.id
+                    yield event.encode()
+
+            deadline = time.monotonic() + timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                events = subscription.get(min(heartbeat, remaining), linger)
+                if subscription.overflowed:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                if not events:
+                    yield ": heartbeat\n\n"
+                    continue
+                chunk = "".join(e.encode() for e in events if e.id > sent)
+                if chunk:
+                    sent = events[-1].id
+                    yield chunk
+        finally:
+            self.unsubscribe(subscription)
+
+    def response(self, channels: list[str], last_event_id: int = 0) -> Response:
+        """Build the streaming ``text/event-stream`` response.
+
+        Returns 503 instead when ``SSE_MAX_STREAMS`` streams are already
+        open in this process.
+        """
+        config = current_app.config
+        with self._lock:
+            busy = self._streams >= config["SSE_MAX_STREAMS"]
+            if not busy:
+                self._streams += 1
+        if busy:
+            retry = config["SSE_BUSY_RETRY"]
+            response = Response(
+                f"retry: {int(retry * 1000)}\n\n", status=503, mimetype="text/event-stream"
+            )
+            response.headers["Retry-After"] = str(int(retry))
+            return response
+
+        release = self._stream_releaser()
+
+        def body() -> Iterator[str]:
+            try:
+                yield from self.stream(
+                    channels,
+                    last_event_id,
+                    timeout=config["SSE_STREAM_TIMEOUT"],
+                    heartbeat=config["SSE_HEARTBEAT"],
+                    linger=config["SSE_COALESCE_MS"] / 1000,
+                    max_pending=config["SSE_MAX_PENDING"],
+                )
+            finally:
+                release()
+
+        response = Response(body(), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"  # nginx: don't buffer the stream
+        # The server closes the response even if the stream never started
+        response.call_on_close(release)
+        return response
+
+    def _stream_releaser(self) -> Callable[[], None]:
+        """A callable giving back one stream slot, however often it is called."""
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            with self._lock:
+                if not released:
+                    released = True
+                    self._streams -= 1
+
+        return release
+
+
+event_hub = EventHub()
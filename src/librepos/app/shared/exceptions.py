@@ -0,0 +1,42 @@
+"""Custom exceptions for LibrePOS."""
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raised when a block of code runs more SQL statements than allowed.
+
+    Subclasses AssertionError so pytest reports it as a test failure.
+    """
+
+    def __init__(self, budget: int, statements: list[str]) -> None:
+        self.budget = budget
+        self.statements = statements
+        listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(statements, start=1))
+        super().__init__(
+            f"Query budget exceeded: {len(statements)} statements (budget {budget})\n{listing}"
+        )
+
+
+class UnsupportedDialectError(ValueError):
+    """Raised when a helper needs SQL the current database does not offer."""
+
+    def __init__(self, feature: str, dialect: str) -> None:
+        self.feature = feature
+        self.dialect = dialect
+        super().__init__(f"{feature} is not supported on {dialect}")
+
+
+class OrderNotOpenError(ValueError):
+    """Raised when changing the lines or totals of a paid or voided order."""
+
+    def __init__(self, order_id: int, status: str) -> None:
+        self.order_id = order_id
+        self.status = status
+        super().__init__(f"Order {order_id} is {status}; only open orders can be changed")
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when every password-hashing worker and queue slot is in use."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        super().__init__(f"Password hashing is busy ({capacity} calls in progress)")
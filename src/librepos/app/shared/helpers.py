@@ -1,14 +1,75 @@
 """Helper utilities for LibrePOS."""
 
-from datetime import date, datetime, timedelta
+from datetime import UTC, date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import overload
 from zoneinfo import ZoneInfo
 
+from flask import current_app
+
 # --- Datetime Helpers ---
+#
+# Timestamps are stored in UTC (database-side ``now()`` defaults); the
+# business timezone is only applied when displaying or bucketing them.
+
+
+@lru_cache(maxsize=32)
+def get_timezone(name: str) -> ZoneInfo:
+    """Return the (cached) ZoneInfo for an IANA timezone name."""
+    return ZoneInfo(name)
+
+
+def business_timezone() -> ZoneInfo:
+    """Get the configured BUSINESS_TIMEZONE of the current app."""
+    return get_timezone(current_app.config["BUSINESS_TIMEZONE"])
 
 
-def fetch_time_by_timezone(timezone: str = "America/New_York"):
-    """Get current datetime in specified timezone."""
-    return datetime.now(ZoneInfo(timezone))
+def fetch_time_by_timezone(timezone: str | None = None):
+    """Get current datetime in specified timezone (default: the business timezone)."""
+    return datetime.now(get_timezone(timezone) if timezone else business_timezone())
+
+
+@overload
+def to_business_time(value: datetime) -> datetime: ...
+@overload
+def to_business_time(value: None) -> None: ...
+def to_business_time(value: datetime | None) -> datetime | None:
+    """Convert a stored timestamp to the business timezone.
+
+    Naive values are treated as UTC, which is what SQLite hands back for
+    ``DateTime(timezone=True)`` columns.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(business_timezone())
+
+
+def business_date(value: datetime) -> date:
+    """Return the business-day date a UTC timestamp falls on."""
+    return to_business_time(value).date()
+
+
+@lru_cache(maxsize=512)
+def _day_bounds(day: date, timezone: str) -> tuple[datetime, datetime]:
+    tz = get_timezone(timezone)
+    start = datetime.combine(day, time.min, tzinfo=tz)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz)
+    return start.astimezone(UTC), end.astimezone(UTC)
+
+
+def business_day_bounds(day: date) -> tuple[datetime, datetime]:
+    """Return the UTC ``[start, end)`` range covering a business day.
+
+    Handles DST transitions, so a day can be 23 or 25 hours long.
+
+    Example:
+        start, end = business_day_bounds(date(2025, 3, 9))
+        stmt = select(Order).where(Order.created_at >= start, Order.created_at < end)
+    """
+    return _day_bounds(day, current_app.config["BUSINESS_TIMEZONE"])
 
 
 def timedelta_months(months, compare_date=None):
@@ -29,6 +90,8 @@ def timedelta_months(months, compare_date=None):
 
 
 # --- Money Helpers ---
+#
+# Prefer librepos.app.shared.money.Money; these remain for plain-int callers.
 
 
 def cents_to_dollars(cents):
@@ -37,17 +100,20 @@ def cents_to_dollars(cents):
 
     :param cents: Amount in cents
     :type cents: int
-    :return: float
+    :return: Decimal
     """
-    return round(cents / 100.0, 2)
+    return Decimal(cents).scaleb(-2)
 
 
 def dollars_to_cents(dollars):
     """
-    Convert dollars to cents.
+    Convert dollars to cents, rounding half up.
+
+    Floats are converted through ``str`` so ``19.99`` gives 1999, not 1998.
 
     :param dollars: Amount in dollars
-    :type dollars: float
+    :type dollars: Decimal | float | str | int
     :return: int
     """
-    return int(dollars * 100)
+    value = Decimal(str(dollars)) if isinstance(dollars, float) else Decimal(dollars)
+    return int(value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP).scaleb(2))
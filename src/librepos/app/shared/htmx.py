@@ -0,0 +1,101 @@
+"""HTMX fragment rendering for LibrePOS.
+
+Pages extend base.html, so rendering a whole template for an HTMX request
+also renders the head, app bar, navigation and scripts that the swap then
+throws away. ``render_htmx`` renders only the named block (or a partial
+template) when the request comes from HTMX, and the full page otherwise.
+
+Blocks are rendered on their own, without the template's top-level code:
+macros a fragment block uses must be imported inside that block.
+"""
+
+from collections.abc import Iterable
+
+from flask import (
+    Response,
+    before_render_template,
+    current_app,
+    make_response,
+    render_template,
+    request,
+    template_rendered,
+)
+
+
+def is_htmx_request() -> bool:
+    """True for HTMX swaps that want a fragment.
+
+    Boosted links and history restores (cache misses) need the full page.
+    """
+    headers = request.headers
+    return (
+        headers.get("HX-Request") == "true"
+        and "HX-Boosted" not in headers
+        and "HX-History-Restore-Request" not in headers
+    )
+
+
+def render_block(template_name: str, block: str, **context) -> str:
+    """Render a single block of a template.
+
+    Flask's context processors run and the template signals are sent, as
+    for render_template(), so instrumentation sees fragment renders too.
+    """
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    template = app.jinja_env.get_or_select_template(template_name)
+    try:
+        render_func = template.blocks[block]
+    except KeyError:
+        raise KeyError(f"Template {template_name!r} has no block {block!r}") from None
+
+    app.update_template_context(context)
+    before_render_template.send(
+        app, _async_wrapper=app.ensure_sync, template=template, context=context
+    )
+    body = "".join(render_func(template.new_context(context)))
+    template_rendered.send(app, _async_wrapper=app.ensure_sync, template=template, context=context)
+    return body
+
+
+def render_htmx(
+    template_name: str,
+    block: str | None = "main",
+    *,
+    partial: str | None = None,
+    oob: Iterable[str] = (),
+    **context,
+) -> Response:
+    """Render a page, or only the part of it an HTMX request swaps.
+
+    For HTMX requests the response is ``partial`` (a template name) if
+    given, else ``block`` of ``template_name``, followed by each ``oob``
+    fragment for out-of-band swaps. An ``oob`` entry ending in ".html" is a
+    partial template; anything else is a block of ``template_name``. OOB
+    fragments are rendered with ``hx_oob=True`` so they can add
+    ``hx-swap-oob`` to their root element only when sent out of band.
+
+    Responses always carry ``Vary: HX-Request``, since the same URL returns
+    different bodies with and without the header.
+
+    Example:
+        return render_htmx("orders/index.html", block="open_orders", page=page)
+    """
+    context.setdefault("hx_oob", False)
+    if not is_htmx_request():
+        response = make_response(render_template(template_name, **context))
+    else:
+        if partial is not None:
+            parts = [render_template(partial, **context)]
+        elif block is not None:
+            parts = [render_block(template_name, block, **context)]
+        else:
+            parts = []
+        oob_context = {**context, "hx_oob": True}
+        for fragment in oob:
+            if fragment.endswith(".html"):
+                parts.append(render_template(fragment, **oob_context))
+            else:
+                parts.append(render_block(template_name, fragment, **oob_context))
+        response = make_response("".join(parts))
+    response.vary.add("HX-Request")
+    return response
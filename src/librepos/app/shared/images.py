@@ -1,12 +1,49 @@
 """Image processing utilities for LibrePOS."""
 
+import atexit
+import json
+import multiprocessing
+import threading
 import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from PIL import Image
+from flask import Flask, current_app
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
+# Pillow is imported where it is used, keeping it off the startup path
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Rendition name -> maximum (width, height). Every rendition is written as
+# both JPEG and WebP next to each other.
+RENDITIONS: dict[str, tuple[int, int]] = {
+    "large": (1024, 1024),
+    "medium": (400, 400),
+    "thumb": (150, 150),
+}
+RENDITION_FORMATS: dict[str, tuple[str, str]] = {
+    "jpeg": ("JPEG", ".jpg"),
+    "webp": ("WEBP", ".webp"),
+}
+
+# Placeholder images (relative to static/img) returned while renditions are built
+USER_PLACEHOLDER = "placeholders/profile_image.png"
+CATEGORY_PLACEHOLDER = "placeholders/720x540.png"
+
+# Raw uploads wait here (under the instance folder, never served) until their
+# renditions are written, then they are deleted
+STAGING_DIR = "image_uploads"
+
+# Formats accepted as uploads, and the extension a staged original gets.
+# Pillow only probes these, so other content never reaches a decoder.
+UPLOAD_FORMATS: dict[str, str] = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif"}
+
+RenditionMap = dict[str, dict[str, str]]
+
 
 def process_user_image(
     file: FileStorage,
@@ -39,12 +76,11 @@ def process_user_image(
     save_path = user_dir / unique_filename
 
     # Open and process the image
+    from PIL import Image  # noqa: PLC0415
+
     with Image.open(file.stream) as original_img:
         # Convert to RGB if necessary (for PNG with transparency)
-        if original_img.mode in ("RGBA", "P"):
-            processed_img = original_img.convert("RGB")
-        else:
-            processed_img = original_img
+        processed_img = _to_rgb(original_img)
 
         # Resize maintaining an aspect ratio
         processed_img.thumbnail(max_size, Image.Resampling.LANCZOS)
@@ -66,7 +102,7 @@ def delete_user_image(image_path: str, static_folder: str) -> bool:
     Returns:
         True if deleted successfully, False otherwise
     """
-    if not image_path or image_path.startswith(("default_", "profile_image")):
+    if not image_path or image_path.startswith(("default_", "profile_image", "placeholders/")):
         return False
 
     full_path = Path(static_folder) / "img" / image_path
@@ -112,12 +148,11 @@ def process_category_image(
     save_path = categories_dir / unique_filename
 
     # Open and process the image
+    from PIL import Image  # noqa: PLC0415
+
     with Image.open(file.stream) as original_img:
         # Convert to RGB if necessary (handles PNG transparency, palette mode)
-        if original_img.mode in ("RGBA", "P"):
-            processed_img = original_img.convert("RGB")
-        else:
-            processed_img = original_img
+        processed_img = _to_rgb(original_img)
 
         # Resize maintaining aspect ratio
         processed_img.thumbnail(max_size, Image.Resampling.LANCZOS)
@@ -139,7 +174,7 @@ def delete_category_image(image_path: str, static_folder: str) -> bool:
     Returns:
         True if deleted successfully, False otherwise
     """
-    if not image_path:
+    if not image_path or image_path.startswith("placeholders/"):
         return False
 
     full_path = Path(static_folder) / "img" / image_path
@@ -147,3 +182,234 @@ def delete_category_image(image_path: str, static_folder: str) -> bool:
         full_path.unlink()
         return True
     return False
+
+
+# --- Background rendition pipeline ---
+
+
+def _to_rgb(img: "Image.Image") -> "Image.Image":
+    """Convert palette/alpha images to RGB so they can be saved as JPEG."""
+    if img.mode in ("RGBA", "P"):
+        return img.convert("RGB")
+    return img
+
+
+def generate_renditions(
+    source: str, output_dir: str, img_root: str, quality: int = 85
+) -> RenditionMap:
+    """Build every rendition of a staged upload and record them in a manifest.
+
+    Runs inside a pool worker process, so it only takes picklable arguments.
+    Renditions are re-encoded (dropping EXIF and other metadata) into
+    ``output_dir``, a ``<stem>.json`` manifest lists them, and the staged
+    original is deleted.
+
+    Args:
+        source: Absolute path of the staged original image
+        output_dir: Absolute path of the public folder for the renditions
+        img_root: Absolute path of the static ``img`` folder
+        quality: Encoder quality (1-100) for JPEG and WebP output
+
+    Returns:
+        Mapping of rendition name -> format -> path relative to static/img
+    """
+    source_path = Path(source)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    stem = source_path.stem
+    root = Path(img_root)
+    renditions: RenditionMap = {}
+
+    from PIL import Image  # noqa: PLC0415
+
+    with Image.open(source_path, formats=list(UPLOAD_FORMATS)) as original_img:
+        processed_img = _to_rgb(original_img)
+
+        # Largest first so each smaller size is resampled from the previous one
+        for name, max_size in RENDITIONS.items():
+            processed_img = processed_img.copy()
+            processed_img.thumbnail(max_size, Image.Resampling.LANCZOS)
+            renditions[name] = {}
+            for fmt, (pil_format, suffix) in RENDITION_FORMATS.items():
+                save_path = output_path / f"{stem}_{name}{suffix}"
+                processed_img.save(save_path, pil_format, quality=quality, optimize=True)
+                renditions[name][fmt] = save_path.relative_to(root).as_posix()
+
+    manifest = {"renditions": renditions}
+    (output_path / f"{stem}.json").write_text(json.dumps(manifest, indent=2))
+    source_path.unlink(missing_ok=True)
+    return renditions
+
+
+class ImagePipeline:
+    """Process-pool backed image pipeline.
+
+    Uploads are staged to the instance folder in the request thread (only
+    the header is read) and the expensive decode/resample/encode work runs
+    in worker processes. The pool is created lazily on first use and shut
+    down at interpreter exit.
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        self.max_workers = 2
+        self.quality = 85
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Read pool settings from the app config."""
+        self.max_workers = app.config.get("IMAGE_WORKERS", self.max_workers)
+        self.quality = app.config.get("IMAGE_QUALITY", self.quality)
+        app.extensions["image_pipeline"] = self
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a multi-threaded WSGI server process
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                atexit.register(self.shutdown)
+            return self._executor
+
+    def submit(
+        self,
+        source: Path,
+        static_folder: str,
+        on_complete: Callable[[RenditionMap], None] | None = None,
+    ) -> Future:
+        """Queue rendition generation for a staged original.
+
+        Args:
+            source: Path of the staged original, under the staging folder
+            static_folder: The Flask app's static folder path
+            on_complete: Optional callback receiving the rendition map. It
+                runs inside an app context, so it may update the database.
+
+        Returns:
+            The Future for the background job
+        """
+        img_root = Path(static_folder) / "img"
+        output_dir = img_root / source.parent.relative_to(_staging_root())
+        future = self.executor.submit(
+            generate_renditions, str(source), str(output_dir), str(img_root), self.quality
+        )
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        def _done(done: Future) -> None:
+            if done.exception() is not None:
+                app.logger.error(f"Image processing failed for {source}: {done.exception()}")
+                return
+            if on_complete is not None:
+                with app.app_context():
+                    on_complete(done.result())
+
+        future.add_done_callback(_done)
+        return future
+
+    def rebuild(self, static_folder: str) -> int:
+        """Build renditions for every original still staged, in parallel.
+
+        Originals are deleted once processed, so this picks up uploads whose
+        job never finished (e.g. the server stopped while it was queued).
+
+        Returns:
+            The number of originals processed
+        """
+        img_root = Path(static_folder) / "img"
+        staging = _staging_root()
+        sources = sorted(p for p in staging.rglob("*") if p.is_file())
+        results = self.executor.map(
+            generate_renditions,
+            [str(p) for p in sources],
+            [str(img_root / p.parent.relative_to(staging)) for p in sources],
+            [str(img_root)] * len(sources),
+            [self.quality] * len(sources),
+        )
+        return sum(1 for _ in results)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, waiting for queued jobs to finish."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+image_pipeline = ImagePipeline()
+
+
+def _staging_root() -> Path:
+    return Path(current_app.instance_path) / STAGING_DIR
+
+
+def _stage_original(file: FileStorage, subdir: str) -> Path:
+    """Save the raw upload to the staging folder without decoding it.
+
+    Only the image header is read, to reject anything but ``UPLOAD_FORMATS``;
+    the extension comes from the detected format, not the client's filename.
+    """
+    staging_dir = _staging_root() / subdir
+    staging_dir.mkdir(parents=True, exist_ok=True)
+
+    stem = f"{uuid.uuid4().hex}_{Path(secure_filename(file.filename or 'image')).stem}"
+    upload_path = staging_dir / f"{stem}.upload"
+    file.save(upload_path)
+
+    try:
+        from PIL import Image  # noqa: PLC0415
+
+        with Image.open(upload_path, formats=list(UPLOAD_FORMATS)) as img:
+            suffix = UPLOAD_FORMATS[str(img.format)]
+    except Exception:
+        upload_path.unlink(missing_ok=True)
+        raise
+    return upload_path.rename(staging_dir / f"{stem}{suffix}")
+
+
+def queue_user_image(
+    file: FileStorage,
+    username: str,
+    static_folder: str,
+    on_complete: Callable[[RenditionMap], None] | None = None,
+) -> str:
+    """Stage a user profile image and build its renditions in the background.
+
+    Args:
+        file: The uploaded file from the form
+        username: The username for creating the user directory
+        static_folder: The Flask app's static folder path
+        on_complete: Optional callback receiving the rendition map when done
+
+    Returns:
+        The placeholder image path to store until the renditions are ready
+    """
+    source = _stage_original(file, f"users/{username}")
+    image_pipeline.submit(source, static_folder, on_complete)
+    return USER_PLACEHOLDER
+
+
+def queue_category_image(
+    file: FileStorage,
+    static_folder: str,
+    on_complete: Callable[[RenditionMap], None] | None = None,
+) -> str:
+    """Stage a category image and build its renditions in the background.
+
+    Args:
+        file: The uploaded file from the form
+        static_folder: The Flask app's static folder path
+        on_complete: Optional callback receiving the rendition map when done
+
+    Returns:
+        The placeholder image path to store until the renditions are ready
+    """
+    source = _stage_original(file, "categories")
+    image_pipeline.submit(source, static_folder, on_complete)
+    return CATEGORY_PLACEHOLDER
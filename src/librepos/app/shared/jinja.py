@@ -3,6 +3,9 @@
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
+from librepos.app.shared.helpers import to_business_time
+from librepos.app.shared.money import money_filter
+
 if TYPE_CHECKING:
     from flask import Flask
 
@@ -78,6 +81,24 @@ def timedelta_filter(value: datetime, **kwargs) -> datetime:
     return value + timedelta(**kwargs)
 
 
+def localtime_filter(value: datetime | None, fmt: str | None = None, default: str = "") -> str:
+    """Show a stored (UTC) timestamp in the business timezone.
+
+    Usage in templates:
+        {{ order.created_at|localtime }} -> "2025-01-15 09:30:00-05:00"
+        {{ order.created_at|localtime("%b %d, %I:%M %p") }} -> "Jan 15, 09:30 AM"
+
+    Args:
+        value: The datetime to convert (assumes UTC if naive)
+        fmt: Optional strftime format
+        default: String to return if value is None
+    """
+    local = to_business_time(value)
+    if local is None:
+        return default
+    return local.strftime(fmt) if fmt else str(local)
+
+
 def init_jinja_filters(app: "Flask") -> None:
     """Initialize custom Jinja2 template filters.
 
@@ -85,3 +106,5 @@ def init_jinja_filters(app: "Flask") -> None:
     """
     app.add_template_filter(timedelta_filter, name="timedelta")
     app.add_template_filter(timeago_filter, name="timeago")
+    app.add_template_filter(localtime_filter, name="localtime")
+    app.add_template_filter(money_filter, name="money")
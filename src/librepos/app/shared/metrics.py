@@ -0,0 +1,250 @@
+"""Per-request timing instrumentation for LibrePOS.
+
+Records handler time, SQL statement count/time, template render time and
+response size per endpoint, adds a ``Server-Timing`` header to every
+response and exposes aggregated histograms in Prometheus text format.
+
+The endpoint reveals per-endpoint traffic, so when ``METRICS_TOKEN`` is set
+scrapes must send it as ``Authorization: Bearer <token>``.
+"""
+
+import bisect
+import hmac
+import threading
+import time
+from dataclasses import dataclass, field
+
+from flask import (
+    Flask,
+    Response,
+    before_render_template,
+    g,
+    has_request_context,
+    request,
+    template_rendered,
+)
+from sqlalchemy import event
+
+# Bucket upper bounds (Prometheus "le" labels)
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (512, 2_048, 8_192, 32_768, 131_072, 524_288, 2_097_152)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Fixed-bucket histogram with quantile estimates."""
+
+    __slots__ = ("bounds", "count", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+
+@dataclass
+class EndpointMetrics:
+    """Aggregated histograms for one endpoint."""
+
+    duration: Histogram = field(default_factory=lambda: Histogram(DURATION_BUCKETS))
+    db_duration: Histogram = field(default_factory=lambda: Histogram(DURATION_BUCKETS))
+    db_queries: Histogram = field(default_factory=lambda: Histogram(COUNT_BUCKETS))
+    template_duration: Histogram = field(default_factory=lambda: Histogram(DURATION_BUCKETS))
+    response_bytes: Histogram = field(default_factory=lambda: Histogram(SIZE_BUCKETS))
+
+
+@dataclass
+class RequestTiming:
+    """Timings collected while handling a single request."""
+
+    start: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    template_seconds: float = 0.0
+    template_stack: list[float] = field(default_factory=list)
+
+
+class MetricsRegistry:
+    """Thread-safe store of per-endpoint histograms."""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, timing: RequestTiming, elapsed: float, size: int | None):
+        with self._lock:
+            metrics = self.endpoints.get(endpoint)
+            if metrics is None:
+                metrics = self.endpoints[endpoint] = EndpointMetrics()
+            metrics.duration.observe(elapsed)
+            metrics.db_duration.observe(timing.db_seconds)
+            metrics.db_queries.observe(timing.db_queries)
+            metrics.template_duration.observe(timing.template_seconds)
+            if size is not None:
+                metrics.response_bytes.observe(size)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        families = (
+            ("request_duration_seconds", "duration", "Request handling time."),
+            ("db_duration_seconds", "db_duration", "Time spent in SQL statements per request."),
+            ("db_queries", "db_queries", "SQL statements executed per request."),
+            ("template_duration_seconds", "template_duration", "Template render time per request."),
+            ("response_size_bytes", "response_bytes", "Response body size."),
+        )
+        lines: list[str] = []
+        with self._lock:
+            items = sorted(self.endpoints.items())
+            for name, attr, help_text in families:
+                metric = f"librepos_{name}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for endpoint, metrics in items:
+                    lines.extend(_histogram_lines(metric, endpoint, getattr(metrics, attr)))
+
+            metric = "librepos_request_latency_seconds"
+            lines.append(f"# HELP {metric} Estimated request latency quantiles.")
+            lines.append(f"# TYPE {metric} summary")
+            for endpoint, metrics in items:
+                hist = metrics.duration
+                lines.extend(
+                    f'{metric}{{endpoint="{endpoint}",quantile="{q}"}} {hist.quantile(q):.6f}'
+                    for q in QUANTILES
+                )
+                lines.append(f'{metric}_sum{{endpoint="{endpoint}"}} {hist.sum:.6f}')
+                lines.append(f'{metric}_count{{endpoint="{endpoint}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric: str, endpoint: str, hist: Histogram) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip((*hist.bounds, "+Inf"), hist.counts, strict=True):
+        cumulative += bucket_count
+        lines.append(f'{metric}_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_sum{{endpoint="{endpoint}"}} {hist.sum:.6f}')
+    lines.append(f'{metric}_count{{endpoint="{endpoint}"}} {hist.count}')
+    return lines
+
+
+metrics_registry = MetricsRegistry()
+
+
+def _current_timing() -> RequestTiming | None:
+    return g.get("request_timing") if has_request_context() else None
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    context._librepos_start = time.perf_counter()
+
+
+def _after_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    timing = _current_timing()
+    if timing is not None:
+        timing.db_queries += 1
+        timing.db_seconds += time.perf_counter() - context._librepos_start
+
+
+def _before_render(_app, **_extra) -> None:
+    timing = _current_timing()
+    if timing is not None:
+        timing.template_stack.append(time.perf_counter())
+
+
+def _after_render(_app, **_extra) -> None:
+    timing = _current_timing()
+    if timing is not None and timing.template_stack:
+        started = timing.template_stack.pop()
+        # Nested renders (e.g. the cached nav) are part of the outer render
+        if not timing.template_stack:
+            timing.template_seconds += time.perf_counter() - started
+
+
+def init_instrumentation(app: Flask) -> None:
+    """Attach timing hooks and the metrics endpoint to the app.
+
+    Call this in create_app() after init_extensions().
+    """
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    from librepos.app.extensions import db  # noqa: PLC0415
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    metrics_path = app.config["METRICS_ENDPOINT"]
+
+    @app.before_request
+    def start_request_timing():
+        g.request_timing = RequestTiming()
+
+    @app.after_request
+    def record_request_timing(response: Response) -> Response:
+        timing: RequestTiming | None = g.pop("request_timing", None)
+        if timing is None or request.path == metrics_path:
+            return response
+
+        elapsed = time.perf_counter() - timing.start
+        size = None if response.is_streamed else response.calculate_content_length()
+        metrics_registry.record(request.endpoint or "unmatched", timing, elapsed, size)
+
+        if app.config["SERVER_TIMING_ENABLED"]:
+            response.headers["Server-Timing"] = (
+                f"app;dur={elapsed * 1000:.1f}, "
+                f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.db_queries} queries", '
+                f"tpl;dur={timing.template_seconds * 1000:.1f}"
+            )
+        return response
+
+    @app.get(metrics_path, endpoint="metrics")
+    def metrics():
+        """Prometheus scrape endpoint."""
+        if not _scrape_authorized(app.config["METRICS_TOKEN"]):
+            return Response(
+                "Unauthorized", status=401, headers={"WWW-Authenticate": 'Bearer realm="metrics"'}
+            )
+        return Response(metrics_registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+def _scrape_authorized(token: str | None) -> bool:
+    """True if no token is configured or the request carries it."""
+    if not token:
+        return True
+    authorization = request.authorization
+    return (
+        authorization is not None
+        and authorization.type == "bearer"
+        and hmac.compare_digest((authorization.token or "").encode(), token.encode())
+    )
@@ -1,20 +1,74 @@
 """Model mixins for LibrePOS."""
 
-from typing import TYPE_CHECKING
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Self
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from librepos.app.shared.cache import CacheOptions, get_model_cache, mark_model_changed
+from librepos.app.shared.exceptions import UnsupportedDialectError
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from sqlalchemy import Table
+    from sqlalchemy.orm import Mapped
+
+# Rows sent per executemany() by the bulk helpers
+BULK_CHUNK_SIZE = 500
+
+
+def _chunks(rows: Sequence[dict[str, Any]], size: int) -> Iterator[Sequence[dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
 
 
 class CRUDMixin:
-    """Mixin providing common CRUD operations for SQLAlchemy models."""
+    """Mixin providing common CRUD operations for SQLAlchemy models.
+
+    Models can opt in to a read-through cache for get_by_id() and single-column
+    get_first_by() lookups by declaring ``CACHE_OPTIONS = CacheOptions(...)``.
+    Cached rows are invalidated when changes to them are committed.
+    """
+
+    CACHE_OPTIONS: CacheOptions | None = None
 
     if TYPE_CHECKING:
-        id: int  # Type hint for pyright - the actual column comes from db.Model
+        # Type hints for pyright - the actual columns come from db.Model
+        id: Mapped[int]
+        created_at: Mapped[datetime]
+        updated_at: Mapped[datetime | None]
+        __table__: Table
+
+        # Declarative models accept their mapped attributes as keywords
+        def __init__(self, **kwargs: Any) -> None: ...
 
     @classmethod
-    def get_by_id(cls, record_id):
+    def get_by_id(cls, record_id) -> Self | None:
         """Get a record by its primary key."""
         from librepos.app.extensions import db  # noqa: PLC0415
 
-        return db.session.get(cls, record_id)
+        cache = get_model_cache(cls, db.session())
+        # A row already in the session may hold unflushed changes: use it as is
+        if (
+            cache is None
+            or record_id is None
+            or identity_key(cls, record_id) in db.session.identity_map
+        ):
+            return db.session.get(cls, record_id)
+
+        snapshot = cache.get(record_id)
+        if snapshot is not None:
+            return cls._from_snapshot(snapshot)
+
+        generation = cache.generation
+        instance = db.session.get(cls, record_id)
+        if instance is not None:
+            cache.put(instance, generation)
+        return instance
 
     @classmethod
     def get_all(cls):
@@ -35,7 +89,48 @@ class CRUDMixin:
         """Get the first record matching the criteria."""
         from librepos.app.extensions import db  # noqa: PLC0415
 
-        return db.session.execute(db.select(cls).filter_by(**kwargs)).scalars().first()
+        cache = get_model_cache(cls, db.session())
+        if cache is None or len(kwargs) != 1 or next(iter(kwargs)) not in cache.options.lookups:
+            return db.session.execute(db.select(cls).filter_by(**kwargs)).scalars().first()
+
+        ((column, value),) = kwargs.items()
+        record_id = cache.get_id(column, value)
+        if record_id is not None:
+            return cls.get_by_id(record_id)
+
+        generation = cache.generation
+        instance = db.session.execute(db.select(cls).filter_by(**kwargs)).scalars().first()
+        if instance is not None:
+            cache.put(instance, generation)
+        return instance
+
+    @classmethod
+    def cache_stats(cls):
+        """Return the model cache's hit/miss counters and size (empty if disabled)."""
+        from librepos.app.extensions import db  # noqa: PLC0415
+
+        cache = get_model_cache(cls, db.session())
+        return cache.stats() if cache is not None else {}
+
+    @classmethod
+    def cache_clear(cls):
+        """Drop every cached row for this model (e.g. after raw SQL writes)."""
+        from librepos.app.extensions import db  # noqa: PLC0415
+
+        cache = get_model_cache(cls, db.session())
+        if cache is not None:
+            cache.clear()
+
+    @classmethod
+    def _from_snapshot(cls, snapshot):
+        """Attach a cached row to the current session without emitting SQL."""
+        from librepos.app.extensions import db  # noqa: PLC0415
+
+        instance = cls.__mapper__.class_manager.new_instance()  # type: ignore[attr-defined]
+        for key, value in snapshot.items():
+            set_committed_value(instance, key, value)
+        make_transient_to_detached(instance)
+        return db.session.merge(instance, load=False)
 
     @classmethod
     def create(cls, commit=True, **kwargs):
@@ -73,12 +168,136 @@ class CRUDMixin:
         if commit:
             db.session.commit()
 
+    @classmethod
+    def bulk_create(cls, rows, chunk_size=BULK_CHUNK_SIZE, commit=True):
+        """Insert many rows using one executemany per chunk.
+
+        Args:
+            rows (list[dict]): column values for each new row.
+            chunk_size (int): rows sent per statement.
+            commit (bool): whether to commit once all chunks are sent.
+
+        Returns:
+            int: number of rows inserted.
+        """
+        from librepos.app.extensions import db  # noqa: PLC0415
+
+        for chunk in _chunks(rows, chunk_size):
+            db.session.execute(insert(cls), chunk)
+        if commit:
+            db.session.commit()
+        return len(rows)
+
+    @classmethod
+    def bulk_upsert(
+        cls,
+        rows,
+        index_elements,
+        update_columns=None,
+        chunk_size=BULK_CHUNK_SIZE,
+        commit=True,
+        *,
+        increment_columns=(),
+    ):
+        """Insert many rows, updating those that conflict (INSERT ... ON CONFLICT).
+
+        Supported on SQLite and PostgreSQL.
+
+        Args:
+            rows (list[dict]): column values for each row.
+            index_elements (list[str]): unique column(s) that identify a conflict.
+            update_columns (list[str] | None): columns overwritten on conflict.
+                Defaults to every supplied column except ``index_elements``;
+                an empty list turns the statement into ON CONFLICT DO NOTHING.
+            chunk_size (int): rows sent per statement.
+            commit (bool): whether to commit once all chunks are sent.
+            increment_columns (Sequence[str]): columns added to (not replaced)
+                on conflict, e.g. running counters in rollup tables.
+
+        Returns:
+            int: number of rows sent.
+
+        Raises:
+            UnsupportedDialectError: on databases other than SQLite and PostgreSQL.
+        """
+        from librepos.app.extensions import db  # noqa: PLC0415
+
+        if not rows:
+            return 0
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert  # noqa: PLC0415
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert  # noqa: PLC0415
+        else:
+            raise UnsupportedDialectError("bulk_upsert", dialect)
+
+        if update_columns is None:
+            update_columns = [
+                key for key in rows[0] if key not in index_elements and key not in increment_columns
+            ]
+
+        stmt = dialect_insert(cls)
+        if update_columns or increment_columns:
+            set_ = {column: stmt.excluded[column] for column in update_columns}
+            for column in increment_columns:
+                set_[column] = cls.__table__.c[column] + stmt.excluded[column]
+            if "updated_at" in cls.__table__.c and "updated_at" not in set_:
+                set_["updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=index_elements, set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+        for chunk in _chunks(rows, chunk_size):
+            db.session.execute(stmt, chunk)
+        mark_model_changed(db.session(), cls)
+        if commit:
+            db.session.commit()
+        return len(rows)
+
+    @classmethod
+    def bulk_update(cls, rows, chunk_size=BULK_CHUNK_SIZE, commit=True):
+        """Update many rows by primary key using one executemany per chunk.
+
+        Args:
+            rows (list[dict]): each dict must include the primary key plus the
+                columns to change.
+            chunk_size (int): rows sent per statement.
+            commit (bool): whether to commit once all chunks are sent.
+
+        Returns:
+            int: number of rows sent.
+        """
+        from librepos.app.extensions import db  # noqa: PLC0415
+
+        for chunk in _chunks(rows, chunk_size):
+            db.session.execute(update(cls), chunk)
+        mark_model_changed(db.session(), cls)
+        if commit:
+            db.session.commit()
+        return len(rows)
+
     @classmethod
     def seed_data(cls):
-        """Seed permissions from the SEED_DATA to the database."""
+        """Seed permissions from the SEED_DATA to the database.
+
+        Looks up existing names with a single SELECT and inserts the missing
+        ones with bulk_create(), so seeding costs two statements in total.
+
+        Returns:
+            int: number of rows created.
+        """
+        from librepos.app.extensions import db  # noqa: PLC0415
+
         data = getattr(cls, "SEED_DATA", [])
-        for item in data:
-            value = item.value if hasattr(item, "value") else item
-            existing = cls.get_first_by(name=value)
-            if not existing:
-                cls.create(name=value)
+        values = [item.value if hasattr(item, "value") else item for item in data]
+        if not values:
+            return 0
+
+        name_column = cls.__table__.c.name
+        existing = set(
+            db.session.execute(db.select(name_column).filter(name_column.in_(values))).scalars()
+        )
+        missing = [{"name": value} for value in dict.fromkeys(values) if value not in existing]
+        return cls.bulk_create(missing)
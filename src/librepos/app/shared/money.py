@@ -0,0 +1,223 @@
+"""Integer-cents money values for LibrePOS.
+
+Amounts are kept as integer minor units (cents) end to end: in Python as
+:class:`Money`, in the database through :class:`MoneyType`, and summed with
+plain integer arithmetic. Decimal is only used at the edges (parsing user
+input, formatting), and Babel formatters are built once per
+(locale, currency) and reused for every cell of a receipt or report.
+
+Example:
+    class OrderLine(db.Model):
+        unit_price: Mapped[Money] = mapped_column(MoneyType())
+
+    subtotal, tax, total = sum_lines(((line.unit_price, line.quantity) for line in lines), 825)
+    {{ total|money }}  ->  "$12.34"
+"""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache, total_ordering
+from typing import NamedTuple
+
+from babel import Locale
+from babel.numbers import get_currency_precision
+from flask import current_app, has_app_context
+from sqlalchemy import Integer
+from sqlalchemy.types import TypeDecorator
+
+DEFAULT_CURRENCY = "USD"
+BASIS_POINTS = 10_000  # 825 bp == 8.25 %
+
+
+@lru_cache(maxsize=64)
+def _precision(currency: str) -> int:
+    return get_currency_precision(currency)
+
+
+def _default_currency() -> str:
+    if has_app_context():
+        return current_app.config["BUSINESS_CURRENCY"]
+    return DEFAULT_CURRENCY
+
+
+@total_ordering
+@dataclass(frozen=True, slots=True)
+class Money:
+    """An amount of money in integer minor units (cents for USD)."""
+
+    cents: int
+    currency: str = DEFAULT_CURRENCY
+
+    @classmethod
+    def from_decimal(
+        cls, amount: Decimal | str | int | float, currency: str | None = None
+    ) -> "Money":
+        """Parse a major-unit amount, rounding half up to the nearest cent.
+
+        Floats go through ``str`` first, so ``19.99`` is 1999 cents, not 1998.
+        """
+        currency = currency or _default_currency()
+        exponent = Decimal(1).scaleb(-_precision(currency))
+        value = Decimal(str(amount)) if isinstance(amount, float) else Decimal(amount)
+        minor = value.quantize(exponent, rounding=ROUND_HALF_UP).scaleb(_precision(currency))
+        return cls(int(minor), currency)
+
+    @classmethod
+    def zero(cls, currency: str | None = None) -> "Money":
+        return cls(0, currency or _default_currency())
+
+    def to_decimal(self) -> Decimal:
+        """Return the amount in major units (e.g. dollars)."""
+        return Decimal(self.cents).scaleb(-_precision(self.currency))
+
+    def apply_rate(self, basis_points: int) -> "Money":
+        """Return ``self * basis_points / 10000`` rounded half away from zero."""
+        return Money(_round_rate(self.cents, basis_points), self.currency)
+
+    def _coerce(self, other: object) -> int:
+        if isinstance(other, Money):
+            if other.currency != self.currency:
+                raise ValueError(f"Currency mismatch: {self.currency} vs {other.currency}")
+            return other.cents
+        if isinstance(other, int) and not isinstance(other, bool):
+            return other
+        return NotImplemented
+
+    def __add__(self, other: "Money | int") -> "Money":
+        cents = self._coerce(other)
+        if cents is NotImplemented:
+            return NotImplemented
+        return Money(self.cents + cents, self.currency)
+
+    __radd__ = __add__  # lets the builtin sum() start from 0
+
+    def __sub__(self, other: "Money | int") -> "Money":
+        cents = self._coerce(other)
+        if cents is NotImplemented:
+            return NotImplemented
+        return Money(self.cents - cents, self.currency)
+
+    def __mul__(self, quantity: int) -> "Money":
+        if not isinstance(quantity, int):
+            return NotImplemented
+        return Money(self.cents * quantity, self.currency)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "Money":
+        return Money(-self.cents, self.currency)
+
+    def __lt__(self, other: "Money") -> bool:
+        # Money only, like __eq__: total_ordering derives <= and >= from both
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents < self._coerce(other)
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __str__(self) -> str:
+        return format_money(self)
+
+
+def _round_rate(cents: int, basis_points: int) -> int:
+    product = cents * basis_points
+    sign = -1 if product < 0 else 1
+    return sign * ((abs(product) + BASIS_POINTS // 2) // BASIS_POINTS)
+
+
+class LineTotals(NamedTuple):
+    """Subtotal, tax and total of a set of lines."""
+
+    subtotal: Money
+    tax: Money
+    total: Money
+
+
+def sum_lines(
+    lines: Iterable[tuple[Money | int, int]],
+    tax_rate_bp: int = 0,
+    currency: str | None = None,
+) -> LineTotals:
+    """Total ``(unit_price, quantity)`` lines in a single integer pass.
+
+    Tax is computed once on the subtotal (half up), not per line, so
+    rounding never drifts with the number of lines.
+
+    Args:
+        lines: Pairs of unit price (Money or cents) and quantity
+        tax_rate_bp: Tax rate in basis points (825 == 8.25 %)
+        currency: Currency of the result (default: BUSINESS_CURRENCY)
+
+    Returns:
+        LineTotals(subtotal, tax, total)
+    """
+    currency = currency or _default_currency()
+    subtotal = 0
+    for price, quantity in lines:
+        subtotal += (price.cents if isinstance(price, Money) else price) * quantity
+    tax = _round_rate(subtotal, tax_rate_bp)
+    return LineTotals(
+        Money(subtotal, currency), Money(tax, currency), Money(subtotal + tax, currency)
+    )
+
+
+class MoneyType(TypeDecorator):
+    """Stores :class:`Money` as an integer number of minor units.
+
+    Plain ints are accepted on the way in; ``func.sum()`` over the column
+    comes back as Money too. Without an explicit currency, values are
+    loaded in the app's BUSINESS_CURRENCY.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def __init__(self, currency: str | None = None) -> None:
+        super().__init__()
+        self.currency = currency
+
+    def process_bind_param(self, value, _dialect):
+        if isinstance(value, Money):
+            return value.cents
+        return value
+
+    def process_result_value(self, value, _dialect):
+        if value is None:
+            return None
+        return Money(int(value), self.currency or _default_currency())
+
+
+# --- Formatting ---
+
+
+@lru_cache(maxsize=32)
+def currency_formatter(locale: str, currency: str) -> Callable[[int], str]:
+    """Build (once) a formatter turning minor units into a localized string."""
+    parsed = Locale.parse(locale)
+    pattern = parsed.currency_formats["standard"]
+    precision = _precision(currency)
+
+    def format_cents(cents: int) -> str:
+        return pattern.apply(Decimal(cents).scaleb(-precision), parsed, currency=currency)
+
+    return format_cents
+
+
+def format_money(value: Money | int | None, locale: str | None = None, default: str = "") -> str:
+    """Format Money (or raw cents in BUSINESS_CURRENCY) for display."""
+    if value is None:
+        return default
+    if isinstance(value, Money):
+        cents, currency = value.cents, value.currency
+    else:
+        cents, currency = value, _default_currency()
+    if locale is None:
+        locale = current_app.config["BUSINESS_LOCALE"] if has_app_context() else "en_US"
+    return currency_formatter(locale, currency)(cents)
+
+
+def money_filter(value: Money | int | None, default: str = "") -> str:
+    """Jinja filter: ``{{ order.total|money }}`` -> ``"$12.34"``."""
+    return format_money(value, default=default)
@@ -1,7 +1,17 @@
 """Pagination utilities for LibrePOS."""
 
-from flask import request
+import base64
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from flask import abort, request, url_for
 from flask_sqlalchemy.pagination import Pagination
+from sqlalchemy import Select, func, select, tuple_
+
+from librepos.app.shared.cache import TTLCache
 
 DEFAULT_PER_PAGE = 20
 MAX_PER_PAGE = 100
@@ -27,6 +37,10 @@ def paginate_query(query, per_page: int = DEFAULT_PER_PAGE) -> Pagination:
             - prev_num/next_num: Adjacent page numbers
             - iter_pages(): Iterator for page numbers with gaps
 
+    Note:
+        This runs an OFFSET query plus a COUNT(*) per page view. For long,
+        append-only lists (orders, history) prefer paginate_keyset().
+
     Example:
         pagination = paginate_query(User.query.order_by(User.name), per_page=25)
         users = pagination.items
@@ -35,3 +49,200 @@ def paginate_query(query, per_page: int = DEFAULT_PER_PAGE) -> Pagination:
     per_page = min(per_page, MAX_PER_PAGE)  # Cap at max
 
     return query.paginate(page=page, per_page=per_page, error_out=False)
+
+
+# --- Keyset (cursor) pagination ---
+
+COUNT_CACHE_TTL = 60
+COUNT_CACHE_MAXSIZE = 256
+
+# (expires, total) by compiled statement; entries carry their own expiry
+# since callers may pass different TTLs
+_count_cache = TTLCache(maxsize=COUNT_CACHE_MAXSIZE, ttl=None)
+
+
+@dataclass
+class KeysetPage:
+    """A single page of keyset-paginated results.
+
+    Attributes:
+        items: List of items for the current page
+        per_page: Page size that was requested
+        next_cursor: Opaque cursor for the following page, or None
+        prev_cursor: Opaque cursor for the preceding page, or None
+        total: Total number of items, only when requested (may be cached)
+    """
+
+    items: list[Any]
+    per_page: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    total: int | None = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    def next_url(self, **kwargs) -> str | None:
+        """URL of the next page for the current endpoint (for hx-get)."""
+        return _page_url(self.next_cursor, **kwargs)
+
+    def prev_url(self, **kwargs) -> str | None:
+        """URL of the previous page for the current endpoint."""
+        return _page_url(self.prev_cursor, **kwargs)
+
+
+def paginate_keyset(
+    stmt: Select,
+    order_column,
+    *,
+    tiebreak_column=None,
+    descending: bool = True,
+    per_page: int = DEFAULT_PER_PAGE,
+    with_total: bool = False,
+) -> KeysetPage:
+    """Paginate a select() by seeking on an indexed column instead of OFFSET.
+
+    Reads the opaque 'cursor' parameter from the request query string; a
+    cursor that does not decode to one key per sort column aborts with 400. Each
+    page is a single indexed range scan, so deep pages cost the same as the
+    first one. ``COUNT(*)`` only runs when ``with_total`` is set, and the
+    result is cached for ``COUNT_CACHE_TTL`` seconds per statement.
+
+    Args:
+        stmt: SQLAlchemy select() of a model (no ORDER BY; it is added here)
+        order_column: Indexed column to seek on (e.g. Order.created_at)
+        tiebreak_column: Unique column breaking ties when order_column is not
+            unique (e.g. Order.id)
+        descending: Newest first when True
+        per_page: Number of items per page (default 20, max 100)
+        with_total: Also return a (cached) total count
+
+    Returns:
+        KeysetPage: The page of items with next/prev cursors
+
+    Example:
+        stmt = db.select(Order).filter_by(status="closed")
+        page = paginate_keyset(stmt, Order.created_at, tiebreak_column=Order.id)
+        orders = page.items
+    """
+    per_page = min(per_page, MAX_PER_PAGE)  # Cap at max
+    columns = [order_column]
+    if tiebreak_column is not None and tiebreak_column is not order_column:
+        columns.append(tiebreak_column)
+
+    cursor = _decode_cursor(request.args.get("cursor"), columns)
+    backwards = cursor is not None and cursor["d"] == "prev"
+    # Walking backwards flips the sort order; results are reversed afterwards
+    reverse = descending != backwards
+
+    page_stmt = stmt.order_by(*(c.desc() if reverse else c.asc() for c in columns))
+    if cursor is not None:
+        keys = cursor["k"]
+        lhs = tuple_(*columns) if len(columns) > 1 else columns[0]
+        rhs = tuple_(*keys) if len(columns) > 1 else keys[0]
+        page_stmt = page_stmt.filter(lhs < rhs if reverse else lhs > rhs)
+
+    from librepos.app.extensions import db  # noqa: PLC0415
+
+    rows = list(db.session.execute(page_stmt.limit(per_page + 1)).scalars())
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+    if backwards:
+        items.reverse()
+
+    page = KeysetPage(items=items, per_page=per_page)
+    if items:
+        has_next = cursor is not None if backwards else has_more
+        has_prev = has_more if backwards else cursor is not None
+        if has_next:
+            page.next_cursor = _encode_cursor(_key_values(items[-1], columns), "next")
+        if has_prev:
+            page.prev_cursor = _encode_cursor(_key_values(items[0], columns), "prev")
+
+    if with_total:
+        page.total = cached_count(stmt)
+    return page
+
+
+def cached_count(stmt: Select, ttl: int = COUNT_CACHE_TTL) -> int:
+    """Count the rows of a select(), caching the result for ``ttl`` seconds."""
+    compiled = stmt.compile()
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    now = time.monotonic()
+
+    cached = _count_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    from librepos.app.extensions import db  # noqa: PLC0415
+
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    total = db.session.execute(count_stmt).scalar_one()
+
+    _count_cache.set(key, (now + ttl, total))
+    return total
+
+
+def _key_values(item: Any, columns: list) -> list[Any]:
+    return [getattr(item, column.key) for column in columns]
+
+
+def _encode_cursor(values: list[Any], direction: str) -> str:
+    encoded = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps({"k": encoded, "d": direction}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str | None, columns: list) -> dict | None:
+    """Decode a cursor, aborting with 400 unless it is well formed.
+
+    A cursor must hold one non-null scalar key per sort column, of the
+    column's kind: an ISO datetime for timestamps, a number for numeric
+    columns, a string otherwise.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        keys = [
+            _decode_key(value, column) for value, column in zip(data["k"], columns, strict=True)
+        ]
+    except (ValueError, KeyError, TypeError):
+        abort(400, "Invalid pagination cursor")
+    if data.get("d") not in ("next", "prev"):
+        abort(400, "Invalid pagination cursor")
+    return {"k": keys, "d": data["d"]}
+
+
+def _decode_key(value: Any, column) -> Any:
+    """Return the cursor value for ``column``, or raise ValueError."""
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:
+        expected = None
+    if isinstance(value, dict):
+        if expected is not None and not issubclass(expected, datetime):
+            raise ValueError("unexpected timestamp key")
+        return datetime.fromisoformat(value["dt"])
+    if isinstance(value, bool) or not isinstance(value, int | float | str):
+        raise ValueError("cursor keys must be scalars")
+    if expected is not None and issubclass(expected, datetime):
+        raise ValueError("expected a timestamp key")
+    if expected in (int, float) and isinstance(value, str):
+        raise ValueError("expected a numeric key")
+    if expected is str and not isinstance(value, str):
+        raise ValueError("expected a string key")
+    return value
+
+
+def _page_url(cursor: str | None, **kwargs) -> str | None:
+    if cursor is None or request.endpoint is None:
+        return None
+    args = {**(request.view_args or {}), **request.args.to_dict(), **kwargs, "cursor": cursor}
+    return url_for(request.endpoint, **args)
@@ -0,0 +1,171 @@
+"""Password and PIN hashing for LibrePOS.
+
+scrypt is deliberately slow and memory-hard, so hashing on waitress request
+threads would let a burst of sign-ins (a shift change) take every thread
+and most of the CPU. Hashing and verification instead run on a small
+thread pool (``hashlib.scrypt`` releases the GIL), and at most
+``PASSWORD_HASH_QUEUE`` more calls wait for a worker. Beyond that the call
+fails fast with ``HashingBusyError`` rather than piling up. Each waiting
+call still holds its request thread, so workers plus queue must be fewer
+than ``SERVER_THREADS``.
+
+Hashes use Werkzeug's ``scrypt:N:r:p$salt$hash`` format, so the cost they
+were made with is stored in each hash. ``flask auth calibrate`` picks an N
+for a target latency on the host; hashes made with other parameters are
+upgraded on the next successful sign-in (see ``AuthService.authenticate``).
+"""
+
+import atexit
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+from flask import Flask
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from librepos.app.shared.exceptions import HashingBusyError
+
+T = TypeVar("T")
+
+# Bounds for `flask auth calibrate`: below 2**14 scrypt is too cheap to be
+# worth it; 2**20 with r=8 needs 1 GiB per concurrent hash.
+MIN_SCRYPT_N = 2**14
+MAX_SCRYPT_N = 2**20
+
+
+class PasswordHasher:
+    """Thread-pool backed scrypt hashing with a bounded queue.
+
+    The pool is created lazily on first use and shut down at interpreter exit.
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        self.n = 2**15
+        self.r = 8
+        self.p = 1
+        self.max_workers = 2
+        self.queue_size = 1
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Read cost and pool settings from the app config.
+
+        Raises:
+            ValueError: if the pool could hold every server thread.
+        """
+        self.n = app.config.get("PASSWORD_SCRYPT_N", self.n)
+        self.r = app.config.get("PASSWORD_SCRYPT_R", self.r)
+        self.p = app.config.get("PASSWORD_SCRYPT_P", self.p)
+        self.max_workers = app.config.get("PASSWORD_HASH_WORKERS", self.max_workers)
+        self.queue_size = app.config.get("PASSWORD_HASH_QUEUE", self.queue_size)
+        threads = app.config.get("SERVER_THREADS")
+        if threads is not None and self.capacity >= threads:
+            raise ValueError(
+                "PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE must be below SERVER_THREADS, "
+                "or a burst of sign-ins can take every request thread"
+            )
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        app.extensions["password_hasher"] = self
+
+    @property
+    def capacity(self) -> int:
+        """Calls that may be running or waiting at once."""
+        return self.max_workers + self.queue_size
+
+    @property
+    def method(self) -> str:
+        """Werkzeug method string for new hashes, e.g. ``scrypt:32768:8:1``."""
+        return f"scrypt:{self.n}:{self.r}:{self.p}"
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+                atexit.register(self.shutdown)
+            return self._executor
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """Run ``fn(*args)`` on the pool and wait for its result.
+
+        Raises:
+            HashingBusyError: when every worker and queue slot is taken.
+        """
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingBusyError(self.capacity)
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        def _release(_done: Future) -> None:
+            slots.release()
+
+        future.add_done_callback(_release)
+        return future.result()
+
+    def hash(self, password: str) -> str:
+        """Hash ``password`` with the configured cost."""
+        return self.run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """Check ``password`` against a stored hash, at the cost it was made with."""
+        return self.run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if ``password_hash`` was made with other parameters."""
+        return password_hash.split("$", 1)[0] != self.method
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, waiting for running hashes to finish."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+
+def calibrate(target_ms: float, r: int = 8, p: int = 1) -> tuple[int, float]:
+    """Find the largest scrypt N that hashes within ``target_ms`` on this host.
+
+    N is doubled from ``MIN_SCRYPT_N`` until a hash takes longer than the
+    target (or ``MAX_SCRYPT_N`` is reached); the last N that stays within it
+    wins, even when a larger N would land nearer the target. ``MIN_SCRYPT_N``
+    is returned if even it is slower than the target.
+
+    Returns:
+        tuple[int, float]: ``(n, milliseconds per hash)``
+    """
+    chosen = (MIN_SCRYPT_N, _time_hash(MIN_SCRYPT_N, r, p))
+    n = MIN_SCRYPT_N * 2
+    while chosen[1] < target_ms and n <= MAX_SCRYPT_N:
+        elapsed = _time_hash(n, r, p)
+        if elapsed > target_ms:
+            break
+        chosen = (n, elapsed)
+        n *= 2
+    return chosen
+
+
+def _time_hash(n: int, r: int, p: int, rounds: int = 3) -> float:
+    """Best-of-``rounds`` milliseconds for one scrypt hash."""
+    method = f"scrypt:{n}:{r}:{p}"
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        generate_password_hash("calibration", method)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
@@ -0,0 +1,147 @@
+"""SQL query analysis for LibrePOS.
+
+Attached to the SQLAlchemy engines by ``init_extensions``:
+
+- Slow-query log: statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are
+  logged with their EXPLAIN plan (and their parameters only with
+  ``SLOW_QUERY_LOG_PARAMS``).
+- N+1 detector: the same parameterized statement repeating
+  ``N_PLUS_ONE_THRESHOLD`` times within one request is logged with the
+  route and the template line that triggered it (usually a lazy
+  relationship load inside a Jinja loop).
+- Query budgets: ``query_budget()`` fails a block of code (typically a test)
+  that runs more statements than declared.
+"""
+
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from librepos.app.shared.exceptions import QueryBudgetExceededError
+
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+}
+_EXPLAIN_SAVEPOINT = "librepos_explain"
+
+_active_budgets: ContextVar[tuple[list[str], ...]] = ContextVar("query_budgets", default=())
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[list[str]]:
+    """Fail if the enclosed block executes more than ``max_queries`` statements.
+
+    Yields the list of executed statements, which can also be inspected.
+
+    Example:
+        with query_budget(3):
+            client.get("/orders/")
+
+    Raises:
+        QueryBudgetExceededError: when the budget is exceeded.
+    """
+    statements: list[str] = []
+    token = _active_budgets.set((*_active_budgets.get(), statements))
+    try:
+        yield statements
+    finally:
+        _active_budgets.reset(token)
+    if len(statements) > max_queries:
+        raise QueryBudgetExceededError(max_queries, statements)
+
+
+def template_location() -> str | None:
+    """Return "template.html:line" of the innermost Jinja frame on the stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        template = frame.f_globals.get("__jinja_template__")
+        if template is not None:
+            lineno = template.get_corresponding_lineno(frame.f_lineno)
+            return f"{template.name or template.filename}:{lineno}"
+        frame = frame.f_back
+    return None
+
+
+def _explain(conn, cursor, statement: str, parameters) -> str | None:
+    prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    # A raw DBAPI cursor bypasses engine events, so EXPLAIN is not re-analyzed.
+    # It runs inside the request's transaction: a savepoint keeps a failed
+    # EXPLAIN from aborting it (PostgreSQL rejects every later statement).
+    raw = cursor.connection.cursor()
+    try:
+        raw.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            raw.execute(prefix + statement, parameters)
+            plan = "\n".join(" | ".join(str(col) for col in row) for row in raw.fetchall())
+        except Exception as e:
+            raw.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            plan = f"EXPLAIN failed: {e}"
+        raw.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        return plan
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        raw.close()
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    context._librepos_analysis_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: PLR0917
+    for statements in _active_budgets.get():
+        statements.append(statement)
+
+    if not has_request_context():
+        return
+    config = current_app.config
+    elapsed_ms = (time.perf_counter() - context._librepos_analysis_start) * 1000
+
+    threshold = config["SLOW_QUERY_THRESHOLD_MS"]
+    if threshold is not None and elapsed_ms >= threshold:
+        plan = (
+            _explain(conn, cursor, statement, parameters)
+            if config["SLOW_QUERY_EXPLAIN"] and not executemany
+            else None
+        )
+        message = (
+            f"Slow query ({elapsed_ms:.1f} ms) on {request.method} {request.path}:\n{statement}"
+        )
+        # Parameters hold customer data and password hashes: opt in to see them
+        if config["SLOW_QUERY_LOG_PARAMS"]:
+            message += f"\nparams: {parameters!r}"
+        if plan:
+            message += f"\nplan:\n{plan}"
+        current_app.logger.warning(message)
+
+    repeat_threshold = config["N_PLUS_ONE_THRESHOLD"]
+    if repeat_threshold is None:
+        return
+    counts: Counter[str] = g.setdefault("query_counts", Counter())
+    counts[statement] += 1
+    if counts[statement] == repeat_threshold:
+        location = template_location() or "outside templates"
+        g.setdefault("n_plus_one", []).append((statement, location))
+        current_app.logger.warning(
+            f"Possible N+1 query: statement repeated {repeat_threshold} times on "
+            f"{request.method} {request.path} (endpoint {request.endpoint}, {location}):\n"
+            f"{statement}"
+        )
+
+
+def init_query_analysis(app: Flask, engines) -> None:
+    """Attach the slow-query log, N+1 detector and budget counter to engines."""
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    app.extensions["query_analysis"] = True
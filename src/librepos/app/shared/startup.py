@@ -0,0 +1,79 @@
+"""Startup profiling for LibrePOS.
+
+``create_app`` marks the end of each initialization phase on a
+:class:`StartupProfile`, stored in ``app.extensions["startup_profile"]``.
+``flask startup-profile`` prints those phases alongside the slowest
+module imports measured with ``python -X importtime`` in a fresh
+interpreter.
+"""
+
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class StartupProfile:
+    """Wall-clock duration of each app initialization phase."""
+
+    started: float = field(default_factory=time.perf_counter)
+    phases: list[tuple[str, float]] = field(default_factory=list)
+    _last: float = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._last = self.started
+
+    def mark(self, phase: str) -> None:
+        """Close the current phase, timed from the previous mark."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """One line of ``-X importtime`` output, in seconds."""
+
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+
+def profile_imports(module: str = "librepos.app") -> list[ImportTiming]:
+    """Import ``module`` in a fresh interpreter and collect import timings.
+
+    Args:
+        module: Dotted module path to import
+
+    Returns:
+        Timings for every module imported, in import order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(
+                ImportTiming(
+                    module=name,
+                    self_time=int(self_us) / 1e6,
+                    cumulative=int(cumulative_us) / 1e6,
+                    depth=(len(indent) - 1) // 2,
+                )
+            )
+    return timings
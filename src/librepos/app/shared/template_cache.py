@@ -0,0 +1,126 @@
+"""Template bytecode caching and precompilation for LibrePOS.
+
+Compiled templates are kept in two layers: an in-process dict in front of a
+``FileSystemBytecodeCache``. Each worker reads a template's cache file at
+most once, and ``flask templates compile`` fills the file cache at build
+time so the first request after a deploy never parses Jinja source.
+
+Cache files are keyed by template name rather than absolute path, so a
+cache built in CI stays valid when the app is installed elsewhere. Jinja
+still checks each file against the Python version and the template
+source's checksum, so a stale or foreign entry is recompiled, never used.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache, TemplateError
+from jinja2.bccache import Bucket
+from jinja2.utils import LRUCache
+
+# Files under templates/ that are compiled (others, e.g. .gitkeep, are skipped)
+TEMPLATE_EXTENSIONS = (".html", ".txt", ".xml", ".jinja", ".j2")
+
+
+class LayeredBytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache with an in-memory layer in front of the cache files."""
+
+    def __init__(self, directory: str, pattern: str = "%s.cache") -> None:
+        super().__init__(directory=directory, pattern=pattern)
+        self._memory: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.file_loads = 0
+
+    def get_cache_key(self, name: str, _filename: str | None = None) -> str:
+        """Key by template name only, so the cache survives a move."""
+        return hashlib.sha1(name.encode("utf-8")).hexdigest()
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        data = self._memory.get(bucket.key)
+        if data is not None:
+            bucket.bytecode_from_string(data)
+            if bucket.code is not None:
+                self.memory_hits += 1
+                return
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            self.file_loads += 1
+            with self._lock:
+                self._memory[bucket.key] = bucket.bytecode_to_string()
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        with self._lock:
+            self._memory[bucket.key] = bucket.bytecode_to_string()
+        super().dump_bytecode(bucket)
+
+    def clear(self) -> None:
+        """Drop both layers."""
+        with self._lock:
+            self._memory.clear()
+        super().clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return memory hits, cache-file loads and the in-memory size."""
+        return {
+            "memory_hits": self.memory_hits,
+            "file_loads": self.file_loads,
+            "size": len(self._memory),
+        }
+
+
+def init_template_cache(app: Flask) -> LayeredBytecodeCache:
+    """Attach the layered bytecode cache to the app's Jinja environment.
+
+    The cache directory is ``TEMPLATE_CACHE_DIR`` (default
+    ``instance/jinja_cache``).
+    """
+    directory = Path(app.config["TEMPLATE_CACHE_DIR"] or Path(app.instance_path) / "jinja_cache")
+    directory.mkdir(parents=True, exist_ok=True)
+    cache = LayeredBytecodeCache(str(directory))
+    app.jinja_env.bytecode_cache = cache
+    app.extensions["template_cache"] = cache
+    return cache
+
+
+def template_names(app: Flask) -> list[str]:
+    """Every app and blueprint template name."""
+    return sorted(
+        name for name in app.jinja_env.list_templates() if name.endswith(TEMPLATE_EXTENSIONS)
+    )
+
+
+def compile_templates(app: Flask) -> tuple[int, dict[str, str]]:
+    """Compile every template through the bytecode cache.
+
+    Returns:
+        tuple[int, dict[str, str]]: Number compiled, and error messages by
+        template name for templates that failed to compile.
+    """
+    compiled = 0
+    errors: dict[str, str] = {}
+    for name in template_names(app):
+        try:
+            app.jinja_env.get_template(name)
+        except TemplateError as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+        else:
+            compiled += 1
+    return compiled, errors
+
+
+def warm_templates(app: Flask) -> int:
+    """Load every template into the environment's template cache.
+
+    With a precompiled cache this only unmarshals bytecode. Templates that
+    fail to compile are skipped here and fail on use as usual.
+    """
+    env = app.jinja_env
+    names = template_names(app)
+    # Keep every warmed template; the default cache holds 400
+    if isinstance(env.cache, LRUCache) and env.cache.capacity < len(names):
+        env.cache.capacity = len(names)
+    compiled, _ = compile_templates(app)
+    return compiled
@@ -0,0 +1,111 @@
+"""Startup-built template globals for LibrePOS."""
+
+from collections.abc import Callable, Hashable
+
+from flask import Flask, render_template, request, url_for
+from markupsafe import Markup
+
+from librepos import __version__
+from librepos.app.shared.cache import TTLCache
+
+# Config keys whose change invalidates the cached globals and nav fragments
+SETTINGS_KEYS = ("BUSINESS_NAME", "APP_NAME")
+
+
+class TemplateGlobals:
+    """Registry of values shared by every template.
+
+    The version, business name and navigation URLs are resolved once instead
+    of on every render, and the rendered navigation fragment is cached per
+    (active endpoint, role). Everything is rebuilt only when one of
+    ``SETTINGS_KEYS`` changes in the app config, or when refresh() is called.
+    """
+
+    def __init__(self) -> None:
+        self.app: Flask | None = None
+        self.nav_items: list[dict] = []
+        self._context: dict = {}
+        self._fingerprint: tuple | None = None
+        self._generation = 0
+        self._resolved_nav: list[dict] | None = None
+        self._nav_cache = TTLCache(maxsize=128, ttl=None)
+        self._role_loader: Callable[[], Hashable] = lambda: None
+
+    def init_app(self, app: Flask, nav_items: list[dict]) -> None:
+        """Build the registry and register the context processor."""
+        self.app = app
+        self.nav_items = nav_items
+        self.refresh()
+        app.context_processor(self.context_processor)
+        app.extensions["template_globals"] = self
+
+    def role_loader(self, callback: Callable[[], Hashable]) -> Callable[[], Hashable]:
+        """Register the function returning the current user's role (cache key)."""
+        self._role_loader = callback
+        return callback
+
+    def refresh(self) -> None:
+        """Rebuild the globals and drop every cached nav fragment."""
+        if self.app is None:
+            return
+        config = self.app.config
+        self._fingerprint = tuple(config.get(key) for key in SETTINGS_KEYS)
+        self._resolved_nav = None
+        self._nav_cache.clear()
+        self._generation += 1
+        self._context = {
+            "app_version": __version__,
+            "business_name": config.get("BUSINESS_NAME") or "LibrePOS",
+            "render_nav": self.render_nav,
+        }
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every refresh; part of rendered-page cache keys."""
+        self._refresh_if_changed()
+        return self._generation
+
+    def context_processor(self) -> dict:
+        """Return the prebuilt globals, refreshing them if settings changed."""
+        self._refresh_if_changed()
+        return self._context
+
+    def resolved_nav_items(self) -> list[dict]:
+        """Return NAV_ITEMS with each endpoint resolved to a URL (resolved once)."""
+        if self._resolved_nav is None:
+            self._resolved_nav = [self._resolve(item) for item in self.nav_items]
+        return self._resolved_nav
+
+    def render_nav(self) -> Markup:
+        """Render partials/nav.html, cached per active endpoint and role."""
+        self._refresh_if_changed()
+        key = (request.endpoint, self._role_loader())
+        fragment = self._nav_cache.get(key)
+        if fragment is None:
+            fragment = Markup(
+                render_template(
+                    "partials/nav.html",
+                    nav_items=self.resolved_nav_items(),
+                    active_endpoint=request.endpoint,
+                )
+            )
+            self._nav_cache.set(key, fragment)
+        return fragment
+
+    def _refresh_if_changed(self) -> None:
+        if self.app is None:
+            return
+        config = self.app.config
+        if tuple(config.get(key) for key in SETTINGS_KEYS) != self._fingerprint:
+            self.refresh()
+
+    @staticmethod
+    def _resolve(item: dict) -> dict:
+        endpoint = item.get("endpoint")
+        if endpoint is None:
+            return item
+        url = url_for(endpoint) if endpoint != "#" else "#!"
+        return {**item, "url": url}
+
+
+template_globals = TemplateGlobals()
@@ -1 +1,125 @@
-// API client utilities
\ No newline at end of file
+// API client utilities
+
+// Offline order queue - orders taken while the network is down are kept in
+// IndexedDB and drained by the service worker (sw.js) in batches to
+// POST /orders/sync. Each order carries a client-generated idempotency key,
+// so a batch that is resent after a lost response is not inserted twice.
+// Orders the server rejects are moved to the REJECTED store and listed in a
+// banner until the user dismisses them.
+const OfflineOrders = {
+    DB_NAME: 'librepos-offline',
+    DB_VERSION: 2,
+    STORE: 'orders',
+    REJECTED_STORE: 'rejected',
+    SYNC_TAG: 'sync-orders',
+
+    open() {
+        return new Promise((resolve, reject) => {
+            const request = indexedDB.open(this.DB_NAME, this.DB_VERSION);
+            request.onupgradeneeded = () => {
+                const db = request.result;
+                [this.STORE, this.REJECTED_STORE]
+                    .filter((name) => !db.objectStoreNames.contains(name))
+                    .forEach((name) => db.createObjectStore(name, { keyPath: 'key' }));
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    },
+
+    // Queue an order ({status, lines: [{name, unit_price, quantity, ...}]},
+    // money in cents) and ask the service worker to sync it.
+    async queue(order) {
+        const entry = {
+            key: crypto.randomUUID(),
+            opened_at: new Date().toISOString(),
+            ...order,
+        };
+        const db = await this.open();
+        await new Promise((resolve, reject) => {
+            const tx = db.transaction(this.STORE, 'readwrite');
+            tx.objectStore(this.STORE).put(entry);
+            tx.oncomplete = resolve;
+            tx.onerror = () => reject(tx.error);
+        });
+        db.close();
+        await this.requestSync();
+        return entry.key;
+    },
+
+    // Background Sync where supported; otherwise ask the worker directly
+    async requestSync() {
+        if (!('serviceWorker' in navigator)) {
+            return;
+        }
+        const registration = await navigator.serviceWorker.ready;
+        if ('sync' in registration) {
+            await registration.sync.register(this.SYNC_TAG);
+        } else if (navigator.onLine && registration.active) {
+            registration.active.postMessage({ type: 'SYNC_ORDERS' });
+        }
+    },
+
+    // Orders the server rejected, each with its `error`
+    async rejected() {
+        const db = await this.open();
+        const orders = await new Promise((resolve, reject) => {
+            const request = db.transaction(this.REJECTED_STORE).objectStore(this.REJECTED_STORE).getAll();
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+        db.close();
+        return orders;
+    },
+
+    async dismissRejected() {
+        const db = await this.open();
+        await new Promise((resolve, reject) => {
+            const tx = db.transaction(this.REJECTED_STORE, 'readwrite');
+            tx.objectStore(this.REJECTED_STORE).clear();
+            tx.oncomplete = resolve;
+            tx.onerror = () => reject(tx.error);
+        });
+        db.close();
+    },
+
+    // List rejected orders in a banner at the top of the page
+    async showRejected() {
+        document.getElementById('rejected-orders')?.remove();
+        const orders = await this.rejected();
+        if (!orders.length) {
+            return;
+        }
+        const banner = document.createElement('div');
+        banner.id = 'rejected-orders';
+        banner.className = 'card-panel red lighten-4';
+        banner.setAttribute('role', 'alert');
+
+        const title = document.createElement('strong');
+        title.textContent = `${orders.length} offline order(s) could not be saved:`;
+        const list = document.createElement('ul');
+        orders.forEach((order) => {
+            const item = document.createElement('li');
+            item.textContent = `${new Date(order.opened_at).toLocaleString()}: ${order.error}`;
+            list.append(item);
+        });
+        const dismiss = document.createElement('button');
+        dismiss.className = 'btn-flat';
+        dismiss.textContent = 'Dismiss';
+        dismiss.addEventListener('click', () => this.dismissRejected().then(() => banner.remove()));
+
+        banner.append(title, list, dismiss);
+        (document.querySelector('main') || document.body).prepend(banner);
+    },
+};
+
+window.addEventListener('online', () => OfflineOrders.requestSync());
+
+if ('serviceWorker' in navigator && 'indexedDB' in window) {
+    navigator.serviceWorker.addEventListener('message', (event) => {
+        if (event.data && event.data.type === 'ORDERS_SYNCED' && event.data.rejected) {
+            OfflineOrders.showRejected();
+        }
+    });
+    document.addEventListener('DOMContentLoaded', () => OfflineOrders.showRejected());
+}
@@ -0,0 +1 @@
+const OfflineOrders={DB_NAME:"librepos-offline",DB_VERSION:2,STORE:"orders",REJECTED_STORE:"rejected",SYNC_TAG:"sync-orders",open(){return new Promise((e,t)=>{const r=indexedDB.open(this.DB_NAME,this.DB_VERSION);r.onupgradeneeded=()=>{const n=r.result;[this.STORE,this.REJECTED_STORE].filter(s=>!n.objectStoreNames.contains(s)).forEach(s=>n.createObjectStore(s,{keyPath:"key"}))},r.onsuccess=()=>e(r.result),r.onerror=()=>t(r.error)})},async queue(e){const t={key:crypto.randomUUID(),opened_at:new Date().toISOString(),...e},r=await this.open();return await new Promise((e,n)=>{const s=r.transaction(this.STORE,"readwrite");s.objectStore(this.STORE).put(t),s.oncomplete=e,s.onerror=()=>n(s.error)}),r.close(),await this.requestSync(),t.key},async requestSync(){if(!("serviceWorker"in navigator))return;const e=await navigator.serviceWorker.ready;"sync"in e?await e.sync.register(this.SYNC_TAG):navigator.onLine&&e.active&&e.active.postMessage({type:"SYNC_ORDERS"})},async rejected(){const e=await this.open(),t=await new Promise((t,r)=>{const n=e.transaction(this.REJECTED_STORE).objectStore(this.REJECTED_STORE).getAll();n.onsuccess=()=>t(n.result),n.onerror=()=>r(n.error)});return e.close(),t},async dismissRejected(){const e=await this.open();await new Promise((t,r)=>{const n=e.transaction(this.REJECTED_STORE,"readwrite");n.objectStore(this.REJECTED_STORE).clear(),n.oncomplete=t,n.onerror=()=>r(n.error)}),e.close()},async showRejected(){document.getElementById("rejected-orders")?.remove();const e=await this.rejected();if(!e.length)return;const t=document.createElement("div");t.id="rejected-orders",t.className="card-panel red lighten-4",t.setAttribute("role","alert");const r=document.createElement("strong");r.textContent=`${e.length} offline order(s) could not be saved:`;const n=document.createElement("ul");e.forEach(c=>{const o=document.createElement("li");o.textContent=`${new Date(c.opened_at).toLocaleString()}: ${c.error}`,n.append(o)});const s=document.createElement("button");s.className="btn-flat",s.textContent="Dismiss",s.addEventListener("click",()=>this.dismissRejected().then(()=>t.remove())),t.append(r,n,s),(document.querySelector("main")||document.body).prepend(t)}};window.addEventListener("online",()=>OfflineOrders.requestSync()),"serviceWorker"in navigator&&"indexedDB"in window&&(navigator.serviceWorker.addEventListener("message",e=>{e.data&&e.data.type==="ORDERS_SYNCED"&&e.data.rejected&&OfflineOrders.showRejected()}),document.addEventListener("DOMContentLoaded",()=>OfflineOrders.showRejected()));
@@ -0,0 +1,67 @@
+/**
+ * Server-Sent Events bridge for HTMX.
+ *
+ * Pages opt in with an element such as:
+ *   <div hidden data-sse-url="/events" data-sse-channels="orders"
+ *        data-sse-events="order-updated"></div>
+ *
+ * One EventSource is opened for all channels on the page. Each event is
+ * re-dispatched on <body> as "sse:<event>" (detail = parsed JSON), so
+ * elements refresh with hx-trigger="sse:order-updated from:body".
+ * EventSource reconnects by itself and resumes with Last-Event-ID. When the
+ * server is at its stream limit it answers 503, which closes the EventSource
+ * for good, so that case reopens it after BUSY_RETRY_MS (resuming from the
+ * last event seen).
+ */
+
+const BUSY_RETRY_MS = 30000;
+
+const sseTargets = document.querySelectorAll('[data-sse-channels]');
+
+if (sseTargets.length && 'EventSource' in window) {
+    const channels = new Set();
+    const events = new Set(['resync']);
+    let url = '/events';
+
+    sseTargets.forEach((el) => {
+        el.dataset.sseChannels.split(',').forEach((c) => c && channels.add(c.trim()));
+        (el.dataset.sseEvents || '').split(',').forEach((e) => e && events.add(e.trim()));
+        url = el.dataset.sseUrl || url;
+    });
+
+    let source;
+    let lastEventId = '';
+    let retryTimer;
+
+    const connect = () => {
+        const resume = lastEventId ? `&last_event_id=${lastEventId}` : '';
+        source = new EventSource(`${url}?channels=${[...channels].join(',')}${resume}`);
+
+        events.forEach((name) => {
+            source.addEventListener(name, (message) => {
+                if (name === 'resync') {
+                    // Missed too much while disconnected: reload the page state
+                    window.location.reload();
+                    return;
+                }
+                lastEventId = message.lastEventId || lastEventId;
+                const detail = message.data ? JSON.parse(message.data) : {};
+                document.body.dispatchEvent(new CustomEvent(`sse:${name}`, {detail}));
+            });
+        });
+
+        source.addEventListener('error', () => {
+            // CLOSED means an error status (503 when busy), not a dropped connection
+            if (source.readyState === EventSource.CLOSED) {
+                retryTimer = setTimeout(connect, BUSY_RETRY_MS);
+            }
+        });
+    };
+
+    connect();
+
+    window.addEventListener('pagehide', () => {
+        clearTimeout(retryTimer);
+        source.close();
+    });
+}
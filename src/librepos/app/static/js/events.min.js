@@ -0,0 +1 @@
+const BUSY_RETRY_MS=3e4,sseTargets=document.querySelectorAll("[data-sse-channels]");if(sseTargets.length&&"EventSource"in window){const s=new Set,e=new Set(["resync"]);let t="/events";sseTargets.forEach(n=>{n.dataset.sseChannels.split(",").forEach(c=>c&&s.add(c.trim())),(n.dataset.sseEvents||"").split(",").forEach(c=>c&&e.add(c.trim())),t=n.dataset.sseUrl||t});let n,i="",r;const o=()=>{const l=i?`&last_event_id=${i}`:"";n=new EventSource(`${t}?channels=${[...s].join(",")}${l}`),e.forEach(c=>{n.addEventListener(c,a=>{if(c==="resync"){window.location.reload();return}i=a.lastEventId||i;const d=a.data?JSON.parse(a.data):{};document.body.dispatchEvent(new CustomEvent(`sse:${c}`,{detail:d}))})}),n.addEventListener("error",()=>{n.readyState===EventSource.CLOSED&&(r=setTimeout(o,BUSY_RETRY_MS))})};o(),window.addEventListener("pagehide",()=>{clearTimeout(r),n.close()})}
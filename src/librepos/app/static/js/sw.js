@@ -1,11 +1,15 @@
-const STATIC_CACHE_NAME = 'static-cache-v5';
+// self.ASSET_VERSION and self.HASHED_ASSETS are prepended by the /sw.js route
+// from static/asset-manifest.json (written by build.mjs).
+const ASSET_VERSION = self.ASSET_VERSION || 'dev';
+const STATIC_CACHE_NAME = `static-cache-${ASSET_VERSION}`;
 const DYNAMIC_CACHE_NAME = 'dynamic-cache-v1';
 const DYNAMIC_CACHE_LIMIT = 50;
+const CATALOG_CACHE_NAME = 'catalog-cache-v1';
+const CATALOG_URL = '/menu/catalog.json';
 
 const STATIC_ASSETS = [
     '/',
-    '/static/js/app.js',
-    '/static/js/utils.js',
+    ...(self.HASHED_ASSETS || []),
     '/static/manifest.json',
     '/static/img/icons/icon-72x72.png',
     '/static/img/icons/icon-96x96.png',
@@ -51,7 +55,7 @@ self.addEventListener('activate', event => {
         caches.keys().then(keys => {
             return Promise.all(
                 keys
-                    .filter(key => key !== STATIC_CACHE_NAME && key !== DYNAMIC_CACHE_NAME)
+                    .filter(key => ![STATIC_CACHE_NAME, DYNAMIC_CACHE_NAME, CATALOG_CACHE_NAME].includes(key))
                     .map(key => {
                         console.log('[Service Worker] Deleting old cache:', key);
                         return caches.delete(key);
@@ -64,6 +68,44 @@ self.addEventListener('activate', event => {
     );
 });
 
+// Menu catalog - serve the cached copy at once and revalidate it by ETag.
+// An unchanged menu costs one bodyless 304; a new version is stored for the
+// next read and announced to open pages with a CATALOG_UPDATED message.
+const revalidateCatalog = (cache, cached) => {
+    const headers = {};
+    const etag = cached && cached.headers.get('ETag');
+    if (etag) {
+        headers['If-None-Match'] = etag;
+    }
+    return fetch(CATALOG_URL, { headers, cache: 'no-store' }).then(networkResponse => {
+        if (networkResponse.status === 304 && cached) {
+            return cached;
+        }
+        if (networkResponse.status !== 200) {
+            return cached || networkResponse;
+        }
+        return cache.put(CATALOG_URL, networkResponse.clone()).then(() => {
+            if (cached) {
+                self.clients.matchAll().then(clients => clients.forEach(client => {
+                    client.postMessage({ type: 'CATALOG_UPDATED', version: networkResponse.headers.get('ETag') });
+                }));
+            }
+            return networkResponse;
+        });
+    }).catch(() => cached || Response.error());
+};
+
+const catalogResponse = event => caches.open(CATALOG_CACHE_NAME).then(cache =>
+    cache.match(CATALOG_URL).then(cached => {
+        const revalidated = revalidateCatalog(cache, cached);
+        if (cached) {
+            event.waitUntil(revalidated);
+            return cached;
+        }
+        return revalidated;
+    })
+);
+
 // Fetch event - cache-first strategy with network fallback
 self.addEventListener('fetch', event => {
     const request = event.request;
@@ -78,6 +120,11 @@ self.addEventListener('fetch', event => {
         return;
     }
 
+    if (new URL(request.url).pathname === CATALOG_URL) {
+        event.respondWith(catalogResponse(event));
+        return;
+    }
+
     event.respondWith(
         caches.match(request).then(cachedResponse => {
             if (cachedResponse) {
@@ -106,6 +153,120 @@ self.addEventListener('fetch', event => {
     );
 });
 
+// Offline order queue (filled by OfflineOrders in api.js) - drained in
+// batches to POST /orders/sync. Orders the server stored (created or
+// duplicate) leave the queue; orders it rejected as invalid move to the
+// 'rejected' store with the server's error, for api.js to show the user. A
+// batch the server refuses as a whole (400) is rejected the same way, and
+// one over its batch limit (413) is resent in halves. A network error, a
+// server error or a missing sign-in keeps them and fails the sync so the
+// browser retries later.
+const ORDER_QUEUE_DB = 'librepos-offline';
+const ORDER_QUEUE_VERSION = 2;
+const ORDER_QUEUE_STORE = 'orders';
+const REJECTED_ORDERS_STORE = 'rejected';
+const ORDER_SYNC_URL = '/orders/sync';
+const ORDER_SYNC_BATCH = 50;
+
+const openOrderQueue = () => new Promise((resolve, reject) => {
+    const request = indexedDB.open(ORDER_QUEUE_DB, ORDER_QUEUE_VERSION);
+    request.onupgradeneeded = () => {
+        const db = request.result;
+        [ORDER_QUEUE_STORE, REJECTED_ORDERS_STORE]
+            .filter(name => !db.objectStoreNames.contains(name))
+            .forEach(name => db.createObjectStore(name, { keyPath: 'key' }));
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+});
+
+// Statuses worth retrying as is: sign-in, timeouts and rate limits
+const ORDER_SYNC_RETRY_STATUSES = new Set([401, 403, 408, 429]);
+
+const queuedOrders = (db, limit) => new Promise((resolve, reject) => {
+    const request = db.transaction(ORDER_QUEUE_STORE).objectStore(ORDER_QUEUE_STORE).getAll(null, limit);
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+});
+
+// Apply the sync results in one transaction; returns how many orders left the queue
+const settleOrders = (db, orders, results) => new Promise((resolve, reject) => {
+    const byKey = new Map(orders.map(order => [order.key, order]));
+    const tx = db.transaction([ORDER_QUEUE_STORE, REJECTED_ORDERS_STORE], 'readwrite');
+    const queue = tx.objectStore(ORDER_QUEUE_STORE);
+    let settled = 0;
+    results.filter(result => byKey.has(result.key)).forEach(result => {
+        if (result.status === 'invalid') {
+            tx.objectStore(REJECTED_ORDERS_STORE).put({
+                ...byKey.get(result.key),
+                error: result.error,
+                rejected_at: new Date().toISOString(),
+            });
+        }
+        queue.delete(result.key);
+        settled += 1;
+    });
+    tx.oncomplete = () => resolve(settled);
+    tx.onerror = () => reject(tx.error);
+});
+
+const notifyClients = message => self.clients.matchAll().then(clients => clients.forEach(client => client.postMessage(message)));
+
+const responseError = async response => {
+    try {
+        return (await response.json()).error || `HTTP ${response.status}`;
+    } catch {
+        return `HTTP ${response.status}`;
+    }
+};
+
+const syncOrders = async () => {
+    const db = await openOrderQueue();
+    let batchSize = ORDER_SYNC_BATCH;
+    try {
+        for (;;) {
+            const orders = await queuedOrders(db, batchSize);
+            if (!orders.length) {
+                return;
+            }
+            const response = await fetch(ORDER_SYNC_URL, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ orders }),
+            });
+            if (response.status === 413 && batchSize > 1) {
+                batchSize = Math.ceil(batchSize / 2);
+                continue;
+            }
+            if (response.status >= 500 || ORDER_SYNC_RETRY_STATUSES.has(response.status)) {
+                throw new Error(`Order sync failed: ${response.status}`);
+            }
+            let results;
+            if (response.ok) {
+                ({ results } = await response.json());
+            } else {
+                // Any other refusal would repeat forever: park the batch as rejected
+                const error = await responseError(response);
+                results = orders.map(order => ({ key: order.key, status: 'invalid', error }));
+            }
+            const settled = await settleOrders(db, orders, results);
+            const rejected = results.filter(result => result.status === 'invalid').length;
+            notifyClients({ type: 'ORDERS_SYNCED', results, rejected });
+            if (!settled) {
+                return;
+            }
+        }
+    } finally {
+        db.close();
+    }
+};
+
+self.addEventListener('sync', event => {
+    if (event.tag === 'sync-orders') {
+        event.waitUntil(syncOrders());
+    }
+});
+
 // Message event - handle cache clearing from main thread
 self.addEventListener('message', event => {
     if (event.data && event.data.type === 'CLEAR_CACHES') {
@@ -125,6 +286,10 @@ self.addEventListener('message', event => {
         );
     }
 
+    if (event.data && event.data.type === 'SYNC_ORDERS') {
+        event.waitUntil(syncOrders().catch(error => console.warn('[Service Worker]', error)));
+    }
+
     if (event.data && event.data.type === 'SKIP_WAITING') {
         self.skipWaiting();
     }
@@ -3,6 +3,7 @@ import pytest
 from librepos.app import create_app
 from librepos.app.config import TestingConfig
 from librepos.app.extensions import db
+from librepos.app.shared.query_analysis import query_budget as _query_budget
 
 
 @pytest.fixture
@@ -18,3 +19,15 @@ def app():
 @pytest.fixture
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager failing the test when a block exceeds its SQL budget.
+
+    Usage:
+        def test_orders_page(client, query_budget):
+            with query_budget(3):
+                client.get("/orders/")
+    """
+    return _query_budget
@@ -0,0 +1,126 @@
+"""Tests for the Server-Sent Events hub."""
+
+import threading
+
+import pytest
+
+from librepos.app.shared.events import event_hub
+
+
+@pytest.fixture
+def fast_streams(app):
+    app.config.update(SSE_STREAM_TIMEOUT=0.3, SSE_HEARTBEAT=0.1, SSE_COALESCE_MS=20)
+    return app
+
+
+def test_subscribers_only_get_their_channels(app):
+    orders = event_hub.subscribe(["orders"])
+    tables = event_hub.subscribe(["tables"])
+    try:
+        event_hub.publish("orders", "order-updated", {"id": 1})
+
+        assert [e.data for e in orders.get(timeout=0.1)] == [{"id": 1}]
+        assert tables.get(timeout=0.01) == []
+    finally:
+        event_hub.unsubscribe(orders)
+        event_hub.unsubscribe(tables)
+
+
+def test_bursts_with_the_same_key_are_coalesced(app):
+    subscription = event_hub.subscribe(["orders"])
+    try:
+        for total in (100, 200, 300):
+            event_hub.publish("orders", "order-updated", {"total": total}, key="order:7")
+        event_hub.publish("orders", "order-updated", {"total": 50}, key="order:8")
+
+        events = subscription.get(timeout=0.1)
+
+        assert [e.data["total"] for e in events] == [300, 50]
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+def test_stream_sends_published_events_and_heartbeats(fast_streams, client):
+    timer = threading.Timer(0.05, event_hub.publish, ("orders", "order-updated", {"id": 3}))
+    timer.start()
+
+    response = client.get("/events?channels=orders")
+    timer.join()
+
+    body = response.get_data(as_text=True)
+    assert response.mimetype == "text/event-stream"
+    assert 'event: order-updated\ndata: {"id":3}' in body
+    assert ": heartbeat" in body
+    assert event_hub.subscriber_count == 0
+
+
+def test_reconnect_replays_missed_events(fast_streams, client):
+    event_hub.publish("orders", "order-updated", {"id": 1})
+    missed_after = event_hub.replay(["orders"], 0)[-1].id
+    event_hub.publish("orders", "order-updated", {"id": 2})
+    event_hub.publish("tables", "table-updated", {"id": 9})
+
+    response = client.get("/events?channels=orders", headers={"Last-Event-ID": str(missed_after)})
+
+    body = response.get_data(as_text=True)
+    assert '{"id":2}' in body
+    assert '{"id":1}' not in body
+    assert "table-updated" not in body
+
+
+def test_ids_from_before_a_restart_get_resync(fast_streams, client):
+    event_hub.publish("orders", "order-updated", {"id": 1})
+    head = event_hub.last_event_id
+
+    response = client.get("/events?channels=orders", headers={"Last-Event-ID": str(head + 50)})
+
+    body = response.get_data(as_text=True)
+    assert f"id: {head}\nevent: resync" in body
+    assert "order-updated" not in body
+
+
+def test_streams_beyond_the_cap_get_503_and_retry(fast_streams, client):
+    fast_streams.config.update(SSE_MAX_STREAMS=1, SSE_BUSY_RETRY=5)
+
+    first = client.get("/events?channels=orders")
+    busy = client.get("/events?channels=orders")
+
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "5"
+    assert busy.get_data(as_text=True) == "retry: 5000\n\n"
+
+    first.close()
+    assert event_hub.stream_count == 0
+    assert client.get("/events?channels=orders").status_code == 200
+
+
+def test_stream_cap_must_leave_server_threads_free(monkeypatch):
+    from librepos.app import create_app  # noqa: PLC0415
+
+    monkeypatch.setenv("SSE_MAX_STREAMS", "8")
+    monkeypatch.setenv("SERVER_THREADS", "8")
+
+    with pytest.raises(ValueError, match="SSE_MAX_STREAMS"):
+        create_app("testing")
+
+
+def test_invalid_channels_are_rejected(client):
+    assert client.get("/events").status_code == 400
+    assert client.get("/events?channels=../etc").status_code == 400
+
+
+def test_order_changes_are_published(app):
+    from librepos.app.blueprints.orders.services import OrderService  # noqa: PLC0415
+
+    subscription = event_hub.subscribe(["orders"])
+    try:
+        with app.app_context():
+            order = OrderService.open_order(tax_rate_bp=0)
+            OrderService.add_line(order, name="Coffee", unit_price=250, quantity=2)
+
+        (event,) = subscription.get(timeout=0.1)
+
+        assert event.type == "order-updated"
+        assert event.data == {"id": order.id, "status": "open", "line_count": 1, "total": 500}
+    finally:
+        event_hub.unsubscribe(subscription)
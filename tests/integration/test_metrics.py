@@ -0,0 +1,62 @@
+"""Tests for request instrumentation."""
+
+import pytest
+
+from librepos.app import create_app
+from librepos.app.config import ProductionConfig
+from librepos.app.shared.metrics import Histogram, metrics_registry
+
+
+def test_server_timing_header_added(client):
+    response = client.get("/")
+
+    header = response.headers["Server-Timing"]
+    assert header.startswith("app;dur=")
+    assert 'desc="0 queries"' in header
+    assert "tpl;dur=" in header
+
+
+def test_metrics_endpoint_exposes_histograms(client):
+    metrics_registry.reset()
+    client.get("/")
+
+    response = client.get("/metrics")
+    body = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert 'librepos_request_duration_seconds_count{endpoint="welcome_view"} 1' in body
+    assert 'librepos_request_latency_seconds{endpoint="welcome_view",quantile="0.99"}' in body
+    assert 'endpoint="metrics"' not in body
+
+
+def test_metrics_endpoint_requires_the_configured_token(monkeypatch):
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-secret")
+    client = create_app("testing").test_client()
+
+    assert client.get("/metrics").status_code == 401
+    wrong = client.get("/metrics", headers={"Authorization": "Bearer nope"})
+    assert wrong.status_code == 401
+    assert wrong.headers["WWW-Authenticate"].startswith("Bearer")
+    ok = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert ok.status_code == 200
+
+
+def test_production_metrics_are_off_unless_a_token_is_set():
+    settings = {"SECRET_KEY": "x", "SQLALCHEMY_DATABASE_URI": "sqlite://"}
+    assert not ProductionConfig(**settings).METRICS_ENABLED
+
+    with pytest.raises(ValueError, match="METRICS_TOKEN"):
+        ProductionConfig.init_app(ProductionConfig(**settings, METRICS_ENABLED=True))
+    ProductionConfig.init_app(
+        ProductionConfig(**settings, METRICS_ENABLED=True, METRICS_TOKEN="scrape-secret")
+    )
+
+
+def test_histogram_quantile_estimate():
+    hist = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        hist.observe(value)
+
+    assert hist.count == 4
+    assert 1.0 <= hist.quantile(0.5) <= 2.0
+    assert 2.0 <= hist.quantile(0.99) <= 4.0
@@ -0,0 +1,112 @@
+"""Tests for the slow-query log, N+1 detector and query budgets."""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+from flask import g, render_template_string
+
+from librepos.app.extensions import db
+from librepos.app.shared.exceptions import QueryBudgetExceededError
+from librepos.app.shared.query_analysis import _explain
+
+LOOP_TEMPLATE = """{% for i in range(6) %}
+{{ run(i) }}
+{% endfor %}"""
+
+
+def _select(value):
+    return db.session.execute(db.text("SELECT :value"), {"value": value}).scalar()
+
+
+def test_query_budget_passes_within_limit(app, query_budget):
+    with app.app_context(), query_budget(2) as statements:
+        _select(1)
+
+    assert len(statements) == 1
+
+
+def _run_three_queries(query_budget):
+    with query_budget(2):
+        for i in range(3):
+            _select(i)
+
+
+def test_query_budget_fails_when_exceeded(app, query_budget):
+    with app.app_context(), pytest.raises(QueryBudgetExceededError, match="3 statements"):
+        _run_three_queries(query_budget)
+
+
+def test_n_plus_one_reports_template_line(app, caplog):
+    app.config["N_PLUS_ONE_THRESHOLD"] = 5
+    with app.test_request_context("/orders"), caplog.at_level(logging.WARNING):
+        render_template_string(LOOP_TEMPLATE, run=_select)
+        findings = g.n_plus_one
+
+    assert len(findings) == 1
+    assert findings[0][1].endswith(":2")
+    assert "Possible N+1 query" in caplog.text
+
+
+def test_slow_query_logged_with_plan(app, caplog):
+    app.config["SLOW_QUERY_THRESHOLD_MS"] = 0
+    with app.test_request_context("/"), caplog.at_level(logging.WARNING):
+        _select(1)
+
+    assert "Slow query" in caplog.text
+    assert "plan:" in caplog.text
+
+
+@pytest.mark.parametrize(("log_params", "logged"), [(False, False), (True, True)])
+def test_slow_query_parameters_logged_only_when_enabled(app, caplog, log_params, logged):
+    app.config.update(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG_PARAMS=log_params)
+    with app.test_request_context("/"), caplog.at_level(logging.WARNING):
+        _select("4111-secret")
+
+    assert "Slow query" in caplog.text
+    assert ("4111-secret" in caplog.text) is logged
+
+
+class _AbortingCursor:
+    """DBAPI cursor mimicking PostgreSQL: after an error, only a rollback works."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql, _parameters=None):
+        self.connection.executed.append(sql)
+        if self.connection.aborted and not sql.startswith("ROLLBACK"):
+            raise RuntimeError("current transaction is aborted")
+        if sql.startswith("EXPLAIN"):
+            self.connection.aborted = True
+            raise RuntimeError("EXPLAIN not allowed here")
+        if sql.startswith("ROLLBACK TO SAVEPOINT"):
+            self.connection.aborted = False
+
+    def close(self):
+        pass
+
+
+class _AbortingConnection:
+    def __init__(self):
+        self.executed = []
+        self.aborted = False
+
+    def cursor(self):
+        return _AbortingCursor(self)
+
+
+def test_failed_explain_does_not_abort_the_request_transaction():
+    connection = _AbortingConnection()
+    conn = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    plan = _explain(conn, _AbortingCursor(connection), "SELECT 1", ())
+
+    assert plan == "EXPLAIN failed: EXPLAIN not allowed here"
+    assert not connection.aborted
+    assert connection.executed == [
+        "SAVEPOINT librepos_explain",
+        "EXPLAIN SELECT 1",
+        "ROLLBACK TO SAVEPOINT librepos_explain",
+        "RELEASE SAVEPOINT librepos_explain",
+    ]
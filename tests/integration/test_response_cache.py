@@ -0,0 +1,66 @@
+"""Tests for the cached_response decorator."""
+
+from flask import template_rendered
+
+from librepos.app.shared.cache import response_cache
+from librepos.app.shared.decorators import cached_response
+from librepos.app.shared.htmx import is_htmx_request
+
+
+def _render_count(app):
+    renders = []
+
+    def record(_app, template, **_kwargs):
+        renders.append(template.name)
+
+    template_rendered.connect(record, app, weak=False)
+    return renders
+
+
+def test_cached_page_served_without_rendering(app, client):
+    renders = _render_count(app)
+
+    first = client.get("/")
+    second = client.get("/")
+
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert renders.count("welcome.html") == 1
+
+
+def test_if_none_match_returns_304(client):
+    etag = client.get("/").headers["ETag"]
+
+    response = client.get("/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_invalidate_tag_forces_rerender(app, client):
+    renders = _render_count(app)
+    client.get("/")
+
+    response_cache.invalidate_tag("pages")
+    client.get("/")
+
+    assert renders.count("welcome.html") == 2
+
+
+def test_boosted_requests_are_not_served_cached_fragments(app, client):
+    @app.get("/cached-fragment")
+    @cached_response()
+    def cached_fragment():
+        return "fragment" if is_htmx_request() else "page"
+
+    fragment = client.get("/cached-fragment", headers={"HX-Request": "true"})
+    boosted = client.get("/cached-fragment", headers={"HX-Request": "true", "HX-Boosted": "true"})
+    restore = client.get(
+        "/cached-fragment",
+        headers={"HX-Request": "true", "HX-History-Restore-Request": "true"},
+    )
+
+    assert fragment.data == b"fragment"
+    assert boosted.data == b"page"
+    assert restore.data == b"page"
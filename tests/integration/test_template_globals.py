@@ -0,0 +1,33 @@
+"""Tests for the startup-built template globals registry."""
+
+from flask import template_rendered
+
+
+def _rendered_templates(app):
+    names = []
+
+    def record(_app, template, **_kwargs):
+        names.append(template.name)
+
+    template_rendered.connect(record, app, weak=False)
+    return names
+
+
+def test_nav_fragment_rendered_once_per_endpoint(app, client):
+    names = _rendered_templates(app)
+
+    first = client.get("/")
+    second = client.get("/")
+
+    assert first.status_code == second.status_code == 200
+    assert names.count("partials/nav.html") == 1
+    assert b"sidenav-footer" in second.data
+
+
+def test_business_name_change_refreshes_nav(app, client):
+    client.get("/")
+    app.config["BUSINESS_NAME"] = "Taco Truck"
+
+    response = client.get("/")
+
+    assert b"Taco Truck" in response.data
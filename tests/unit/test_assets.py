@@ -0,0 +1,79 @@
+"""Tests for content-hashed, precompressed static assets."""
+
+import gzip
+import json
+
+import pytest
+
+from librepos.app.shared.assets import IMMUTABLE_MAX_AGE, asset_manifest, asset_url
+
+SOURCE = b"console.log('LibrePOS');\n"
+GZIPPED = gzip.compress(SOURCE, mtime=0)
+
+
+@pytest.fixture
+def static_app(app, tmp_path):
+    """An app whose static folder holds one hashed asset and one plain file."""
+    js = tmp_path / "js"
+    js.mkdir()
+    (js / "app.min.abc123.js").write_bytes(SOURCE)
+    (js / "app.min.abc123.js.gz").write_bytes(GZIPPED)
+    (js / "app.min.abc123.js.br").write_bytes(b"brotli-bytes")
+    (js / "plain.js").write_bytes(SOURCE)
+    (js / "sw.js").write_text("self.addEventListener('fetch', () => {});\n")
+    (tmp_path / "asset-manifest.json").write_text(
+        json.dumps({"js/app.min.js": "js/app.min.abc123.js"})
+    )
+    app.static_url_path = "/static"  # otherwise derived from the folder name
+    app.static_folder = str(tmp_path)
+    asset_manifest.init_app(app)
+    return app
+
+
+def test_asset_url_resolves_through_the_manifest(static_app):
+    with static_app.test_request_context():
+        assert asset_url("js/app.min.js") == "/static/js/app.min.abc123.js"
+        assert asset_url("js/plain.js") == "/static/js/plain.js"
+
+
+@pytest.mark.parametrize(
+    ("accept", "encoding", "body"),
+    [
+        ("gzip, br", "br", b"brotli-bytes"),
+        ("gzip", "gzip", GZIPPED),
+        ("", None, SOURCE),
+    ],
+)
+def test_hashed_assets_are_served_precompressed(static_app, accept, encoding, body):
+    response = static_app.test_client().get(
+        "/static/js/app.min.abc123.js", headers={"Accept-Encoding": accept}
+    )
+
+    assert response.headers.get("Content-Encoding") == encoding
+    assert response.data == body
+    assert response.mimetype == "text/javascript"
+    assert "Accept-Encoding" in response.vary
+    response.close()
+
+
+def test_only_hashed_assets_are_immutable(static_app):
+    client = static_app.test_client()
+
+    hashed = client.get("/static/js/app.min.abc123.js")
+    plain = client.get("/static/js/plain.js")
+
+    assert hashed.cache_control.immutable
+    assert hashed.cache_control.max_age == IMMUTABLE_MAX_AGE
+    assert not plain.cache_control.immutable
+    assert plain.cache_control.max_age != IMMUTABLE_MAX_AGE
+    hashed.close()
+    plain.close()
+
+
+def test_service_worker_prelude_lists_the_hashed_assets(static_app):
+    response = static_app.test_client().get("/sw.js")
+    prelude = response.get_data(as_text=True).split("\n", 2)
+
+    assert prelude[0] == f'self.ASSET_VERSION = "{asset_manifest.version}";'
+    assert prelude[1] == 'self.HASHED_ASSETS = ["/static/js/app.min.abc123.js"];'
+    assert prelude[2].startswith("self.addEventListener")
@@ -0,0 +1,80 @@
+"""Tests for response compression."""
+
+import gzip
+import zlib
+
+from flask import Response, jsonify, stream_with_context
+
+from librepos.app import create_app
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def test_html_is_gzipped_when_accepted(client):
+    plain = client.get("/")
+    response = client.get("/", headers=GZIP)
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.vary
+    assert gzip.decompress(response.data) == plain.data
+    assert int(response.headers["Content-Length"]) == len(response.data)
+
+
+def test_compressed_responses_get_a_weak_etag_that_still_revalidates(client):
+    response = client.get("/", headers=GZIP)
+    etag, weak = response.get_etag()
+
+    assert weak
+    revalidated = client.get("/", headers={**GZIP, "If-None-Match": f'W/"{etag}"'})
+    assert revalidated.status_code == 304
+
+
+def test_identity_when_not_accepted(client):
+    response = client.get("/")
+
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.vary
+
+
+def test_small_and_binary_bodies_are_not_compressed(app):
+    @app.get("/tiny")
+    def tiny():
+        return jsonify(ok=True)
+
+    @app.get("/png")
+    def png():
+        return Response(b"\x89PNG" * 1000, mimetype="image/png")
+
+    client = app.test_client()
+
+    assert "Content-Encoding" not in client.get("/tiny", headers=GZIP).headers
+    assert "Content-Encoding" not in client.get("/png", headers=GZIP).headers
+
+
+def test_streamed_response_is_compressed_chunk_by_chunk(app):
+    @app.get("/stream")
+    def stream():
+        def events():
+            yield "data: one\n\n"
+            yield "data: two\n\n"
+
+        return Response(stream_with_context(events()), mimetype="text/event-stream")
+
+    response = app.test_client().get("/stream", headers=GZIP, buffered=False)
+    chunks = list(response.response)
+    response.close()
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    # Each event can be decoded as soon as its chunk arrives
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decoder.decompress(chunks[0]) == b"data: one\n\n"
+    assert decoder.decompress(b"".join(chunks[1:])) == b"data: two\n\n"
+
+
+def test_disabled_by_setting(monkeypatch):
+    monkeypatch.setenv("COMPRESS_ENABLED", "false")
+
+    response = create_app("testing").test_client().get("/", headers=GZIP)
+
+    assert "Content-Encoding" not in response.headers
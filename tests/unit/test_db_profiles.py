@@ -0,0 +1,30 @@
+"""Tests for the backend-aware engine profiles."""
+
+from sqlalchemy import create_engine, text
+
+from librepos.app.config import BaseConfig
+from librepos.app.shared.db_profiles import apply_engine_profile, engine_options
+
+
+def _config(uri):
+    return BaseConfig(SQLALCHEMY_DATABASE_URI=uri).model_dump()
+
+
+def test_postgres_profile_sizes_pool_and_sets_statement_timeout():
+    options = engine_options(_config("postgresql://localhost/librepos"))
+
+    assert options["pool_size"] == 10
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=30000"}
+
+
+def test_sqlite_profile_enables_wal_and_busy_timeout(tmp_path):
+    config = _config(f"sqlite:///{tmp_path / 'pos.db'}")
+    engine = create_engine(config["SQLALCHEMY_DATABASE_URI"], **engine_options(config))
+    apply_engine_profile(engine, config)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
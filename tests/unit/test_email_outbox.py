@@ -0,0 +1,79 @@
+"""Tests for the email outbox."""
+
+from unittest.mock import patch
+
+from librepos.app.extensions import mail
+from librepos.app.shared.email import (
+    OutboxEmail,
+    OutboxStatus,
+    deliver_outbox,
+    flush_outbox,
+    queue_email,
+    queue_mass_email,
+)
+
+
+def test_queue_email_stores_pending_entry(app):
+    with app.app_context():
+        entry = queue_email(["manager@example.com"], "Report", "Body")
+
+        assert entry.id is not None
+        assert entry.status == OutboxStatus.PENDING
+
+
+def test_deliver_outbox_sends_batch_over_one_connection(app):
+    with app.app_context():
+        queue_mass_email(["a@example.com", "b@example.com", "c@example.com"], "EOD", "Body")
+
+        with patch.object(mail, "get_connection", wraps=mail.get_connection) as get_connection:
+            sent, failed = deliver_outbox()
+
+        assert (sent, failed) == (3, 0)
+        assert get_connection.call_count == 1
+        assert len(app.extensions["mailman"].outbox) == 3
+        assert all(e.status == OutboxStatus.SENT for e in OutboxEmail.get_all())
+
+
+def test_deliver_outbox_backs_off_then_fails(app):
+    app.config["MAIL_OUTBOX_MAX_ATTEMPTS"] = 2
+    app.config["MAIL_OUTBOX_BACKOFF"] = 0
+    with app.app_context():
+        entry = queue_email(["a@example.com"], "Report", "Body")
+
+        with patch.object(OutboxEmail, "to_message", side_effect=OSError("relay down")):
+            assert deliver_outbox() == (0, 1)
+            assert entry.status == OutboxStatus.PENDING
+            assert deliver_outbox() == (0, 1)
+
+        assert entry.status == OutboxStatus.FAILED
+        assert entry.attempts == 2
+        assert entry.last_error == "relay down"
+
+
+def test_flush_outbox_keeps_going_past_failed_recipients(app):
+    real_to_message = OutboxEmail.to_message
+
+    def to_message(entry, connection):
+        if entry.recipients == ["a@example.com"]:
+            raise OSError("mailbox unavailable")
+        return real_to_message(entry, connection)
+
+    with app.app_context():
+        queue_mass_email(["a@example.com", "b@example.com", "c@example.com"], "EOD", "Body")
+
+        with patch.object(OutboxEmail, "to_message", autospec=True, side_effect=to_message):
+            # The first batch holds only the failing recipient
+            assert flush_outbox(batch_size=1) == (2, 1)
+
+        assert len(app.extensions["mailman"].outbox) == 2
+
+
+def test_flush_outbox_stops_when_the_server_is_unreachable(app):
+    with app.app_context():
+        queue_mass_email(["a@example.com", "b@example.com"], "EOD", "Body")
+
+        with patch.object(mail, "get_connection", side_effect=OSError("connection refused")):
+            assert flush_outbox(batch_size=1) == (0, 1)
+
+        statuses = [e.status for e in OutboxEmail.get_all()]
+        assert statuses == [OutboxStatus.PENDING, OutboxStatus.PENDING]
@@ -0,0 +1,83 @@
+"""Tests for CSV export utilities."""
+
+import gzip
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from librepos.app.blueprints.auth.models import Permission
+from librepos.app.extensions import db
+from librepos.app.shared.export import DEFAULT_BATCH_SIZE, ExportField, stream_csv_export
+
+FIELDS = [
+    ExportField("ID", lambda row: row["id"]),
+    ExportField("Name", lambda row: row["name"]),
+]
+
+
+def _rows(count):
+    return ({"id": i, "name": f"item-{i}"} for i in range(count))
+
+
+def _chunks(response) -> list[bytes]:
+    """The streamed body, chunk by chunk (the export always yields bytes)."""
+    return [chunk for chunk in response.response if isinstance(chunk, bytes)]
+
+
+def test_stream_csv_export_writes_one_chunk_per_batch(app):
+    with app.test_request_context():
+        response = stream_csv_export(_rows(25), FIELDS, "items", batch_size=10)
+        chunks = _chunks(response)
+
+    assert response.is_streamed
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert lines[0] == "ID,Name"
+    assert lines[-1] == "24,item-24"
+    assert len(lines) == 26
+
+
+def test_stream_csv_export_gzips_when_accepted(app):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = stream_csv_export(_rows(5), FIELDS, compress=True)
+        body = b"".join(_chunks(response))
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body).decode().splitlines()[1] == "0,item-0"
+
+
+def test_stream_csv_export_skips_gzip_when_not_accepted(app):
+    with app.test_request_context():
+        response = stream_csv_export(_rows(1), FIELDS, compress=True)
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_stream_csv_export_reads_statements_in_batches(app):
+    fields = [ExportField("ID", lambda p: p.id), ExportField("Name", lambda p: p.name)]
+    batch_sizes = []
+
+    def record_batch_size(state):
+        batch_sizes.append(state.execution_options.get("yield_per"))
+
+    with app.test_request_context():
+        Permission.bulk_create([{"name": f"perm-{i:02}"} for i in range(25)])
+        stmt = db.select(Permission).order_by(Permission.id)
+        event.listen(Session, "do_orm_execute", record_batch_size)
+        try:
+            response = stream_csv_export(stmt, fields, "permissions", batch_size=10)
+            chunks = _chunks(response)
+            rows = stream_csv_export(
+                db.select(Permission.id, Permission.name).order_by(Permission.id), fields
+            ).get_data()
+        finally:
+            event.remove(Session, "do_orm_execute", record_batch_size)
+
+    assert batch_sizes == [10, DEFAULT_BATCH_SIZE]
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert lines[1] == "1,perm-00"
+    assert lines[-1] == "25,perm-24"
+    # Multi-column selects stream rows rather than ORM instances
+    assert rows.decode().splitlines() == lines
@@ -0,0 +1,85 @@
+"""Tests for HTMX fragment rendering."""
+
+import pytest
+from jinja2 import ChoiceLoader, DictLoader
+
+from librepos.app.blueprints.orders.services import OrderService
+from librepos.app.shared.htmx import render_htmx
+
+HX = {"HX-Request": "true"}
+
+
+@pytest.fixture
+def orders(app):
+    with app.app_context():
+        return [OrderService.open_order(tax_rate_bp=0).id for _ in range(25)]
+
+
+def test_full_page_without_htmx(client, orders):
+    response = client.get("/orders/")
+
+    assert b"<html" in response.data
+    assert "HX-Request" in response.headers["Vary"]
+
+
+def test_htmx_request_gets_only_the_block(client, orders):
+    response = client.get("/orders/", headers=HX)
+
+    body = response.get_data(as_text=True)
+    assert body.lstrip().startswith('<table id="open-orders"')
+    assert "<html" not in body
+    assert 'id="main"' not in body
+    assert "HX-Request" in response.headers["Vary"]
+
+
+def test_next_page_is_rows_and_a_new_sentinel(client, orders):
+    first = client.get("/orders/", headers=HX).get_data(as_text=True)
+    next_url = first.split('hx-get="')[2].split('"')[0].replace("&amp;", "&")
+
+    body = client.get(next_url, headers=HX).get_data(as_text=True)
+
+    assert "<table" not in body
+    assert body.count("<tr>") == 5
+    assert "infinite-scroll" not in body
+
+
+def test_boosted_requests_get_the_full_page(client, orders):
+    response = client.get("/orders/", headers={**HX, "HX-Boosted": "true"})
+
+    assert b"<html" in response.data
+
+
+def test_ticket_partial_for_htmx(client, orders):
+    body = client.get(f"/orders/{orders[0]}", headers=HX).get_data(as_text=True)
+
+    assert '<div id="ticket"' in body
+    assert "<html" not in body
+
+
+def test_out_of_band_fragments(app):
+    app.jinja_env.loader = ChoiceLoader(
+        [
+            DictLoader(
+                {
+                    "page.html": (
+                        "<html>{% block main %}<p>{{ n }}</p>{% endblock %}"
+                        '{% block count %}<b id="count"{% if hx_oob %} hx-swap-oob="true"'
+                        "{% endif %}>{{ n }}</b>{% endblock %}</html>"
+                    ),
+                    "badge.html": '<i id="badge" hx-swap-oob="true">{{ n }}</i>',
+                }
+            ),
+            app.jinja_env.loader,
+        ]
+    )
+
+    with app.test_request_context(headers=HX):
+        body = render_htmx("page.html", oob=("count", "badge.html"), n=3).get_data(as_text=True)
+    with app.test_request_context():
+        page = render_htmx("page.html", oob=("count",), n=3).get_data(as_text=True)
+
+    assert (
+        body
+        == '<p>3</p><b id="count" hx-swap-oob="true">3</b><i id="badge" hx-swap-oob="true">3</i>'
+    )
+    assert page == '<html><p>3</p><b id="count">3</b></html>'
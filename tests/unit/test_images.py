@@ -0,0 +1,143 @@
+"""Tests for the background image rendition pipeline."""
+
+import io
+import json
+from concurrent.futures import Future
+
+import pytest
+from PIL import Image, UnidentifiedImageError
+from werkzeug.datastructures import FileStorage
+
+from librepos.app.shared.images import (
+    CATEGORY_PLACEHOLDER,
+    RENDITION_FORMATS,
+    RENDITIONS,
+    STAGING_DIR,
+    USER_PLACEHOLDER,
+    _stage_original,
+    generate_renditions,
+    image_pipeline,
+    queue_category_image,
+    queue_user_image,
+)
+
+
+class SyncExecutor:
+    """Runs pool jobs in the calling thread, so results are ready on return."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+@pytest.fixture
+def sync_pipeline(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(image_pipeline, "_executor", SyncExecutor())
+    app.instance_path = str(tmp_path / "instance")
+    return image_pipeline
+
+
+def _staged(tmp_path):
+    return sorted(p for p in (tmp_path / "instance" / STAGING_DIR).rglob("*") if p.is_file())
+
+
+def _png(size=(1600, 1200), mode="RGBA"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 255) if mode == "RGBA" else (200, 30, 30)).save(
+        buffer, "PNG"
+    )
+    buffer.seek(0)
+    return buffer
+
+
+def _upload(name="photo.png"):
+    return FileStorage(stream=_png(), filename=name, content_type="image/png")
+
+
+def test_generate_renditions_writes_every_size_and_format(tmp_path):
+    source = tmp_path / "staging" / "abc_photo.png"
+    source.parent.mkdir()
+    source.write_bytes(_png().getvalue())
+    output_dir = tmp_path / "img" / "categories"
+
+    renditions = generate_renditions(str(source), str(output_dir), str(tmp_path / "img"))
+
+    assert set(renditions) == set(RENDITIONS)
+    for name, max_size in RENDITIONS.items():
+        assert set(renditions[name]) == set(RENDITION_FORMATS)
+        for fmt, (pil_format, _suffix) in RENDITION_FORMATS.items():
+            with Image.open(tmp_path / "img" / renditions[name][fmt]) as img:
+                assert img.format == pil_format
+                assert img.width <= max_size[0]
+                assert img.height <= max_size[1]
+                # Aspect ratio is kept (4:3 source)
+                assert abs(img.width / img.height - 4 / 3) < 0.02
+    assert renditions["thumb"]["webp"] == "categories/abc_photo_thumb.webp"
+
+    manifest = json.loads((output_dir / "abc_photo.json").read_text())
+    assert manifest == {"renditions": renditions}
+    # The original (with its metadata) is not kept once the renditions exist
+    assert not source.exists()
+
+
+def test_queue_returns_the_placeholder_and_records_renditions_on_completion(
+    app, tmp_path, sync_pipeline
+):
+    recorded = []
+
+    with app.test_request_context():
+        user_path = queue_user_image(_upload(), "casey", str(tmp_path), recorded.append)
+        category_path = queue_category_image(_upload("menu.png"), str(tmp_path), recorded.append)
+
+    assert user_path == USER_PLACEHOLDER
+    assert category_path == CATEGORY_PLACEHOLDER
+    assert len(recorded) == 2
+    assert recorded[0]["medium"]["jpeg"].startswith("users/casey/")
+    assert (tmp_path / "img" / recorded[1]["large"]["webp"]).is_file()
+    assert _staged(tmp_path) == []
+    assert not any(p.suffix == ".png" for p in (tmp_path / "img").rglob("*"))
+
+
+def test_staged_originals_stay_private_and_take_the_detected_extension(
+    app, tmp_path, sync_pipeline
+):
+    with app.test_request_context():
+        staged = _stage_original(_upload("page.html"), "categories")
+
+    assert staged.parent == tmp_path / "instance" / STAGING_DIR / "categories"
+    assert staged.suffix == ".png"
+    assert staged.stem.endswith("_page")
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"not an image", b'<svg xmlns="http://www.w3.org/2000/svg"><script>x()</script></svg>'],
+)
+def test_queue_rejects_non_image_uploads(app, tmp_path, sync_pipeline, content):
+    upload = FileStorage(stream=io.BytesIO(content), filename="notes.png")
+
+    with app.test_request_context(), pytest.raises(UnidentifiedImageError):
+        queue_category_image(upload, str(tmp_path))
+
+    assert _staged(tmp_path) == []
+
+
+def test_images_rebuild_command_processes_leftover_uploads(app, tmp_path, sync_pipeline):
+    # Staged, but the server stopped before the job ran
+    with app.test_request_context():
+        _stage_original(_upload(), "categories")
+    app.static_folder = str(tmp_path)
+
+    result = app.test_cli_runner().invoke(args=["images", "rebuild"])
+
+    assert result.exit_code == 0, result.output
+    assert "Processed: 1" in result.output
+    assert len(list((tmp_path / "img" / "categories").glob("*_thumb.*"))) == len(RENDITION_FORMATS)
+    assert _staged(tmp_path) == []
@@ -0,0 +1,74 @@
+"""Tests for the menu catalog snapshot."""
+
+import json
+
+import pytest
+
+from librepos.app.blueprints.menu.models import MenuCategory, MenuItem, Modifier
+from librepos.app.blueprints.menu.services import MenuService, get_catalog
+from librepos.app.cli import CATEGORY_SEED_DATA
+from librepos.app.extensions import db
+
+
+@pytest.fixture
+def menu(app):
+    with app.app_context():
+        MenuService.seed_categories(CATEGORY_SEED_DATA)
+        pizza = db.session.execute(db.select(MenuCategory).filter_by(name="Pizza")).scalar_one()
+        item = MenuItem(category_id=pizza.id, name="Margherita", price=1200)
+        item.modifiers.append(Modifier(name="Extra cheese", price=150))
+        db.session.add(item)
+        db.session.add(MenuItem(category_id=pizza.id, name="Retired", price=900, active=False))
+        db.session.commit()
+        return {"pizza": pizza.id, "item": item.id}
+
+
+def test_catalog_is_compact_and_ordered(app, client, menu):
+    response = client.get("/menu/catalog.json")
+
+    catalog = json.loads(response.data)
+    assert response.headers["ETag"] == f'"{catalog["version"]}"'
+    assert "no-cache" in response.headers["Cache-Control"]
+    assert [row[1] for row in catalog["categories"]] == [c["name"] for c in CATEGORY_SEED_DATA]
+    assert catalog["fields"]["items"] == ["id", "category_id", "name", "price", "modifiers"]
+    ((item_id, category_id, name, price, modifiers),) = catalog["items"]
+    assert (item_id, category_id, name, price) == (menu["item"], menu["pizza"], "Margherita", 1200)
+    assert [m[1:] for m in modifiers] == [["Extra cheese", 150]]
+
+
+def test_unchanged_catalog_revalidates_with_304(client, menu):
+    etag = client.get("/menu/catalog.json").headers["ETag"]
+
+    response = client.get("/menu/catalog.json", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_catalog_is_rebuilt_after_a_menu_commit(app, menu, query_budget):
+    with app.app_context():
+        first = get_catalog()
+        with query_budget(0):
+            assert get_catalog() is first
+
+        db.session.get(MenuItem, menu["item"]).price = 1300
+        db.session.commit()
+        second = get_catalog()
+
+    assert second.version != first.version
+    assert b'"Margherita",1300' in second.body
+
+
+def test_bulk_writes_invalidate_the_catalog(app, menu):
+    with app.app_context():
+        first = get_catalog()
+        MenuCategory.bulk_create([{"name": "Brunch", "display_order": 11}])
+
+        assert get_catalog().version != first.version
+
+
+def test_seed_categories_skips_existing_names(app, menu):
+    with app.app_context():
+        created, skipped = MenuService.seed_categories(CATEGORY_SEED_DATA)
+
+    assert (created, skipped) == (0, len(CATEGORY_SEED_DATA))
@@ -0,0 +1,165 @@
+"""Tests for CRUDMixin bulk operations and the model cache."""
+
+import pytest
+from sqlalchemy import String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from librepos.app import create_app
+from librepos.app.extensions import db
+from librepos.app.shared import CacheOptions, CRUDMixin
+from librepos.app.shared.cache import get_model_cache
+from librepos.app.shared.exceptions import UnsupportedDialectError
+
+
+class Widget(db.Model, CRUDMixin):
+    __tablename__ = "test_widgets"
+
+    SEED_DATA = ("Alpha", "Beta", "Gamma")
+
+    name: Mapped[str] = mapped_column(String(50), unique=True)
+    color: Mapped[str | None] = mapped_column(String(20))
+
+
+class CachedWidget(db.Model, CRUDMixin):
+    __tablename__ = "test_cached_widgets"
+
+    CACHE_OPTIONS = CacheOptions(maxsize=10, ttl=60, lookups=("name",))
+
+    name: Mapped[str] = mapped_column(String(50), unique=True)
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_bulk_create_batches_rows(app):
+    with app.app_context():
+        statements = _count_statements(db.engine)
+        rows = [{"name": f"w{i}"} for i in range(25)]
+
+        assert Widget.bulk_create(rows, chunk_size=10) == 25
+
+        assert len(Widget.get_all()) == 25
+        assert sum("INSERT" in s for s in statements) <= 3
+
+
+def test_bulk_upsert_updates_conflicting_rows(app):
+    with app.app_context():
+        Widget.create(name="w1", color="red")
+
+        Widget.bulk_upsert(
+            [{"name": "w1", "color": "blue"}, {"name": "w2", "color": "green"}],
+            index_elements=["name"],
+        )
+
+        db.session.expire_all()
+        assert Widget.get_first_by(name="w1").color == "blue"
+        assert Widget.get_first_by(name="w2").color == "green"
+
+
+def test_bulk_upsert_rejects_unsupported_databases(app, monkeypatch):
+    with app.app_context():
+        monkeypatch.setattr(db.engine.dialect, "name", "mssql")
+
+        with pytest.raises(UnsupportedDialectError, match="bulk_upsert"):
+            Widget.bulk_upsert([{"name": "w1"}], index_elements=["name"])
+
+
+def test_bulk_update_by_primary_key(app):
+    with app.app_context():
+        first = Widget.create(name="w1")
+        second = Widget.create(name="w2")
+
+        Widget.bulk_update([{"id": first.id, "color": "red"}, {"id": second.id, "color": "tan"}])
+
+        db.session.expire_all()
+        assert [w.color for w in Widget.get_all()] == ["red", "tan"]
+
+
+def test_seed_data_only_inserts_missing_rows(app):
+    with app.app_context():
+        Widget.create(name="Beta")
+
+        assert Widget.seed_data() == 2
+        assert Widget.seed_data() == 0
+        assert sorted(w.name for w in Widget.get_all()) == ["Alpha", "Beta", "Gamma"]
+
+
+def test_cached_get_by_id_skips_database(app):
+    with app.app_context():
+        record_id = CachedWidget.create(name="Drinks").id
+        db.session.remove()
+        assert CachedWidget.get_by_id(record_id).name == "Drinks"
+        db.session.remove()
+
+        statements = _count_statements(db.engine)
+        widget = CachedWidget.get_by_id(record_id)
+
+        assert widget.name == "Drinks"
+        assert widget in db.session
+        assert statements == []
+        assert CachedWidget.cache_stats()["hits"] >= 1
+
+
+def test_cached_lookup_invalidated_on_commit(app):
+    with app.app_context():
+        CachedWidget.create(name="Sides")
+        db.session.remove()
+        widget = CachedWidget.get_first_by(name="Sides")
+        assert CachedWidget.get_first_by(name="Sides") is widget
+
+        record_id = widget.id
+        widget.update(name="Extras")
+        db.session.remove()
+
+        assert CachedWidget.get_first_by(name="Sides") is None
+        assert CachedWidget.get_by_id(record_id).name == "Extras"
+
+
+def test_cached_get_by_id_keeps_pending_changes(app):
+    with app.app_context():
+        record_id = CachedWidget.create(name="Mains").id
+        db.session.remove()
+        CachedWidget.get_by_id(record_id)
+        db.session.remove()
+
+        widget = CachedWidget.get_by_id(record_id)
+        assert isinstance(widget, CachedWidget)
+        widget.name = "Starters"
+
+        assert CachedWidget.get_by_id(record_id) is widget
+        assert widget.name == "Starters"
+
+
+def test_stale_reads_are_not_cached_after_invalidation(app):
+    with app.app_context():
+        record_id = CachedWidget.create(name="Desserts").id
+        db.session.remove()
+        cache = get_model_cache(CachedWidget, db.session())
+        assert cache is not None
+        generation = cache.generation
+        widget = db.session.get(CachedWidget, record_id)
+
+        cache.invalidate(record_id)
+        cache.put(widget, generation)
+
+        assert cache.get(record_id) is None
+
+
+def test_model_caches_are_not_shared_between_apps(app):
+    other = create_app("testing")
+    with other.app_context():
+        db.create_all()
+        CachedWidget.create(name="Other")
+        db.session.remove()
+        CachedWidget.get_by_id(1)
+
+    with app.app_context():
+        CachedWidget.create(name="Mine")
+        db.session.remove()
+        widget = CachedWidget.get_by_id(1)
+
+    assert isinstance(widget, CachedWidget)
+    assert widget.name == "Mine"
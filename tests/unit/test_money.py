@@ -0,0 +1,74 @@
+"""Tests for the integer-cents Money type."""
+
+from decimal import Decimal
+
+import pytest
+from flask import render_template_string
+from sqlalchemy import String, func, select
+from sqlalchemy.orm import Mapped, mapped_column
+
+from librepos.app.extensions import db
+from librepos.app.shared import Money, MoneyType, dollars_to_cents, sum_lines
+from librepos.app.shared.money import currency_formatter
+
+
+class PricedItem(db.Model):
+    __tablename__ = "test_priced_items"
+
+    name: Mapped[str] = mapped_column(String(20))
+    price: Mapped[Money] = mapped_column(MoneyType())
+
+
+@pytest.mark.parametrize(
+    ("dollars", "cents"), [(19.99, 1999), ("0.285", 29), (Decimal("4.1"), 410)]
+)
+def test_dollar_amounts_round_half_up(dollars, cents):
+    assert Money.from_decimal(dollars, "USD").cents == cents
+    assert dollars_to_cents(dollars) == cents
+
+
+def test_sum_lines_taxes_the_subtotal_once():
+    lines = [(Money(333, "USD"), 3), (150, 1)]
+
+    subtotal, tax, total = sum_lines(lines, tax_rate_bp=825, currency="USD")
+
+    assert subtotal == Money(1149, "USD")
+    assert tax == Money(95, "USD")  # 94.79 rounds up
+    assert total == Money(1244, "USD")
+
+
+def test_mixed_currencies_are_rejected():
+    with pytest.raises(ValueError, match="Currency mismatch"):
+        Money(100, "USD") + Money(100, "EUR")
+
+
+def test_money_orders_only_against_money():
+    assert Money(5) <= Money(5) < Money(6)
+    assert Money(5) == Money(5)
+    assert Money(5) != 5
+    with pytest.raises(TypeError):
+        assert Money(5) < 6  # type: ignore[operator]
+    with pytest.raises(TypeError):
+        assert Money(5) <= 5  # type: ignore[operator]
+
+
+def test_money_column_round_trips_and_aggregates(app):
+    with app.app_context():
+        db.session.add_all(
+            [PricedItem(name="a", price=Money(250)), PricedItem(name="b", price=199)]
+        )
+        db.session.commit()
+
+        assert db.session.scalar(select(PricedItem.price).filter_by(name="b")) == Money(199)
+        assert db.session.scalar(select(func.sum(PricedItem.price))) == Money(449)
+
+
+def test_money_filter_uses_business_locale(app):
+    app.config["BUSINESS_LOCALE"] = "de_DE"
+    app.config["BUSINESS_CURRENCY"] = "EUR"
+
+    with app.test_request_context():
+        rendered = render_template_string("{{ 123450|money }} {{ none|money('-') }}", none=None)
+
+    assert rendered == "1.234,50\xa0€ -"
+    assert currency_formatter.cache_info().currsize >= 1
@@ -0,0 +1,154 @@
+"""Tests for the batched offline order sync endpoint."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from librepos.app.blueprints.orders.models import Order, OrderLine, OrderStatus
+from librepos.app.blueprints.orders.services import OrderSyncService
+from librepos.app.blueprints.reports.models import DailySalesSummary
+from librepos.app.extensions import db
+
+
+def _order(key, status="open", **extra):
+    return {
+        "key": key,
+        "status": status,
+        "lines": [
+            {"name": "Burger", "unit_price": 900, "quantity": 2, "modifiers_price": 100},
+            {"name": "Soda", "unit_price": 250},
+        ],
+        **extra,
+    }
+
+
+@pytest.fixture
+def sync(app, client):
+    app.config["SALES_TAX_RATE_BP"] = 1000
+
+    def post(orders, **kwargs):
+        return client.post("/orders/sync", json={"orders": orders}, **kwargs)
+
+    return post
+
+
+def test_batch_is_inserted_with_totals(app, sync):
+    response = sync([_order("a"), _order("b", status="paid", discount=250)])
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [r["status"] for r in results] == ["created", "created"]
+    with app.app_context():
+        first = db.session.get(Order, results[0]["order_id"])
+        second = db.session.get(Order, results[1]["order_id"])
+        assert (first.line_count, first.subtotal.cents, first.tax.cents) == (2, 2250, 225)
+        assert first.total.cents == 2475
+        assert second.status == OrderStatus.PAID
+        assert second.total.cents == 2200
+        assert db.session.scalar(db.select(db.func.count(OrderLine.id))) == 4
+        # Paid orders reach the reports like orders closed at the till
+        assert db.session.scalar(db.select(DailySalesSummary.order_count)) == 1
+
+
+def test_resent_and_repeated_keys_are_duplicates(app, sync):
+    first = sync([_order("a")]).get_json()["results"][0]
+
+    results = sync([_order("a"), _order("c"), _order("c")]).get_json()["results"]
+
+    assert [r["status"] for r in results] == ["duplicate", "created", "duplicate"]
+    assert results[0]["order_id"] == first["order_id"]
+    assert results[2]["order_id"] == results[1]["order_id"]
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count(Order.id))) == 2
+
+
+def test_invalid_orders_do_not_block_the_batch(sync):
+    results = sync(
+        [_order("ok"), {"key": "bad", "lines": []}, _order("neg", lines=[{"name": "x"}])]
+    ).get_json()["results"]
+
+    assert [r["status"] for r in results] == ["created", "invalid", "invalid"]
+    assert "lines" in results[1]["error"]
+    assert "unit_price" in results[2]["error"]
+
+
+def test_out_of_range_numbers_reject_only_their_order(sync):
+    huge = [{"name": "Burger", "unit_price": 2**31}]
+    overflowing = [{"name": "Burger", "unit_price": 2**30, "quantity": 4}]
+
+    results = sync(
+        [_order("huge", lines=huge), _order("overflow", lines=overflowing), _order("ok")]
+    ).get_json()["results"]
+
+    assert [r["status"] for r in results] == ["invalid", "invalid", "created"]
+    assert "unit_price" in results[0]["error"]
+    assert "line total" in results[1]["error"]
+
+
+def test_tax_and_close_time_come_from_the_server(app, sync):
+    now = datetime.now(UTC)
+    backdated = (now - timedelta(days=3)).isoformat()
+    ahead = (now + timedelta(hours=2)).isoformat()
+
+    results = sync(
+        [
+            _order("taxed", tax_rate_bp=0),
+            _order("backdated", status="paid", closed_at=backdated),
+            _order("ahead", status="paid", closed_at=ahead),
+        ]
+    ).get_json()["results"]
+
+    assert [r["status"] for r in results] == ["created", "invalid", "created"]
+    assert "closed_at" in results[1]["error"]
+    with app.app_context():
+        taxed = db.session.get(Order, results[0]["order_id"])
+        ahead_order = db.session.get(Order, results[2]["order_id"])
+        assert (taxed.tax_rate_bp, taxed.tax.cents) == (1000, 225)
+        assert ahead_order.closed_at is not None
+        assert ahead_order.closed_at.replace(tzinfo=UTC) <= datetime.now(UTC)
+
+
+def test_sync_requires_permission_to_take_orders(app, sync):
+    app.config["LOGIN_DISABLED"] = False
+
+    assert sync([_order("a")]).status_code == 401
+
+
+def test_batch_needs_one_lookup_and_one_commit(app):
+    statements, commits = [], []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    def on_commit(session):
+        commits.append(session)
+
+    with app.app_context(), app.test_request_context():
+        event.listen(db.engine, "before_cursor_execute", record)
+        event.listen(db.session, "after_commit", on_commit)
+        try:
+            OrderSyncService.ingest([_order(str(i)) for i in range(25)])
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+            event.remove(db.session, "after_commit", on_commit)
+
+    # Key lookup, orders, ids by key, lines
+    assert len(statements) == 4
+    assert len(commits) == 1
+
+
+def test_requests_must_be_same_origin_json(app, client, sync):
+    assert client.post("/orders/sync", data={"orders": "[]"}).status_code == 415
+    assert sync([], headers={"Origin": "https://evil.example"}).status_code == 403
+    assert sync([], headers={"Sec-Fetch-Site": "cross-site"}).status_code == 403
+    assert sync([], headers={"Origin": "http://localhost"}).status_code == 200
+    # TLS ends at a proxy: the browser's origin is https, the app sees http
+    assert sync([], headers={"Origin": "https://localhost"}).status_code == 200
+    assert sync([], headers={"Origin": "https://localhost.evil.example"}).status_code == 403
+
+    app.config["ORDERS_SYNC_TRUSTED_ORIGINS"] = ["https://pos.example"]
+    assert sync([], headers={"Origin": "https://pos.example"}).status_code == 200
+
+    app.config["ORDERS_SYNC_MAX_BATCH"] = 1
+    assert sync([_order("a"), _order("b")]).status_code == 413
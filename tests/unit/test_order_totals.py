@@ -0,0 +1,132 @@
+"""Tests for the incremental order-totals engine."""
+
+import pytest
+
+from librepos.app.blueprints.orders.models import Order, OrderStatus
+from librepos.app.blueprints.orders.services import OrderService, compute_order_totals
+from librepos.app.extensions import db
+from librepos.app.shared import Money
+from librepos.app.shared.exceptions import OrderNotOpenError
+
+
+def test_order_totals_round_tax_once_half_up():
+    # 8.25 % of 1149 is 94.79 -> 95
+    assert compute_order_totals(1149, 0, 825) == (0, 95, 1244)
+    # discount is capped at the subtotal
+    assert compute_order_totals(500, 900, 825) == (500, 0, 0)
+
+
+def test_line_changes_apply_deltas_to_the_order(app):
+    with app.app_context():
+        order = OrderService.open_order(tax_rate_bp=825)
+        burger = OrderService.add_line(order, name="Burger", unit_price=1099, quantity=2)
+        OrderService.add_line(order, name="Soda", unit_price=Money(250), modifiers_price=50)
+
+        assert order.subtotal == Money(2498)
+        assert order.tax == Money(206)
+        assert order.total == Money(2704)
+
+        OrderService.update_line(order, burger, quantity=1, discount=100)
+        OrderService.set_discount(order, 200)
+
+        assert order.subtotal == Money(1299)
+        assert order.total == Money(1190)  # 1099 taxable + 91 tax
+        assert order.line_count == 2
+
+
+def test_incremental_totals_match_a_full_recalculation(app):
+    with app.app_context():
+        order = OrderService.open_order(tax_rate_bp=700)
+        lines = [
+            OrderService.add_line(order, name=f"Item {i}", unit_price=199 + i, quantity=1 + i % 3)
+            for i in range(30)
+        ]
+        for line in lines[::4]:
+            OrderService.remove_line(order, line)
+        incremental = (order.subtotal, order.tax, order.total, order.line_count)
+
+        OrderService.recalculate(order)
+
+        assert (order.subtotal, order.tax, order.total, order.line_count) == incremental
+
+
+def test_zero_quantity_removes_the_line(app):
+    with app.app_context():
+        order = OrderService.open_order(tax_rate_bp=0)
+        line = OrderService.add_line(order, name="Fries", unit_price=399)
+
+        OrderService.update_line(order, line, quantity=0)
+
+        assert order.line_count == 0
+        assert order.total == Money(0)
+
+
+def test_closed_orders_cannot_change(app):
+    with app.app_context():
+        order = OrderService.open_order()
+        order.status = OrderStatus.PAID
+        db.session.commit()
+
+        with pytest.raises(OrderNotOpenError):
+            OrderService.add_line(order, name="Late", unit_price=100)
+
+
+def test_orders_index_lists_open_orders(app, client):
+    with app.app_context():
+        OrderService.add_line(OrderService.open_order(), name="Tea", unit_price=300)
+        assert db.session.scalar(db.select(db.func.count(Order.id))) == 1
+
+    response = client.get("/orders/")
+
+    assert response.status_code == 200
+    assert b"$3.00" in response.data
+
+
+def test_htmx_line_click_returns_the_updated_ticket(app, client):
+    app.config["WTF_CSRF_ENABLED"] = False
+    with app.app_context():
+        order_id = OrderService.open_order(tax_rate_bp=0).id
+
+    response = client.post(
+        f"/orders/{order_id}/lines",
+        data={"name": "Latte", "unit_price": "4.75", "quantity": "2"},
+        headers={"HX-Request": "true"},
+    )
+
+    assert response.status_code == 200
+    assert b'id="ticket"' in response.data
+    assert b"$9.50" in response.data
+
+
+def test_closing_a_ticket_twice_conflicts(app, client):
+    app.config["WTF_CSRF_ENABLED"] = False
+    with app.app_context():
+        order = OrderService.open_order(tax_rate_bp=0)
+        OrderService.add_line(order, name="Tea", unit_price=300)
+        order_id = order.id
+
+    assert client.post(f"/orders/{order_id}/close").status_code == 302
+
+    response = client.post(f"/orders/{order_id}/close")
+
+    assert response.status_code == 409
+    assert b"paid" in response.data
+
+
+def test_htmx_change_to_a_closed_ticket_rerenders_it_with_a_warning(app, client):
+    app.config["WTF_CSRF_ENABLED"] = False
+    with app.app_context():
+        order = OrderService.open_order(tax_rate_bp=0)
+        OrderService.add_line(order, name="Tea", unit_price=300)
+        order_id = order.id
+    client.post(f"/orders/{order_id}/close", headers={"HX-Request": "true"})
+
+    response = client.post(
+        f"/orders/{order_id}/close",
+        headers={"HX-Request": "true"},
+    )
+
+    assert response.status_code == 200
+    assert b'id="ticket"' in response.data
+    assert f"Order #{order_id} is already paid.".encode() in response.data
+    assert b"Pay $" not in response.data
@@ -0,0 +1,88 @@
+"""Tests for keyset pagination."""
+
+import base64
+import json
+
+import pytest
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+from werkzeug.exceptions import BadRequest
+
+from librepos.app.extensions import db
+from librepos.app.shared.mixins import CRUDMixin
+from librepos.app.shared.pagination import paginate_keyset
+
+
+class PagedItem(db.Model, CRUDMixin):
+    __tablename__ = "test_paged_items"
+
+    name: Mapped[str] = mapped_column(String(20))
+
+
+@pytest.fixture
+def items(app):
+    with app.app_context():
+        db.session.add_all(PagedItem(name=f"item-{i}") for i in range(1, 8))
+        db.session.commit()
+
+
+def _page(app, cursor=None):
+    query = {"cursor": cursor} if cursor else {}
+    with app.test_request_context("/", query_string=query):
+        return paginate_keyset(db.select(PagedItem), PagedItem.id, per_page=3, with_total=True)
+
+
+def test_paginate_keyset_walks_forward_and_back(app, items):
+    first = _page(app)
+    assert [i.id for i in first.items] == [7, 6, 5]
+    assert first.has_next
+    assert not first.has_prev
+    assert first.total == 7
+
+    second = _page(app, first.next_cursor)
+    assert [i.id for i in second.items] == [4, 3, 2]
+
+    last = _page(app, second.next_cursor)
+    assert [i.id for i in last.items] == [1]
+    assert not last.has_next
+
+    back = _page(app, second.prev_cursor)
+    assert [i.id for i in back.items] == [7, 6, 5]
+    assert not back.has_prev
+    assert back.has_next
+
+
+def _cursor(data):
+    raw = json.dumps(data).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        _cursor({"k": [], "d": "next"}),
+        _cursor({"k": [7, 1], "d": "next"}),
+        _cursor({"k": [[1, 2]], "d": "next"}),
+        _cursor({"k": [None], "d": "prev"}),
+        _cursor({"k": [True], "d": "next"}),
+        _cursor({"k": ["7"], "d": "next"}),
+        _cursor({"k": [{"dt": "2025-01-01T00:00:00"}], "d": "next"}),
+        _cursor({"k": [7], "d": "sideways"}),
+    ],
+)
+def test_paginate_keyset_rejects_malformed_cursors(app, client, items, cursor):
+    with pytest.raises(BadRequest):
+        _page(app, cursor)
+    assert client.get("/orders/", query_string={"cursor": cursor}).status_code == 400
+
+
+def test_empty_follow_up_page_has_no_empty_state(client):
+    cursor = _cursor({"k": [1], "d": "next"})
+
+    first = client.get("/orders/")
+    later = client.get("/orders/", query_string={"cursor": cursor}, headers={"HX-Request": "true"})
+
+    assert b"No open orders." in first.data
+    assert later.status_code == 200
+    assert b"No open orders." not in later.data
@@ -0,0 +1,126 @@
+"""Tests for the bounded password hasher and password sign-in."""
+
+import threading
+
+import pytest
+from flask import Flask
+from werkzeug.security import generate_password_hash
+
+from librepos.app.blueprints.auth.models import User
+from librepos.app.blueprints.auth.services import AuthService
+from librepos.app.extensions import db
+from librepos.app.shared import passwords
+from librepos.app.shared.exceptions import HashingBusyError
+from librepos.app.shared.passwords import PasswordHasher, calibrate, password_hasher
+
+
+@pytest.fixture
+def user(app):
+    with app.app_context():
+        user = User(username="casey", password_hash=password_hasher.hash("s3cret"))
+        db.session.add(user)
+        db.session.commit()
+
+
+def test_hashes_carry_the_configured_cost(app):
+    assert password_hasher.method == f"scrypt:{app.config['PASSWORD_SCRYPT_N']}:8:1"
+
+    hashed = password_hasher.hash("1234")
+
+    assert hashed.startswith(password_hasher.method + "$")
+    assert password_hasher.verify(hashed, "1234")
+    assert not password_hasher.verify(hashed, "4321")
+    assert not password_hasher.needs_rehash(hashed)
+    assert password_hasher.needs_rehash(hashed.replace(":8:1$", ":8:2$", 1))
+
+
+def test_full_pool_fails_fast():
+    pool_app = Flask(__name__)
+    pool_app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0, PASSWORD_SCRYPT_N=2**10)
+    hasher = PasswordHasher(pool_app)
+    started, release = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    holder = threading.Thread(target=hasher.run, args=(hold,))
+    holder.start()
+    try:
+        started.wait(5)
+        with pytest.raises(HashingBusyError):
+            hasher.hash("1234")
+    finally:
+        release.set()
+        holder.join()
+        hasher.shutdown()
+
+    # The slot is free again once the running call finishes
+    assert hasher.verify(hasher.hash("1234"), "1234")
+
+
+def test_pool_must_leave_server_threads_free():
+    pool_app = Flask(__name__)
+    pool_app.config.update(PASSWORD_HASH_WORKERS=2, PASSWORD_HASH_QUEUE=2, SERVER_THREADS=4)
+
+    with pytest.raises(ValueError, match="SERVER_THREADS"):
+        PasswordHasher(pool_app)
+
+    pool_app.config["PASSWORD_HASH_QUEUE"] = 1
+    assert PasswordHasher(pool_app).capacity == 3
+
+
+def test_authenticate(app, user):
+    with app.app_context():
+        user = AuthService.authenticate("casey", "s3cret")
+        assert user is not None
+        assert user.username == "casey"
+        assert AuthService.authenticate("casey", "wrong") is None
+        assert AuthService.authenticate("nobody", "s3cret") is None
+
+
+def test_authenticate_upgrades_hashes_made_at_an_old_cost(app, user):
+    with app.app_context():
+        old = generate_password_hash("s3cret", "scrypt:512:8:1")
+        db.session.execute(db.update(User).values(password_hash=old))
+        db.session.commit()
+        User.cache_clear()
+
+        AuthService.authenticate("casey", "s3cret")
+
+        stored = db.session.execute(db.select(User.password_hash)).scalar_one()
+    assert stored.startswith(password_hasher.method + "$")
+    assert password_hasher.verify(stored, "s3cret")
+
+
+def test_busy_hasher_answers_503(app):
+    @app.get("/sign-in")
+    def sign_in():
+        raise HashingBusyError(10)
+
+    response = app.test_client().get("/sign-in")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_calibrate_stays_under_the_target():
+    n, elapsed = calibrate(target_ms=1)
+
+    assert n == 2**14  # the floor, whatever the host
+    assert elapsed > 0
+
+
+def test_calibrate_never_overshoots_the_target(monkeypatch):
+    # 100 ms at the floor, doubling with N: 2**16 (400 ms) is nearer to a
+    # 390 ms target than 2**15 (200 ms), but over it
+    monkeypatch.setattr(passwords, "_time_hash", lambda n, r, p: n / 2**14 * 100)
+
+    assert calibrate(target_ms=390) == (2**15, 200)
+
+
+def test_calibrate_command(app):
+    result = app.test_cli_runner().invoke(args=["auth", "calibrate", "--target-ms", "1"])
+
+    assert result.exit_code == 0, result.output
+    assert "PASSWORD_SCRYPT_N=16384" in result.output
@@ -0,0 +1,152 @@
+"""Tests for compiled role permissions and the require_permission decorator."""
+
+import pytest
+
+from librepos.app.blueprints.auth.models import (
+    Permission,
+    Policy,
+    Role,
+    RolePolicy,
+    User,
+)
+from librepos.app.blueprints.auth.services import compile_role_permissions
+from librepos.app.extensions import db
+from librepos.app.shared.cache import get_model_cache
+from librepos.app.shared.decorators import require_permission
+
+
+@pytest.fixture
+def roles(app):
+    """A cashier (orders) and a manager (orders + reports) role."""
+    with app.app_context():
+        view_orders, edit_orders, view_reports = (
+            Permission(name=name) for name in ("view:orders", "edit:orders", "view:reports")
+        )
+        orders = Policy(name="Orders", permissions=[view_orders, edit_orders])
+        reports = Policy(name="Reports", permissions=[view_reports])
+        cashier = Role(name="cashier", policies=[orders])
+        manager = Role(name="manager", policies=[orders, reports])
+        db.session.add_all([cashier, manager])
+        db.session.flush()
+        db.session.add_all(
+            [
+                User(username="casey", role_id=cashier.id),
+                User(username="morgan", role_id=manager.id),
+            ]
+        )
+        db.session.commit()
+        return {"cashier": cashier.id, "manager": manager.id}
+
+
+@pytest.fixture
+def guarded_client(app, roles):
+    app.config["LOGIN_DISABLED"] = False
+
+    @app.get("/guarded")
+    @require_permission("view:reports")
+    def guarded():
+        return "ok"
+
+    return app.test_client()
+
+
+def _login(client, username):
+    with client.application.app_context():
+        user_id = User.get_first_by(username=username).id
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+
+
+def test_each_role_compiles_to_the_union_of_its_policies(app, roles, query_budget):
+    with app.app_context(), query_budget(1):
+        compiled = compile_role_permissions()
+
+    assert compiled[roles["cashier"]] == {"view:orders", "edit:orders"}
+    assert compiled[roles["manager"]] == {"view:orders", "edit:orders", "view:reports"}
+    assert isinstance(compiled[roles["manager"]], frozenset)
+    with pytest.raises(TypeError):
+        compiled[0] = frozenset()  # type: ignore[index]
+
+
+def test_require_permission_allows_and_denies(guarded_client):
+    assert guarded_client.get("/guarded").status_code == 401
+
+    _login(guarded_client, "casey")
+    assert guarded_client.get("/guarded").status_code == 403
+
+    _login(guarded_client, "morgan")
+    assert guarded_client.get("/guarded").data == b"ok"
+
+
+def test_permission_check_runs_without_queries(guarded_client, query_budget):
+    _login(guarded_client, "morgan")
+    guarded_client.get("/guarded")  # compile the sets and cache the user
+
+    with query_budget(0):
+        assert guarded_client.get("/guarded").status_code == 200
+
+
+def test_policy_changes_take_effect_on_the_next_request(app, guarded_client, roles):
+    _login(guarded_client, "morgan")
+    assert guarded_client.get("/guarded").status_code == 200
+
+    with app.app_context():
+        db.session.execute(db.delete(RolePolicy).where(RolePolicy.role_id == roles["manager"]))
+        db.session.commit()
+
+    assert guarded_client.get("/guarded").status_code == 403
+
+    with app.app_context():
+        reports = db.session.execute(db.select(Policy).filter_by(name="Reports")).scalar_one()
+        db.session.add(RolePolicy(role_id=roles["manager"], policy_id=reports.id))
+        db.session.commit()
+
+    assert guarded_client.get("/guarded").status_code == 200
+
+
+def test_inactive_users_are_turned_away(app, guarded_client):
+    _login(guarded_client, "morgan")
+    with app.app_context():
+        User.get_first_by(username="morgan").update(active=False)
+
+    assert guarded_client.get("/guarded").status_code == 401
+
+
+def test_cached_users_expire_with_role_permissions(app):
+    # Other workers' changes to a user reach this process no more slowly
+    # than changes to roles and policies
+    app.config["PERMISSIONS_CHECK_INTERVAL"] = 2.5
+    with app.app_context():
+        cache = get_model_cache(User, db.session())
+        assert cache is not None
+        assert cache.rows.ttl == 2.5
+
+
+@pytest.mark.parametrize(
+    ("method", "path"),
+    [
+        ("get", "/orders/"),
+        ("post", "/orders/"),
+        ("post", "/orders/1/close"),
+        ("get", "/menu/"),
+        ("get", "/menu/catalog.json"),
+        ("get", "/reports/"),
+    ],
+)
+def test_blueprint_routes_require_login(app, method, path):
+    app.config.update(LOGIN_DISABLED=False, WTF_CSRF_ENABLED=False)
+
+    response = getattr(app.test_client(), method)(path)
+
+    assert response.status_code == 401
+
+
+def test_seed_permissions_command(app):
+    result = app.test_cli_runner().invoke(args=["seed", "permissions"])
+
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        names = set(db.session.execute(db.select(Permission.name)).scalars())
+    assert {"view:auth", "view:orders", "edit:menu", "view:reports"} <= names
+    assert "Skipped: 0" in result.output
+    assert "Created: 0" in app.test_cli_runner().invoke(args=["seed", "permissions"]).output
@@ -0,0 +1,120 @@
+"""Tests for the incremental sales rollups."""
+
+import threading
+from datetime import UTC, date, datetime
+
+from librepos.app import create_app
+from librepos.app.blueprints.orders.models import Order
+from librepos.app.blueprints.orders.services import OrderService
+from librepos.app.blueprints.reports.models import DailySalesSummary, SalesRollup
+from librepos.app.blueprints.reports.services import ReportService, RollupService
+from librepos.app.extensions import db
+from librepos.app.shared import Money
+
+
+def _paid_order(lines, closed_at=None):
+    order = OrderService.open_order(tax_rate_bp=1000)
+    for item_id, name, price, quantity in lines:
+        OrderService.add_line(
+            order, name=name, unit_price=price, quantity=quantity, menu_item_id=item_id
+        )
+    OrderService.close_order(order)
+    if closed_at is not None:
+        order.closed_at = closed_at
+        db.session.commit()
+    return order
+
+
+def _snapshot():
+    rollups = db.session.execute(
+        db.select(SalesRollup.menu_item_id, SalesRollup.quantity, SalesRollup.sales).order_by(
+            SalesRollup.menu_item_id
+        )
+    ).all()
+    summaries = db.session.execute(
+        db.select(DailySalesSummary.order_count, DailySalesSummary.total)
+    ).all()
+    return rollups, summaries
+
+
+def test_closing_an_order_updates_the_rollups(app):
+    with app.app_context():
+        _paid_order([(1, "Burger", 1000, 2)])
+        _paid_order([(1, "Burger", 1000, 1), (2, "Fries", 300, 1)])
+
+        rollups, summaries = _snapshot()
+
+        assert rollups == [(1, 3, Money(3000)), (2, 1, Money(300))]
+        assert summaries == [(2, Money(3630))]
+        assert (
+            db.session.scalar(db.select(db.func.count()).where(Order.rolled_up_at.is_(None))) == 0
+        )
+
+
+def test_catch_up_counts_each_order_once(app):
+    app.config["REPORTS_ROLLUP_ON_CLOSE"] = False
+    with app.app_context():
+        for _ in range(3):
+            _paid_order([(1, "Burger", 1000, 1)])
+
+        assert RollupService.catch_up(batch_size=2) == 3
+        assert RollupService.catch_up() == 0
+
+        rollups, summaries = _snapshot()
+        assert rollups == [(1, 3, Money(3000))]
+        assert summaries == [(3, Money(3300))]
+
+
+def test_concurrent_roll_ups_count_each_order_once(monkeypatch, tmp_path):
+    # A file database, so each thread gets its own connection
+    monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'rollups.db'}")
+    monkeypatch.setenv("REPORTS_ROLLUP_ON_CLOSE", "false")
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        for _ in range(20):
+            _paid_order([(1, "Burger", 1000, 1)])
+
+    start = threading.Barrier(4)
+    processed = []
+
+    def worker():
+        with app.app_context():
+            start.wait()
+            processed.append(RollupService.catch_up(batch_size=3))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(processed) == 20
+    with app.app_context():
+        rollups, summaries = _snapshot()
+    assert rollups == [(1, 20, Money(20000))]
+    assert summaries == [(20, Money(22000))]
+
+
+def test_rebuild_recomputes_a_business_day(app):
+    app.config["REPORTS_ROLLUP_ON_CLOSE"] = False
+    with app.app_context():
+        # 03:30 UTC on Jan 16 is still Jan 15 in New York
+        _paid_order([(1, "Burger", 1000, 1)], closed_at=datetime(2025, 1, 16, 3, 30, tzinfo=UTC))
+        RollupService.rebuild(date(2025, 1, 15), date(2025, 1, 15))
+        before = _snapshot()
+
+        assert RollupService.rebuild(date(2025, 1, 15), date(2025, 1, 15)) == 1
+        assert _snapshot() == before
+        assert ReportService.sales_by_hour(date(2025, 1, 15), date(2025, 1, 15))[22] == 1000
+
+
+def test_reports_page_reads_the_rollups(app, client):
+    with app.app_context():
+        _paid_order([(1, "Burger", 1000, 2)])
+
+    response = client.get("/reports/")
+
+    assert response.status_code == 200
+    assert b"Burger" in response.data
+    assert b"$22.00" in response.data
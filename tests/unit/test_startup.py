@@ -0,0 +1,31 @@
+"""Tests for the fast startup path."""
+
+import subprocess
+import sys
+
+
+def test_startup_profile_records_each_phase(app):
+    profile = app.extensions["startup_profile"]
+
+    phases = [name for name, _ in profile.phases]
+    assert phases == ["settings", "templates", "extensions", "instrumentation", "routes", "cli"]
+    assert profile.total >= sum(seconds for _, seconds in profile.phases) - 1e-9
+
+
+def test_heavy_optional_modules_are_not_imported_at_startup():
+    code = (
+        "import sys; from librepos.app import create_app; create_app('testing'); "
+        "print(sorted(m for m in ('PIL', 'flask_mailman') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_email_binds_mail_on_first_use(app):
+    from librepos.app.shared.email import send_email  # noqa: PLC0415
+
+    with app.app_context():
+        assert send_email(["a@example.com"], "Hi", "Body")
+    assert len(app.extensions["mailman"].outbox) == 1
@@ -0,0 +1,54 @@
+"""Tests for template precompilation and the layered bytecode cache."""
+
+import pytest
+
+from librepos.app import create_app
+from librepos.app.shared.template_cache import LayeredBytecodeCache, template_names
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEMPLATE_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_compile_command_fills_the_cache(cache_dir):
+    app = create_app("testing")
+
+    result = app.test_cli_runner().invoke(args=["templates", "compile"])
+
+    assert result.exit_code == 0, result.output
+    names = template_names(app)
+    assert "base.html" in names
+    assert "orders/_ticket.html" in names
+    assert f"Compiled: {len(names)}, Failed: 0" in result.output
+    assert len(list(cache_dir.glob("*.cache"))) == len(names)
+
+
+def test_new_worker_loads_each_cache_file_once(cache_dir):
+    create_app("testing").test_cli_runner().invoke(args=["templates", "compile"])
+    app = create_app("testing")
+    cache = app.extensions["template_cache"]
+
+    app.jinja_env.get_template("base.html")
+    app.jinja_env.cache.clear()
+    app.jinja_env.get_template("base.html")
+
+    assert cache.stats()["file_loads"] == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_cache_keys_do_not_depend_on_the_install_path(cache_dir):
+    cache = LayeredBytecodeCache(str(cache_dir))
+
+    assert cache.get_cache_key("base.html", "/srv/a/base.html") == cache.get_cache_key(
+        "base.html", "/opt/b/base.html"
+    )
+
+
+def test_warmup_loads_every_template(cache_dir, monkeypatch):
+    monkeypatch.setenv("TEMPLATE_WARMUP", "true")
+    app = create_app("testing")
+
+    assert len(app.jinja_env.cache) == len(template_names(app))
+    assert "template warmup" in dict(app.extensions["startup_profile"].phases)
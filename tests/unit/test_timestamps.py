@@ -0,0 +1,55 @@
+"""Tests for UTC server-side timestamps and the business timezone layer."""
+
+from datetime import UTC, date, datetime
+
+from flask import render_template_string
+from sqlalchemy import String, insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from librepos.app.extensions import db
+from librepos.app.shared import CRUDMixin, business_date, business_day_bounds
+
+
+class Stamped(db.Model, CRUDMixin):
+    __tablename__ = "test_stamped"
+
+    name: Mapped[str] = mapped_column(String(20))
+
+
+def test_core_inserts_get_server_side_timestamps(app):
+    with app.app_context():
+        db.session.execute(insert(Stamped), [{"name": "a"}, {"name": "b"}])
+        db.session.commit()
+
+        rows = Stamped.get_all()
+        assert all(row.created_at is not None for row in rows)
+        assert all(row.updated_at is not None for row in rows)
+
+
+def test_orm_create_loads_timestamps_eagerly(app):
+    with app.app_context():
+        row = Stamped(name="a")
+        db.session.add(row)
+        db.session.flush()
+
+        # eager_defaults: fetched with the INSERT, no refresh query needed
+        assert row.__dict__["created_at"] is not None
+
+
+def test_localtime_filter_uses_business_timezone(app):
+    app.config["BUSINESS_TIMEZONE"] = "America/Chicago"
+    stored = datetime(2025, 1, 15, 15, 30)  # naive UTC, as SQLite returns it
+
+    with app.test_request_context():
+        rendered = render_template_string('{{ ts|localtime("%H:%M") }}', ts=stored)
+
+    assert rendered == "09:30"
+
+
+def test_business_day_bounds_follow_dst(app):
+    with app.app_context():
+        start, end = business_day_bounds(date(2025, 3, 9))  # spring forward in New York
+
+        assert start == datetime(2025, 3, 9, 5, tzinfo=UTC)
+        assert (end - start).total_seconds() == 23 * 3600
+        assert business_date(datetime(2025, 3, 10, 3, 59, tzinfo=UTC)) == date(2025, 3, 9)